@@ -7,7 +7,6 @@ from homeassistant.core import HomeAssistant
 from .const import CONF_USB_PATH
 
 from .gateway import async_setup_entry_gw, async_unload_entry_gw
-from .usb import async_setup_entry_usb, async_unload_entry_usb
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -15,6 +14,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.data.get(CONF_HOST):
         return await async_setup_entry_gw(hass, entry)
     if entry.data.get(CONF_USB_PATH):
+        # Only import the USB-stick stack when a stick is actually configured
+        from .usb import (  # pylint: disable=import-outside-toplevel
+            async_setup_entry_usb,
+        )
+
         return await async_setup_entry_usb(hass, entry)
     return False  # pragma: no cover
 
@@ -24,5 +28,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.data.get(CONF_HOST):
         return await async_unload_entry_gw(hass, entry)
     if entry.data.get(CONF_USB_PATH):
+        from .usb import (  # pylint: disable=import-outside-toplevel
+            async_unload_entry_usb,
+        )
+
         return await async_unload_entry_usb(hass, entry)
     return False  # pragma: no cover
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -11,8 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from plugwise.nodes import PlugwiseNode
-
+from .bridge import USBNodeBatch
 from .const import (
     ATTR_SCAN_DAYLIGHT_MODE,
     ATTR_SCAN_RESET_TIMER,
@@ -22,11 +21,16 @@ from .const import (
     ATTR_SED_MAINTENANCE_INTERVAL,
     ATTR_SED_SLEEP_FOR,
     ATTR_SED_STAY_ACTIVE,
+    BRIDGE,
     CB_NEW_NODE,
     COORDINATOR,
     DOMAIN,
     LOGGER,
+    NODE_CACHE,
     PW_TYPE,
+    SED_QUEUE,
+    SED_SCAN_CONFIG,
+    SED_SLEEP_CONFIG,
     SEVERITIES,
     SERVICE_USB_SCAN_CONFIG,
     SERVICE_USB_SCAN_CONFIG_SCHEMA,
@@ -37,9 +41,17 @@ from .const import (
     USB_MOTION_ID,
 )
 from .coordinator import PlugwiseDataUpdateCoordinator
-from .entity import PlugwiseEntity
+from .entity import (
+    PlugwiseEntity,
+    PlugwiseUSBEntity,
+    async_usb_placeholder_nodes,
+)
 from .models import PW_BINARY_SENSOR_TYPES, PlugwiseBinarySensorEntityDescription
-from .usb import PlugwiseUSBEntity
+
+if TYPE_CHECKING:
+    from plugwise.nodes import PlugwiseNode
+
+    from .sed_queue import USBSEDCommandQueue
 
 PARALLEL_UPDATES = 0
 
@@ -59,24 +71,13 @@ async def async_setup_entry(
 async def async_setup_entry_usb(hass, config_entry, async_add_entities):
     """Set up Plugwise binary sensor based on config_entry."""
     api_stick = hass.data[DOMAIN][config_entry.entry_id][STICK]
+    sed_queue = hass.data[DOMAIN][config_entry.entry_id][SED_QUEUE]  # pw-beta
     platform = entity_platform.current_platform.get()
 
-    async def async_add_binary_sensors(mac: str):
-        """Add plugwise binary sensors for device."""
-        entities: list[USBBinarySensor] = []
-        entities.extend(
-            [
-                USBBinarySensor(api_stick.devices[mac], description)
-                for description in PW_BINARY_SENSOR_TYPES
-                if description.plugwise_api == STICK
-                and description.key in api_stick.devices[mac].features
-            ]
-        )
-        if entities:
-            async_add_entities(entities)
-
-        if USB_MOTION_ID in api_stick.devices[mac].features:
-            LOGGER.debug("Add binary_sensors for %s", mac)
+    def create_binary_sensors(node: PlugwiseNode) -> list[USBBinarySensor]:
+        """Create plugwise binary sensors for device."""
+        if USB_MOTION_ID in node.features:
+            LOGGER.debug("Add binary_sensors for %s", node.mac)
 
             # Register services
             platform.async_register_entity_service(
@@ -90,15 +91,36 @@ async def async_setup_entry_usb(hass, config_entry, async_add_entities):
                 "_service_sed_battery_config",
             )
 
-    for mac in hass.data[DOMAIN][config_entry.entry_id][Platform.BINARY_SENSOR]:
-        hass.async_create_task(async_add_binary_sensors(mac))
-
-    def discoved_device(mac: str):
-        """Add binary sensors for newly discovered device."""
-        hass.async_create_task(async_add_binary_sensors(mac))
+        return [
+            USBBinarySensor(node, description, sed_queue)
+            for description in PW_BINARY_SENSOR_TYPES
+            if description.plugwise_api == STICK and description.key in node.features
+        ]
+
+    # pw-beta - all entities in one call, the nodes discovered later in batches
+    batch = USBNodeBatch(
+        hass,
+        hass.data[DOMAIN][config_entry.entry_id][BRIDGE].interval,
+        api_stick.devices,
+        create_binary_sensors,
+        async_add_entities,
+    )
 
     # Listen for discovered nodes
-    api_stick.subscribe_stick_callback(discoved_device, CB_NEW_NODE)
+    api_stick.subscribe_stick_callback(batch.node_discovered, CB_NEW_NODE)
+
+    # pw-beta - the nodes answered so far, the nodes not answering (yet) from
+    # the node cache or registry as unavailable placeholders
+    batch.async_add(
+        list(api_stick.devices),
+        async_usb_placeholder_nodes(
+            hass,
+            config_entry.entry_id,
+            Platform.BINARY_SENSOR,
+            api_stick.devices,
+            hass.data[DOMAIN][config_entry.entry_id][NODE_CACHE].nodes,
+        ),
+    )
 
 
 async def async_setup_entry_gateway(
@@ -202,18 +224,21 @@ class USBBinarySensor(PlugwiseUSBEntity, BinarySensorEntity):  # type: ignore[mi
     """Representation of a Plugwise USB Binary Sensor."""
 
     def __init__(
-        self, node: PlugwiseNode, description: PlugwiseBinarySensorEntityDescription
+        self,
+        node: PlugwiseNode,
+        description: PlugwiseBinarySensorEntityDescription,
+        sed_queue: USBSEDCommandQueue,
     ) -> None:
         """Initialize a binary sensor entity."""
         super().__init__(node, description)
+        self._sed_queue = sed_queue  # pw-beta
 
     @property
     def is_on(self) -> bool:
         """Return true if the binary_sensor is on."""
-        # Github issue #265
-        return getattr(self._node, self.entity_description.state_request_method)  # type: ignore[attr-defined]
+        return self._value  # pw-beta - cached on the node callback
 
-    def _service_scan_config(self, **kwargs):
+    async def _service_scan_config(self, **kwargs):
         """Service call to configure motion sensor of Scan device."""
         sensitivity_mode = kwargs.get(ATTR_SCAN_SENSITIVITY_MODE)
         reset_timer = kwargs.get(ATTR_SCAN_RESET_TIMER)
@@ -225,9 +250,10 @@ class USBBinarySensor(PlugwiseUSBEntity, BinarySensorEntity):  # type: ignore[mi
             str(reset_timer),
             str(daylight_mode),
         )
-        self._node.Configure_scan(reset_timer, sensitivity_mode, daylight_mode)
+        # pw-beta - sent once the Scan is awake
+        self._sed_queue.async_queue(self._node.mac, SED_SCAN_CONFIG, kwargs)
 
-    def _service_sed_battery_config(self, **kwargs):
+    async def _service_sed_battery_config(self, **kwargs):
         """Configure battery powered (sed) device service call."""
         stay_active = kwargs.get(ATTR_SED_STAY_ACTIVE)
         sleep_for = kwargs.get(ATTR_SED_SLEEP_FOR)
@@ -243,10 +269,5 @@ class USBBinarySensor(PlugwiseUSBEntity, BinarySensorEntity):  # type: ignore[mi
             str(clock_sync),
             str(clock_interval),
         )
-        self._node.Configure_SED(
-            stay_active,
-            maintenance_interval,
-            sleep_for,
-            clock_sync,
-            clock_interval,
-        )
+        # pw-beta - sent once the node is awake
+        self._sed_queue.async_queue(self._node.mac, SED_SLEEP_CONFIG, kwargs)
@@ -0,0 +1,184 @@
+"""Batch the state updates of the Plugwise USB nodes."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from threading import Lock
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+if TYPE_CHECKING:
+    from .entity import PlugwiseUSBEntity
+
+
+class USBUpdateBridge:
+    """Collect the node callbacks of the stick threads, write them in batches.
+
+    The stick library calls back from its own threads. The entities are
+    queued in a buffer guarded by a lock, the first one queued in an empty
+    buffer schedules a single drain on the event loop after the interval.
+    The drain writes the state of every entity queued meanwhile once, so
+    the loop is woken at most once per interval whatever the network
+    chatter.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval: float) -> None:
+        """Initialize the bridge."""
+        self._hass = hass
+        self._interval = interval
+        self._lock = Lock()
+        self._pending: dict[Entity, None] = {}
+        self._scheduled = False
+        self._timer: asyncio.TimerHandle | None = None
+        self._started = time.monotonic()
+        self.received = 0
+        self.collapsed = 0
+        self.dropped = 0
+        self.written = 0
+        self.drains = 0
+
+    def queue(self, entity: Entity) -> None:
+        """Queue a state write of the entity, safe to call from any thread."""
+        with self._lock:
+            self.received += 1
+            if entity in self._pending:
+                self.collapsed += 1
+                return
+            self._pending[entity] = None
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_drain)
+
+    @property
+    def interval(self) -> float:
+        """Return the interval between two drains."""
+        return self._interval
+
+    @callback
+    def _async_schedule_drain(self) -> None:
+        """Drain the buffer after the interval."""
+        self._timer = self._hass.loop.call_later(self._interval, self._async_drain)
+
+    @callback
+    def _async_drain(self) -> None:
+        """Write the states of the queued entities."""
+        self._timer = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+
+        self.drains += 1
+        for entity in pending:
+            # Removed from Home Assistant after the callback
+            if entity.hass is None:
+                self.dropped += 1
+                continue
+            entity.async_write_ha_state()
+            self.written += 1
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending drain, the queued updates are dropped."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        with self._lock:
+            self.dropped += len(self._pending)
+            self._pending = {}
+            self._scheduled = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters, for the diagnostics."""
+        elapsed = max(time.monotonic() - self._started, 1.0)
+        return {
+            "interval": self._interval,
+            "received": self.received,
+            "collapsed": self.collapsed,
+            "dropped": self.dropped,
+            "written": self.written,
+            "drains": self.drains,
+            "pending": len(self._pending),
+            "received_per_second": round(self.received / elapsed, 2),
+            "written_per_second": round(self.written / elapsed, 2),
+        }
+
+
+class USBNodeBatch:
+    """Create the entities of the nodes of a platform in batches.
+
+    The nodes known at setup are added in one call, together with the
+    placeholders of the nodes known from an earlier run. The nodes
+    discovered later are reported from the stick threads, these are
+    collected and added together after the interval. A node is only added
+    once, a placeholder continues with the node once it answered.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float,
+        nodes: Mapping[str, Any],
+        create: Callable[[Any], list[PlugwiseUSBEntity]],
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize the batch."""
+        self._hass = hass
+        self._interval = interval
+        self._nodes = nodes
+        self._create = create
+        self._async_add_entities = async_add_entities
+        self._added: set[str] = set()
+        self._placeholders: dict[str | None, PlugwiseUSBEntity] = {}
+        self._lock = Lock()
+        self._pending: list[str] = []
+        self._scheduled = False
+
+    @callback
+    def async_add(self, macs: Iterable[str], placeholders: Iterable[Any] = ()) -> None:
+        """Add the entities of the nodes and placeholder nodes in one call."""
+        entities: list[PlugwiseUSBEntity] = []
+        for placeholder in placeholders:
+            for entity in self._create(placeholder):
+                self._placeholders[entity.unique_id] = entity
+                entities.append(entity)
+
+        for mac in macs:
+            # Not discovered yet or unsupported
+            if mac in self._added or (node := self._nodes.get(mac)) is None:
+                continue
+            self._added.add(mac)
+            for entity in self._create(node):
+                if placeholder := self._placeholders.pop(entity.unique_id, None):
+                    placeholder.async_set_node(node)
+                    continue
+                entities.append(entity)
+
+        if entities:
+            self._async_add_entities(entities)
+
+    def node_discovered(self, mac: str) -> None:
+        """Queue a discovered node, safe to call from any thread."""
+        with self._lock:
+            self._pending.append(mac)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_schedule_add)
+
+    @callback
+    def _async_schedule_add(self) -> None:
+        """Add the queued nodes after the interval."""
+        self._hass.loop.call_later(self._interval, self._async_add_pending)
+
+    @callback
+    def _async_add_pending(self) -> None:
+        """Add the entities of the queued nodes."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._scheduled = False
+        self.async_add(pending)
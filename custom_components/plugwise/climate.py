@@ -25,7 +25,7 @@ from homeassistant.components.climate.const import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, TEMP_CELSIUS
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -53,10 +53,22 @@ async def async_setup_entry(
     # pw-beta homekit emulation
     homekit_enabled: bool = config_entry.options.get(CONF_HOMEKIT_EMULATION, False)
 
-    async_add_entities(
+    entities = [
         PlugwiseClimateEntity(coordinator, device_id, homekit_enabled)
         for device_id, device in coordinator.data.devices.items()
         if device["dev_class"] in MASTER_THERMOSTATS
+    ]
+    async_add_entities(entities)
+
+    # pw-beta homekit emulation - apply option changes without a reload
+    async def _async_update_homekit(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Toggle the homekit emulation of the climate entities."""
+        enabled: bool = entry.options.get(CONF_HOMEKIT_EMULATION, False)
+        for entity in entities:
+            entity.async_set_homekit_emulation(enabled)
+
+    config_entry.async_on_unload(
+        config_entry.add_update_listener(_async_update_homekit)
     )
 
 
@@ -91,6 +103,18 @@ class PlugwiseClimateEntity(PlugwiseEntity, ClimateEntity):
             # Ensure we don't drop below 0.1
             self._attr_target_temperature_step = max(resolution, 0.1)
 
+    # pw-beta homekit emulation
+    @callback
+    def async_set_homekit_emulation(self, enabled: bool) -> None:
+        """Enable or disable the homekit emulation."""
+        if enabled == self._homekit_enabled:
+            return
+
+        self._homekit_enabled = enabled
+        self._homekit_mode = None
+        if self.hass is not None:
+            self.async_write_ha_state()
+
     @property
     def current_temperature(self) -> float:
         """Return the current temperature."""
@@ -17,12 +17,9 @@ from plugwise.exceptions import (
     TimeoutException,
 )
 from plugwise.smile import Smile
-from plugwise.stick import Stick
-import serial.tools.list_ports
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.components import usb
 from homeassistant.components.zeroconf import ZeroconfServiceInfo
 from homeassistant.config_entries import ConfigEntry, ConfigFlow
 from homeassistant.const import (
@@ -42,12 +39,26 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from .const import (
     API,
     COORDINATOR,
+    CONF_DEADBAND,  # pw-beta option
+    CONF_DEADBAND_RELATIVE,  # pw-beta option
+    CONF_FILTER_SENSOR,  # pw-beta option
+    CONF_HEARTBEAT,  # pw-beta option
+    CONF_HISTORY_WINDOW,  # pw-beta option
     CONF_HOMEKIT_EMULATION,  # pw-beta option
     CONF_MANUAL_PATH,
+    CONF_MIN_PUBLISH_INTERVAL,  # pw-beta option
+    CONF_POLLING_TIERS,  # pw-beta option
     CONF_REFRESH_INTERVAL,  # pw-beta option
+    CONF_SENSOR_FILTERS,  # pw-beta option
+    CONF_USB_LINK_SENSORS,  # pw-beta option
     CONF_USB_PATH,
+    CONF_USB_UPDATE_INTERVAL,  # pw-beta option
+    DEFAULT_HISTORY_WINDOW,  # pw-beta option
     DEFAULT_PORT,
+    DEFAULT_REFRESH_INTERVAL,  # pw-beta option
     DEFAULT_SCAN_INTERVAL,  # pw-beta option
+    DEFAULT_USB_LINK_SENSORS,  # pw-beta option
+    DEFAULT_USB_UPDATE_INTERVAL,  # pw-beta option
     DEFAULT_USERNAME,
     DOMAIN,
     FLOW_NET,
@@ -80,10 +91,9 @@ def plugwise_stick_entries(hass):
     return sticks
 
 
-# Github issue: #265
-# Might be a `tuple[dict[str, str], Stick | None]` for typing, but that throws
-# Item None of Optional[Any] not having attribute mac [union-attr]
-async def validate_usb_connection(self, device_path=None) -> tuple[dict[str, str], Any]:
+async def validate_usb_connection(
+    self, device_path=None
+) -> tuple[dict[str, str], str | None]:
     """Test if device_path is a real Plugwise USB-Stick."""
     errors = {}
 
@@ -92,11 +102,13 @@ async def validate_usb_connection(self, device_path=None) -> tuple[dict[str, str
         errors[CONF_BASE] = "already_configured"
         return errors, None
 
-    api_stick = await self.async_add_executor_job(Stick, device_path)
+    # Only import the USB-stick stack when the USB flow is chosen
+    # pw-beta - probe the stick on the event loop, no executor jobs
+    from .transport import async_init_stick  # pylint: disable=import-outside-toplevel
+
+    stick_mac = None
     try:
-        await self.async_add_executor_job(api_stick.connect)
-        await self.async_add_executor_job(api_stick.initialize_stick)
-        await self.async_add_executor_job(api_stick.disconnect)
+        stick_mac = await async_init_stick(device_path)
     except PortError:
         errors[CONF_BASE] = "cannot_connect"
     except StickInitError:
@@ -105,7 +117,7 @@ async def validate_usb_connection(self, device_path=None) -> tuple[dict[str, str
         errors[CONF_BASE] = "network_down"
     except TimeoutException:
         errors[CONF_BASE] = "network_timeout"
-    return errors, api_stick
+    return errors, stick_mac
 
 
 def _base_gw_schema(discovery_info):
@@ -203,6 +215,11 @@ class PlugwiseConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Step when user initializes a integration."""
+        import serial.tools.list_ports  # pylint: disable=import-outside-toplevel
+
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components import usb
+
         errors: dict[str, str] = {}
         ports = await self.hass.async_add_executor_job(serial.tools.list_ports.comports)
         list_of_ports = [
@@ -223,11 +240,13 @@ class PlugwiseConfigFlow(ConfigFlow, domain=DOMAIN):
             device_path = await self.hass.async_add_executor_job(
                 usb.get_serial_by_id, port.device
             )
-            errors, api_stick = await validate_usb_connection(self.hass, device_path)
+            errors, stick_mac = await validate_usb_connection(self.hass, device_path)
             if not errors:
-                await self.async_set_unique_id(api_stick.mac)
+                await self.async_set_unique_id(stick_mac)
                 return self.async_create_entry(
-                    title="Stick", data={CONF_USB_PATH: device_path, PW_TYPE: STICK}
+                    title="Stick",
+                    data={CONF_USB_PATH: device_path, PW_TYPE: STICK},
+                    options={CONF_USB_LINK_SENSORS: False},  # pw-beta
                 )
         return self.async_show_form(
             step_id="user_usb",
@@ -241,17 +260,22 @@ class PlugwiseConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Step when manual path to device."""
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components import usb
+
         errors: dict[str, str] = {}
         if user_input is not None:
             user_input.pop(FLOW_TYPE, None)
             device_path = await self.hass.async_add_executor_job(
                 usb.get_serial_by_id, user_input.get(CONF_USB_PATH)
             )
-            errors, api_stick = await validate_usb_connection(self.hass, device_path)
+            errors, stick_mac = await validate_usb_connection(self.hass, device_path)
             if not errors:
-                await self.async_set_unique_id(api_stick.mac)
+                await self.async_set_unique_id(stick_mac)
                 return self.async_create_entry(
-                    title="Stick", data={CONF_USB_PATH: device_path}
+                    title="Stick",
+                    data={CONF_USB_PATH: device_path},
+                    options={CONF_USB_LINK_SENSORS: False},  # pw-beta
                 )
         return self.async_show_form(
             step_id="manual_path",
@@ -343,6 +367,8 @@ class PlugwiseOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: ConfigEntry) -> None:  # pragma: no cover
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._filter_sensor: str | None = None  # pw-beta
+        self._options: dict[str, Any] = {}  # pw-beta
 
     async def async_step_none(
         self, user_input: dict[str, Any] | None = None
@@ -358,10 +384,20 @@ class PlugwiseOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:  # pragma: no cover
         """Manage the Plugwise options."""
+        if self.config_entry.data.get(CONF_USB_PATH):
+            return await self.async_step_usb(user_input)
         if not self.config_entry.data.get(CONF_HOST):
             return await self.async_step_none(user_input)
 
         if user_input is not None:
+            # pw-beta - keep the sensor filters, they are set in their own step
+            if filters := self.config_entry.options.get(CONF_SENSOR_FILTERS):
+                user_input[CONF_SENSOR_FILTERS] = filters
+            if CONF_FILTER_SENSOR in user_input:
+                self._filter_sensor = user_input.pop(CONF_FILTER_SENSOR)
+                self._options = user_input
+                return await self.async_step_sensor_filter()
+
             return self.async_create_entry(title="", data=user_input)
 
         coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id][COORDINATOR]
@@ -376,8 +412,23 @@ class PlugwiseOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SCAN_INTERVAL, interval.seconds
                 ),
             ): vol.All(cv.positive_int, vol.Clamp(min=10)),
+            vol.Optional(
+                CONF_HISTORY_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW
+                ),
+            ): vol.All(cv.positive_int, vol.Range(min=1, max=1440)),
         }  # pw-beta
 
+        # pw-beta - select a sensor to set its deadband and publish intervals
+        sensors: dict[str, str] = {}
+        for device_id, device in coordinator.data.devices.items():
+            for key, value in device.get("sensors", {}).items():
+                if isinstance(value, (int, float)):
+                    sensors[f"{device_id}-{key}"] = f"{device.get('name')}: {key}"
+        if sensors:
+            data[vol.Optional(CONF_FILTER_SENSOR)] = vol.In(sensors)
+
         if coordinator.api.smile_type != "thermostat":
             return self.async_show_form(step_id="init", data_schema=vol.Schema(data))
 
@@ -391,9 +442,77 @@ class PlugwiseOptionsFlowHandler(config_entries.OptionsFlow):
                 ): cv.boolean,
                 vol.Optional(
                     CONF_REFRESH_INTERVAL,
-                    default=self.config_entry.options.get(CONF_REFRESH_INTERVAL, 1.5),
-                ): vol.All(vol.Coerce(float), vol.Range(min=1.5, max=5.0)),
+                    default=self.config_entry.options.get(
+                        CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL
+                    ),
+                ): vol.All(
+                    vol.Coerce(float),
+                    vol.Range(min=DEFAULT_REFRESH_INTERVAL, max=5.0),
+                ),
+                vol.Optional(
+                    CONF_POLLING_TIERS,
+                    default=self.config_entry.options.get(CONF_POLLING_TIERS, False),
+                ): cv.boolean,
             }
         )  # pw-beta
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(data))
+
+    # pw-beta
+    async def async_step_usb(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the USB-stick options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        data = {
+            vol.Optional(
+                CONF_USB_UPDATE_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_USB_UPDATE_INTERVAL, DEFAULT_USB_UPDATE_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.05, max=5.0)),
+            vol.Optional(
+                CONF_USB_LINK_SENSORS,
+                default=self.config_entry.options.get(
+                    CONF_USB_LINK_SENSORS, DEFAULT_USB_LINK_SENSORS
+                ),
+            ): cv.boolean,
+        }
+        return self.async_show_form(step_id="usb", data_schema=vol.Schema(data))
+
+    # pw-beta
+    async def async_step_sensor_filter(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set the deadband and publish intervals of the selected sensor."""
+        filters: dict[str, dict[str, float]] = dict(
+            self._options.get(CONF_SENSOR_FILTERS, {})
+        )
+        if user_input is not None:
+            if user_input:
+                filters[self._filter_sensor] = user_input
+            else:
+                filters.pop(self._filter_sensor, None)
+            self._options[CONF_SENSOR_FILTERS] = filters
+            return self.async_create_entry(title="", data=self._options)
+
+        current = filters.get(self._filter_sensor, {})
+        data = {}
+        for option, validator in (
+            (CONF_DEADBAND, vol.All(vol.Coerce(float), vol.Range(min=0))),
+            (CONF_DEADBAND_RELATIVE, vol.All(vol.Coerce(float), vol.Range(0, 100))),
+            (CONF_MIN_PUBLISH_INTERVAL, vol.All(vol.Coerce(float), vol.Range(min=0))),
+            (CONF_HEARTBEAT, vol.All(vol.Coerce(float), vol.Range(min=10))),
+        ):
+            if option in current:
+                data[vol.Optional(option, default=current[option])] = validator
+            else:
+                data[vol.Optional(option)] = validator
+
+        return self.async_show_form(
+            step_id="sensor_filter",
+            data_schema=vol.Schema(data),
+            description_placeholders={"sensor": self._filter_sensor},
+        )
@@ -4,7 +4,14 @@ import logging
 from typing import Final
 
 import voluptuous as vol
-from homeassistant.const import Platform
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_STATE,
+    ATTR_TEMPERATURE,
+    STATE_OFF,
+    STATE_ON,
+    Platform,
+)
 from homeassistant.helpers import config_validation as cv
 
 DOMAIN: Final = "plugwise"
@@ -13,15 +20,35 @@ LOGGER = logging.getLogger(__package__)
 
 API: Final = "api"
 ATTR_ENABLED_DEFAULT: Final = "enabled_default"
+BRIDGE: Final = "bridge"  # pw-beta
 COORDINATOR: Final = "coordinator"
 CONF_COOLING_ON: Final = "cooling_on"
+CONF_DEADBAND: Final = "deadband"  # pw-beta
+CONF_DEADBAND_RELATIVE: Final = "deadband_relative"  # pw-beta
+CONF_FILTER_SENSOR: Final = "filter_sensor"  # pw-beta
+CONF_HEARTBEAT: Final = "heartbeat"  # pw-beta
+CONF_HISTORY_WINDOW: Final = "history_window"  # pw-beta
 CONF_HOMEKIT_EMULATION: Final = "homekit_emulation"  # pw-beta
 CONF_REFRESH_INTERVAL: Final = "refresh_interval"  # pw-beta
 CONF_MANUAL_PATH: Final = "Enter Manually"
+CONF_MIN_PUBLISH_INTERVAL: Final = "min_publish_interval"  # pw-beta
+CONF_POLLING_TIERS: Final = "polling_tiers"  # pw-beta
+CONF_SENSOR_FILTERS: Final = "sensor_filters"  # pw-beta
+CONF_USB_LINK_SENSORS: Final = "usb_link_sensors"  # pw-beta
+CONF_USB_UPDATE_INTERVAL: Final = "usb_update_interval"  # pw-beta
+ENERGY_LOG: Final = "energy_log"  # pw-beta
+ENTRY_DATA: Final = "entry_data"  # pw-beta
 GATEWAY: Final = "gateway"
+HEALTH: Final = "health"  # pw-beta
+HISTORY: Final = "history"  # pw-beta
 ID: Final = "id"
+NODE_CACHE: Final = "node_cache"  # pw-beta
+PLATFORMS: Final = "platforms"
+POLLER: Final = "poller"  # pw-beta
 PW_LOCATION: Final = "location"
 PW_TYPE: Final = "plugwise_type"
+SCHEDULER: Final = "scheduler"  # pw-beta
+SED_QUEUE: Final = "sed_queue"  # pw-beta
 SMILE: Final = "smile"
 STICK: Final = "stick"
 STRETCH: Final = "stretch"
@@ -38,7 +65,19 @@ FLOW_USB: Final = "USB: Stick"
 UNDO_UPDATE_LISTENER: Final = "undo_update_listener"
 
 # Default directives
+DEFAULT_COMMAND_CONCURRENCY: Final = 4  # pw-beta - bulk services, per gateway
+DEFAULT_HEARTBEAT: Final = 300  # pw-beta
+DEFAULT_HISTORY_BUCKETS: Final = 30  # pw-beta
+DEFAULT_HISTORY_WINDOW: Final = 15  # pw-beta - minutes
 DEFAULT_PORT: Final = 80
+POINT_DEADBAND: Final = 5.0  # pw-beta - Watt, P1 point values flicker on every poll
+DEFAULT_REFRESH_INTERVAL: Final = 1.5  # pw-beta
+DEFAULT_SLOW_TIER_INTERVAL: Final = timedelta(minutes=5)  # pw-beta
+# pw-beta - the internals of the Smile the fast tier relies on, as known in
+# the python-plugwise versions listed
+FAST_TIER_API: Final = ("_appliances", "_get_device_data", "_request")
+FAST_TIER_PLUGWISE_VERSIONS: Final = ("0.21.0",)
+DEFAULT_STICK_TIMEOUT: Final = 15  # pw-beta - seconds, the stick times out at 10
 DEFAULT_SCAN_INTERVAL: Final[dict[str, timedelta]] = {
     "power": timedelta(seconds=10),
     "stretch": timedelta(seconds=60),
@@ -46,6 +85,15 @@ DEFAULT_SCAN_INTERVAL: Final[dict[str, timedelta]] = {
 }
 DEFAULT_TIMEOUT: Final = 10
 DEFAULT_USERNAME: Final = "smile"
+DEFAULT_USB_DEGRADED_PING: Final = 500  # pw-beta - ms, slowest twentieth of a link
+DEFAULT_USB_DEGRADED_RSSI: Final = -85  # pw-beta - dBm, worst tenth of a link
+DEFAULT_USB_ENERGY_BACKFILL: Final = timedelta(days=7)  # pw-beta
+DEFAULT_USB_LINK_SENSORS: Final = True  # pw-beta - new sticks are set up without
+DEFAULT_USB_POLL_BUDGET: Final = 1.0  # pw-beta - power polls per second, all nodes
+DEFAULT_USB_POLL_MAX_INTERVAL: Final = 120  # pw-beta - seconds, flat nodes
+DEFAULT_USB_POLL_MIN_INTERVAL: Final = 5  # pw-beta - seconds, busy nodes
+DEFAULT_USB_TELEMETRY_INTERVAL: Final = 5  # pw-beta - seconds, per node and request
+DEFAULT_USB_UPDATE_INTERVAL: Final = 0.25  # pw-beta - seconds
 
 # --- Const for Plugwise Smile and Stretch
 PLATFORMS_GATEWAY: Final[list[str]] = [
@@ -58,8 +106,57 @@ PLATFORMS_GATEWAY: Final[list[str]] = [
 ]
 SENSOR_PLATFORMS: Final[list[str]] = [Platform.SENSOR, Platform.SWITCH]
 SERVICE_DELETE: Final = "delete_notification"
+SERVICE_GET_RECENT_HISTORY: Final = "get_recent_history"  # pw-beta
+SERVICE_SET_SWITCHES: Final = "set_switches"  # pw-beta
+SERVICE_SET_ZONES: Final = "set_zones"  # pw-beta
 SEVERITIES: Final[list[str]] = ["other", "info", "message", "warning", "error"]
 
+# Recent history const:
+ATTR_BUCKETS: Final = "buckets"
+ATTR_MINUTES: Final = "minutes"
+EVENT_RECENT_HISTORY: Final = "plugwise_recent_history"
+SERVICE_GET_RECENT_HISTORY_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_MINUTES): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_BUCKETS, default=DEFAULT_HISTORY_BUCKETS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+    }
+)
+
+# Bulk zones const:
+ATTR_PRESET_MODE: Final = "preset_mode"
+ATTR_ZONES: Final = "zones"
+EVENT_SET_ZONES: Final = "plugwise_set_zones"
+SERVICE_SET_ZONES_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ZONES): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                        vol.Optional(ATTR_PRESET_MODE): cv.string,
+                        vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+                    },
+                    cv.has_at_least_one_key(ATTR_PRESET_MODE, ATTR_TEMPERATURE),
+                )
+            ],
+        ),
+    }
+)
+
+# Bulk switches const:
+ATTR_SWITCHES: Final = "switches"
+EVENT_SET_SWITCHES: Final = "plugwise_set_switches"
+SERVICE_SET_SWITCHES_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_STATE): vol.In([STATE_ON, STATE_OFF]),
+    }
+)
+
 # Climate const:
 MASTER_THERMOSTATS: Final[list[str]] = [
     "thermostat",
@@ -67,6 +164,10 @@ MASTER_THERMOSTATS: Final[list[str]] = [
     "zone_thermostat",
     "thermostatic_radiator_valve",
 ]
+ZONE_VALVES: Final[list[str]] = [
+    "thermo_sensor",
+    "thermostatic_radiator_valve",
+]  # pw-beta
 
 # Config_flow const:
 ZEROCONF_MAP: Final[dict[str, str]] = {
@@ -131,9 +232,27 @@ TARGET_TEMP_HIGH: Final = "setpoint_high"
 TARGET_TEMP_LOW: Final = "setpoint_low"
 TEMP_DIFF: Final = "temperature_difference"
 VALVE_POS: Final = "valve_position"
+ZONE_LOWEST_BATTERY: Final = "zone_lowest_battery"  # pw-beta
+ZONE_VALVE_POS: Final = "zone_valve_position"  # pw-beta
 WATER_PRESSURE: Final = "water_pressure"
 WATER_TEMP: Final = "water_temperature"
 
+# Derived P1 energy sensors (pw-beta)
+NET_COVERAGE_RATIO: Final = "net_coverage_ratio"
+NET_EL_OFF_PEAK_TODAY: Final = "net_electricity_off_peak_today"
+NET_EL_PEAK_TODAY: Final = "net_electricity_peak_today"
+NET_EL_THIS_HOUR: Final = "net_electricity_this_hour"
+NET_EL_TODAY: Final = "net_electricity_today"
+P1_ENERGY_STORAGE_VERSION: Final = 1
+
+# Numbers
+DHW_SETPOINT: Final = "domestic_hot_water_setpoint"
+MAX_BOILER_TEMP: Final = "maximum_boiler_temperature"
+
+# Selects
+AVAILABLE_SCHEDULES: Final = "available_schedules"
+REGULATION_MODES: Final = "regulation_modes"
+
 # Switches
 DHW_COMF_MODE: Final = "dhw_cm_switch"
 LOCK: Final = "lock"
@@ -156,6 +275,15 @@ CB_JOIN_REQUEST: Final = "JOIN_REQUEST"
 
 # USB generic device constants
 USB_AVAILABLE_ID: Final = "available"
+USB_NODE_CACHE_STORAGE_VERSION: Final = 1  # pw-beta
+# pw-beta - the sensors per node of the link, only with CONF_USB_LINK_SENSORS
+USB_LINK_SENSORS: Final = ("ping", "RSSI_in", "RSSI_out")
+# pw-beta - aggregated by the integration over the links of the network
+USB_NETWORK_DEGRADED_LINKS: Final = "network_degraded_links"
+USB_NETWORK_PING_MEDIAN: Final = "network_ping_median"
+USB_NETWORK_PING_P95: Final = "network_ping_p95"
+USB_NETWORK_RSSI_WORST: Final = "network_rssi_worst"
+USB_SED_QUEUE_STORAGE_VERSION: Final = 1  # pw-beta
 
 ATTR_MAC_ADDRESS: Final = "mac"
 
@@ -177,6 +305,7 @@ ATTR_SED_MAINTENANCE_INTERVAL: Final = "maintenance_interval"
 ATTR_SED_CLOCK_SYNC: Final = "clock_sync"
 ATTR_SED_CLOCK_INTERVAL: Final = "clock_interval"
 
+SED_SLEEP_CONFIG: Final = "sleep_config"  # pw-beta - queued until awake
 SERVICE_USB_SED_BATTERY_CONFIG: Final = "configure_battery_savings"
 SERVICE_USB_SED_BATTERY_CONFIG_SCHEMA: Final = {
     vol.Required(ATTR_SED_STAY_ACTIVE): vol.All(
@@ -211,6 +340,7 @@ SCAN_SENSITIVITY_MODES = [
     SCAN_SENSITIVITY_OFF,
 ]
 
+SED_SCAN_CONFIG: Final = "scan_config"  # pw-beta - queued until awake
 SERVICE_USB_SCAN_CONFIG: Final = "configure_scan"
 SERVICE_USB_SCAN_CONFIG_SCHEMA = (
     {
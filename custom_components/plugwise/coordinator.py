@@ -1,16 +1,25 @@
 """DataUpdateCoordinator for Plugwise."""
 from datetime import timedelta
+from time import monotonic, perf_counter
 from typing import Any, NamedTuple
 
-from plugwise import Smile
+from plugwise import Smile, __version__ as PLUGWISE_VERSION
+from plugwise.constants import APPLIANCES
 from plugwise.exceptions import PlugwiseException, XMLDataMissingError
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 # pw-beta - for core compat should import DEFAULT_SCAN_INTERVAL
-from .const import DOMAIN, LOGGER
+from .const import (
+    DEFAULT_SLOW_TIER_INTERVAL,
+    DOMAIN,
+    FAST_TIER_API,
+    FAST_TIER_PLUGWISE_VERSIONS,
+    LOGGER,
+)
+from .zones import ZoneIndex
 
 
 class PlugwiseData(NamedTuple):
@@ -20,6 +29,26 @@ class PlugwiseData(NamedTuple):
     devices: dict[str, dict[str, Any]]
 
 
+def _smile_internals_known(api: Smile) -> bool:
+    """Return True when the internals of the Smile used by the fast tier are known.
+
+    Only checked against the python-plugwise versions listed, any other
+    version falls back to full updates.
+    """
+    return PLUGWISE_VERSION in FAST_TIER_PLUGWISE_VERSIONS and all(
+        hasattr(api, attribute) for attribute in FAST_TIER_API
+    )
+
+
+async def _async_appliances_data(
+    api: Smile, device_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Request the appliances only, return the data of the devices given."""
+    # pylint: disable=protected-access
+    api._appliances = await api._request(APPLIANCES)
+    return {device_id: api._get_device_data(device_id) for device_id in device_ids}
+
+
 class PlugwiseDataUpdateCoordinator(DataUpdateCoordinator[PlugwiseData]):
     """Class to manage fetching Plugwise data from single endpoint."""
 
@@ -43,12 +72,184 @@ class PlugwiseDataUpdateCoordinator(DataUpdateCoordinator[PlugwiseData]):
             ),
         )
         self.api = api
+        self._discovered = False
+        # pw-beta - only notify the entities of the devices with changed data
+        self._fingerprints: dict[str, str] | None = None
+        self._marked: set[str] = set()
+        self.fan_out: dict[str, float] = {}
+        self.zones = ZoneIndex()  # pw-beta
+        # pw-beta - polling tiers
+        self.tiered = False
+        self._full_update_at = 0.0
+        self._full_update_requested = False
+
+    @callback
+    def async_set_intervals(self, cooldown: float, interval: timedelta) -> None:
+        """Apply a new refresh cooldown and update interval while running."""
+        if self._debounced_refresh is not None:
+            self._debounced_refresh.cooldown = cooldown
+        if interval == self.update_interval:
+            return
+
+        self.update_interval = interval
+        # Reschedule right away instead of waiting for the pending refresh
+        if self._listeners:
+            self._schedule_refresh()
+
+    @property
+    def supports_tiers(self) -> bool:
+        """Return True when the appliances can be refreshed on their own.
+
+        The fast tier uses internals of the Smile, without them (i.e. after a
+        change of python-plugwise) every update is a full update.
+        """
+        return (
+            self.api.smile_type == "thermostat"
+            and not getattr(self.api, "_smile_legacy", True)
+            and _smile_internals_known(self.api)
+        )
+
+    async def async_request_refresh(self) -> None:
+        """Request a full refresh, a command can change any data."""
+        self._full_update_requested = True
+        await super().async_request_refresh()
+
+    @callback
+    def async_mark_dirty(self, device_id: str) -> None:
+        """Notify the entities of a device on the next update, even unchanged."""
+        self._marked.add(device_id)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of the devices with changed data, in one pass.
+
+        The listeners of the entities carry their device_id as context, all
+        other listeners are always updated.
+        """
+        start = perf_counter()
+        dirty = self._async_dirty_devices()
+        listeners = list(self._listeners.values())
+        notified = 0
+        for update_callback, device_id in listeners:
+            if device_id is None or dirty is None or device_id in dirty:
+                update_callback()
+                notified += 1
+
+        self.fan_out = {
+            "listeners": len(listeners),
+            "notified": notified,
+            "devices_changed": -1 if dirty is None else len(dirty),
+            "duration_ms": round((perf_counter() - start) * 1000, 3),
+        }
+        LOGGER.debug("Fan-out of %s: %s", self.name, self.fan_out)
+
+    @callback
+    def _async_dirty_devices(self) -> set[str] | None:
+        """Return the devices with changed data since the last update.
+
+        None means all, after a (failed) update changing the availability.
+        """
+        marked, self._marked = self._marked, set()
+        if not self.last_update_success or self.data is None:
+            self._fingerprints = None
+            return None
+
+        fingerprints = {
+            device_id: repr(device) for device_id, device in self.data.devices.items()
+        }
+        fingerprints[""] = repr(self.data.gateway)
+        previous, self._fingerprints = self._fingerprints, fingerprints
+        if previous is None or previous[""] != fingerprints[""]:
+            return None
+
+        dirty = {
+            device_id
+            for device_id in previous.keys() | fingerprints.keys()
+            if previous.get(device_id) != fingerprints.get(device_id)
+        }
+        # The zone sensors of the primary thermostat aggregate the zone members
+        for device_id in list(dirty):
+            if (zone := self.zones.zone_of(device_id)) and zone.primary:
+                dirty.add(zone.primary)
+        # The climate entities also show the heater and gateway data
+        gateway = self.data.gateway
+        if not dirty.isdisjoint((gateway.get("heater_id"), gateway.get("gateway_id"))):
+            dirty |= self.zones.thermostats
+        return dirty | marked
+
+    async def _async_discover_devices(self) -> list[Any]:
+        """Discover the devices from the data collected by connect().
+
+        The discovery output is used as the first PlugwiseData, so the
+        gateway is not requested and processed a second time on start-up.
+        """
+        await self.hass.async_add_executor_job(self.api.get_all_devices)
+        self._discovered = True
+
+        gateway, devices = self.api.gw_data, self.api.gw_devices
+        # Only async_update() adds the notifications, complete the first data
+        if "notifications" not in gateway:
+            # pylint: disable-next=protected-access
+            gateway["notifications"] = getattr(self.api, "_notifications", {})
+        if (
+            binary_sensors := devices.get(gateway["gateway_id"], {}).get(
+                "binary_sensors"
+            )
+        ) and "plugwise_notification" in binary_sensors:
+            binary_sensors["plugwise_notification"] = gateway["notifications"] != {}
+
+        return [gateway, devices]
+
+    def _fast_tier_due(self) -> bool:
+        """Return True when only the fast tier needs to be refreshed."""
+        return (
+            self.tiered
+            and self.supports_tiers
+            and not self._full_update_requested
+            and monotonic() - self._full_update_at
+            < DEFAULT_SLOW_TIER_INTERVAL.total_seconds()
+        )
+
+    async def _async_update_fast_tier(self) -> list[Any]:
+        """Refresh the heater, plugs and relays from the appliances only.
+
+        The large domain_objects, holding the zones, schedules and settings,
+        is only requested by the full update of the slow tier.
+        """
+        devices = self.api.gw_devices
+        refreshed = {
+            device_id: device
+            for device_id, device in devices.items()
+            if device.get("dev_class") == "heater_central" or "switches" in device
+        }
+        appliances = await _async_appliances_data(self.api, list(refreshed))
+        for device_id, device in refreshed.items():
+            data = appliances[device_id]
+            for item in ("binary_sensors", "sensors", "switches"):
+                for key in device.get(item, {}):
+                    if key in data:
+                        device[item][key] = data[key]
+        # As async_update(), the heating and cooling states follow the cooling
+        # mode, only for the devices refreshed: the thermostats keep theirs
+        self.api.update_for_cooling(refreshed)
+
+        return [self.api.gw_data, devices]
 
     async def _async_update_data(self) -> PlugwiseData:
         """Fetch data from Plugwise."""
         try:
-            data = await self.api.async_update()
-            LOGGER.debug("Plugwise %s updated", self.api.smile_name)
+            if not self._discovered:
+                data = await self._async_discover_devices()
+                self._full_update_at = monotonic()
+                LOGGER.debug("Plugwise %s devices discovered", self.api.smile_name)
+            elif self._fast_tier_due():
+                data = await self._async_update_fast_tier()
+                LOGGER.debug("Plugwise %s fast tier updated", self.api.smile_name)
+            else:
+                data = await self.api.async_update()
+                self._full_update_at = monotonic()
+                self._full_update_requested = False
+                LOGGER.debug("Plugwise %s updated", self.api.smile_name)
         except XMLDataMissingError as err:
             raise UpdateFailed(
                 f"No XML data received for: {self.api.smile_name}"
@@ -56,4 +257,6 @@ class PlugwiseDataUpdateCoordinator(DataUpdateCoordinator[PlugwiseData]):
         except PlugwiseException as err:
             raise UpdateFailed(f"Updated failed for: {self.api.smile_name}") from err
         LOGGER.debug("Data: %s", PlugwiseData(*data))
+        if changed := self.zones.update(data[1]):
+            LOGGER.debug("Zones changed: %s", changed)
         return PlugwiseData(*data)
@@ -6,18 +6,58 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import COORDINATOR, DOMAIN
+from .const import (
+    BRIDGE,
+    COORDINATOR,
+    DOMAIN,
+    ENERGY_LOG,
+    HEALTH,
+    HISTORY,
+    NODE_CACHE,
+    POLLER,
+    PW_TYPE,
+    SCHEDULER,
+    SED_QUEUE,
+    USB,
+)
 from .coordinator import PlugwiseDataUpdateCoordinator
+from .history import SensorHistory
 
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    # pw-beta
+    if hass.data[DOMAIN][entry.entry_id][PW_TYPE] == USB:
+        energy_log = hass.data[DOMAIN][entry.entry_id].get(ENERGY_LOG)
+        return {
+            "bridge": hass.data[DOMAIN][entry.entry_id][BRIDGE].as_dict(),
+            "energy_log": energy_log.as_dict() if energy_log else None,
+            "health": hass.data[DOMAIN][entry.entry_id][HEALTH].as_dict(),
+            "nodes": hass.data[DOMAIN][entry.entry_id][NODE_CACHE].nodes,
+            "poller": hass.data[DOMAIN][entry.entry_id][POLLER].as_dict(),
+            "scheduler": hass.data[DOMAIN][entry.entry_id][SCHEDULER].as_dict(),
+            "sed_queue": hass.data[DOMAIN][entry.entry_id][SED_QUEUE].as_dict(),
+        }
+
     coordinator: PlugwiseDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
         COORDINATOR
     ]
+    # pw-beta
+    histories: dict[str, SensorHistory] = hass.data[DOMAIN][entry.entry_id].get(
+        HISTORY, {}
+    )
     return {
         "gateway": coordinator.data.gateway,
         "devices": coordinator.data.devices,
+        "fan_out": coordinator.fan_out,
+        "history": {
+            unique_id: {
+                "samples": len(history),
+                "capacity": history.capacity,
+                "bytes": history.memory_usage,
+            }
+            for unique_id, history in histories.items()
+        },
     }
@@ -0,0 +1,158 @@
+"""Energy totals derived from the cumulative counters of the Plugwise P1."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EL_CONSUMED_OFF_PEAK_CUMULATIVE,
+    EL_CONSUMED_PEAK_CUMULATIVE,
+    EL_PRODUCED_OFF_PEAK_CUMULATIVE,
+    EL_PRODUCED_PEAK_CUMULATIVE,
+    NET_COVERAGE_RATIO,
+    NET_EL_OFF_PEAK_TODAY,
+    NET_EL_PEAK_TODAY,
+    NET_EL_THIS_HOUR,
+    NET_EL_TODAY,
+    P1_ENERGY_STORAGE_VERSION,
+)
+
+P1_CONSUMED = (EL_CONSUMED_OFF_PEAK_CUMULATIVE, EL_CONSUMED_PEAK_CUMULATIVE)
+P1_PRODUCED = (EL_PRODUCED_OFF_PEAK_CUMULATIVE, EL_PRODUCED_PEAK_CUMULATIVE)
+P1_COUNTERS = P1_CONSUMED + P1_PRODUCED
+SAVE_DELAY = 60
+# Readings further apart span an outage, not a poll over a period boundary
+MAX_READING_GAP = timedelta(minutes=5)
+
+
+class P1EnergyTracker:
+    """Accumulate the daily and hourly energy totals of a P1.
+
+    Only the difference between two readings of each counter is processed,
+    so an update costs the same regardless of the length of the period. A
+    counter going down (meter replaced or reset) becomes the new baseline.
+    The state is stored, the totals continue after a restart. The energy of
+    a restart or outage crossing into a new period is not known per period,
+    it is left out of the new period.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self._store: Store = Store(
+            hass, P1_ENERGY_STORAGE_VERSION, f"{DOMAIN}.p1_energy.{entry_id}"
+        )
+        self._processed: Any = None
+        self._counters: dict[str, float] = {}
+        self._day_start: datetime | None = None
+        self._hour_start: datetime | None = None
+        self._day: dict[str, float] = dict.fromkeys(P1_COUNTERS, 0.0)
+        self._hour_net = 0.0
+        self._read_at: datetime | None = None
+
+    @property
+    def day_start(self) -> datetime | None:
+        """Return the start of the current day period."""
+        return self._day_start
+
+    @property
+    def hour_start(self) -> datetime | None:
+        """Return the start of the current hour period."""
+        return self._hour_start
+
+    async def async_load(self) -> None:
+        """Restore the state stored before the restart."""
+        if not (stored := await self._store.async_load()):
+            return
+
+        self._counters = stored["counters"]
+        self._day.update(stored["day"])
+        self._hour_net = stored["hour_net"]
+        if stored["day_start"]:
+            self._day_start = dt_util.parse_datetime(stored["day_start"])
+        if stored["hour_start"]:
+            self._hour_start = dt_util.parse_datetime(stored["hour_start"])
+
+    @callback
+    def async_update(self, data: Any, sensors: dict[str, Any]) -> None:
+        """Process the counters of a new coordinator update, once."""
+        if data is self._processed:
+            return
+        self._processed = data
+
+        now = dt_util.now()
+        # The counters restored are read before the restart
+        gap = self._read_at is None or now - self._read_at > MAX_READING_GAP
+        self._read_at = now
+        count_hour = count_day = True
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        if hour_start != self._hour_start:
+            self._hour_start = hour_start
+            self._hour_net = 0.0
+            count_hour = not gap
+        day_start = dt_util.start_of_local_day(now)
+        if day_start != self._day_start:
+            self._day_start = day_start
+            self._day = dict.fromkeys(P1_COUNTERS, 0.0)
+            count_day = not gap
+
+        for counter in P1_COUNTERS:
+            if (value := sensors.get(counter)) is None:
+                continue
+            last = self._counters.get(counter)
+            self._counters[counter] = value
+            if last is None or value < last:
+                continue
+            delta = value - last
+            if count_day:
+                self._day[counter] += delta
+            if not count_hour:
+                continue
+            if counter in P1_CONSUMED:
+                self._hour_net += delta
+            else:
+                self._hour_net -= delta
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def value(self, key: str) -> float | None:
+        """Return the value of a derived sensor."""
+        day = self._day
+        consumed = sum(day[counter] for counter in P1_CONSUMED)
+        produced = sum(day[counter] for counter in P1_PRODUCED)
+        if key == NET_EL_TODAY:
+            return round(consumed - produced, 3)
+        if key == NET_EL_THIS_HOUR:
+            return round(self._hour_net, 3)
+        if key == NET_EL_PEAK_TODAY:
+            return round(
+                day[EL_CONSUMED_PEAK_CUMULATIVE] - day[EL_PRODUCED_PEAK_CUMULATIVE], 3
+            )
+        if key == NET_EL_OFF_PEAK_TODAY:
+            return round(
+                day[EL_CONSUMED_OFF_PEAK_CUMULATIVE]
+                - day[EL_PRODUCED_OFF_PEAK_CUMULATIVE],
+                3,
+            )
+        if key == NET_COVERAGE_RATIO:
+            # The share of the imported energy netted by the export, the P1
+            # does not see the energy produced and used behind the meter
+            if not consumed:
+                return None
+            return round(min(produced, consumed) / consumed * 100, 1)
+        return None
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the state to store."""
+        return {
+            "counters": self._counters,
+            "day": self._day,
+            "hour_net": self._hour_net,
+            "day_start": self._day_start.isoformat() if self._day_start else None,
+            "hour_start": self._hour_start.isoformat() if self._hour_start else None,
+        }
@@ -0,0 +1,238 @@
+"""Import the hourly energy logs of the Circles into long-term statistics."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timedelta
+import math
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import ENERGY_KILO_WATT_HOUR
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from plugwise.constants import UTF8_DECODE
+from plugwise.exceptions import PlugwiseException
+from plugwise.messages.requests import CircleEnergyCountersRequest, NodeInfoRequest
+from plugwise.messages.responses import (
+    CircleEnergyCountersResponse,
+    NodeInfoResponse,
+    NodeResponse,
+)
+
+from .const import DOMAIN, LOGGER
+
+FETCH_TIMEOUT = 120  # seconds, per Circle
+HOUR = timedelta(hours=1)
+LOG_SLOTS = 4  # hours per log address
+
+
+def energy_log_rows(
+    logs: Iterable[tuple[datetime, float]],
+    since: datetime,
+    until: datetime,
+    last_sum: float,
+) -> list[StatisticData]:
+    """Return the hourly rows of the logged hours from since up to until.
+
+    A log holds the energy of the hour before its timestamp. The hours not
+    logged (Circle unplugged) are left out, the sum continues after them.
+    """
+    rows: list[StatisticData] = []
+    total = last_sum
+    for logged, energy in sorted(logs):
+        if not since <= (start := logged - HOUR) < until:
+            continue
+        total += energy
+        rows.append(StatisticData(start=start, state=total, sum=total))
+    return rows
+
+
+class _Fetch:
+    """The energy logs of a Circle being read."""
+
+    def __init__(self, addresses: range) -> None:
+        """Initialize the fetch."""
+        self.addresses = addresses
+        self.last_address: asyncio.Future[
+            int
+        ] = asyncio.get_running_loop().create_future()
+        self.complete: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.logs: dict[int, list[tuple[datetime, int]]] = {}
+
+
+class USBEnergyLogImport:
+    """Read the energy logs of the Circles, write them as hourly statistics.
+
+    The Circles log the energy of every hour in their memory. After a
+    restart (and every hour) the logs of the hours since the last row
+    stored are read, at most the backfill period, and written in one insert
+    per Circle. The Circles are read one after the other: only the logs of
+    one Circle are held, whatever the size of the network. The requests go
+    at the low priority of the telemetry.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        nodes: Mapping[str, Any],
+        send: Callable[..., None],
+        backfill: timedelta,
+    ) -> None:
+        """Initialize the import."""
+        self._hass = hass
+        self._nodes = nodes
+        self._send = send
+        self._backfill = backfill
+        self._fetch: dict[str, _Fetch] = {}
+        self._lock = asyncio.Lock()
+        self.imported = 0
+        self.failed = 0
+        self.last_import: datetime | None = None
+
+    @staticmethod
+    def statistic_id(mac: str) -> str:
+        """Return the statistic_id of the energy consumption of a Circle."""
+        return f"{DOMAIN}:{mac.lower()}_energy_consumption"
+
+    def message_received(self, message: NodeResponse) -> None:
+        """Pass the logs of a Circle being read, called by the stick threads."""
+        if isinstance(message, (CircleEnergyCountersResponse, NodeInfoResponse)):
+            mac = message.mac.decode(UTF8_DECODE)
+            if mac in self._fetch:
+                self._hass.loop.call_soon_threadsafe(
+                    self._async_message_received, mac, message
+                )
+
+    @callback
+    def _async_message_received(self, mac: str, message: NodeResponse) -> None:
+        """Store the logs of a response."""
+        if (fetch := self._fetch.get(mac)) is None:
+            return
+        if isinstance(message, NodeInfoResponse):
+            if not fetch.last_address.done():
+                fetch.last_address.set_result(message.last_logaddr.value)
+            return
+
+        if (address := message.logaddr.value) not in fetch.addresses:
+            return
+        fetch.logs[address] = [
+            (logged, getattr(message, f"pulses{slot}").value)
+            for slot in range(1, LOG_SLOTS + 1)
+            if (logged := getattr(message, f"logdate{slot}").value) is not None
+        ]
+        if len(fetch.logs) == len(fetch.addresses) and not fetch.complete.done():
+            fetch.complete.set_result(None)
+
+    async def async_import(self, _: datetime | None = None) -> None:
+        """Import the logs of all Circles."""
+        if self._lock.locked():
+            return
+        async with self._lock:
+            for mac, node in list(self._nodes.items()):
+                if node is None or not node.measures_power or not node.available:
+                    continue
+                try:
+                    await self._async_import_node(mac, node)
+                except asyncio.TimeoutError:
+                    self.failed += 1
+                    LOGGER.debug("Reading the energy logs of %s timed out", mac)
+                except (HomeAssistantError, PlugwiseException) as err:
+                    # The other Circles are imported still
+                    self.failed += 1
+                    LOGGER.warning(
+                        "Importing the energy logs of %s failed: %s", mac, err
+                    )
+                finally:
+                    self._fetch.pop(mac, None)
+            self.last_import = dt_util.utcnow()
+
+    async def _async_import_node(self, mac: str, node: Any) -> None:
+        """Import the logs of the hours since the last row of a Circle."""
+        # The pulses cannot be converted before the calibration is known
+        if not node.calibration:
+            return
+        statistic_id = self.statistic_id(mac)
+        until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        since = until - self._backfill
+        last_sum = 0.0
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, True
+        )
+        if last:
+            since = max(since, last[statistic_id][0]["start"] + HOUR)
+            last_sum = last[statistic_id][0]["sum"] or 0.0
+        if (hours := int((until - since) / HOUR)) < 1:
+            return
+
+        mac_bytes = bytes(mac, UTF8_DECODE)
+        fetch = self._fetch[mac] = _Fetch(range(0))
+        self._send(NodeInfoRequest(mac_bytes))
+        last_address = await asyncio.wait_for(fetch.last_address, FETCH_TIMEOUT)
+        # One more address, the hours are not aligned to the slots
+        count = math.ceil(hours / LOG_SLOTS) + 1
+        fetch.addresses = range(max(last_address - count + 1, 0), last_address + 1)
+        for address in fetch.addresses:
+            self._send(CircleEnergyCountersRequest(mac_bytes, address))
+
+        try:
+            await asyncio.wait_for(fetch.complete, FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Only the hours before the first log missing, the next import
+            # continues from there
+            missing = min(set(fetch.addresses) - set(fetch.logs))
+            self.failed += 1
+            logs = [
+                log
+                for address, slots in fetch.logs.items()
+                if address < missing
+                for log in slots
+            ]
+        else:
+            logs = [log for slots in fetch.logs.values() for log in slots]
+
+        rows = energy_log_rows(
+            (
+                (
+                    logged.replace(tzinfo=dt_util.UTC),
+                    node.pulses_to_kws(pulses, 3600) or 0.0,
+                )
+                for logged, pulses in logs
+            ),
+            since,
+            until,
+            last_sum,
+        )
+        if not rows:
+            return
+
+        LOGGER.debug("Add %s statistics rows for %s", len(rows), statistic_id)
+        async_add_external_statistics(
+            self._hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"{node.hardware_model} ({mac}) Energy consumption",
+                source=DOMAIN,
+                statistic_id=statistic_id,
+                unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+            ),
+            rows,
+        )
+        self.imported += len(rows)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the imports, for the diagnostics."""
+        return {
+            "backfill_hours": int(self._backfill / HOUR),
+            "imported": self.imported,
+            "failed": self.failed,
+            "last_import": self.last_import,
+        }
@@ -1,18 +1,33 @@
 """Generic Plugwise Entity Class."""
 from __future__ import annotations
 
-from typing import Any
+from collections.abc import Callable, Mapping
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import ATTR_NAME, ATTR_VIA_DEVICE, CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import (
     CONNECTION_NETWORK_MAC,
     CONNECTION_ZIGBEE,
 )
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .bridge import USBUpdateBridge
+from .const import BRIDGE, DOMAIN, USB_AVAILABLE_ID
 from .coordinator import PlugwiseDataUpdateCoordinator
+from .models import (
+    PW_BINARY_SENSOR_TYPES,
+    PW_SENSOR_TYPES,
+    PW_SWITCH_TYPES,
+    PlugwiseEntityDescription,
+)
+
+if TYPE_CHECKING:
+    # The USB stack is only imported when a USB-stick entry is set up
+    from plugwise.nodes import PlugwiseNode
 
 
 class PlugwiseEntity(CoordinatorEntity[PlugwiseDataUpdateCoordinator]):
@@ -26,7 +41,8 @@ class PlugwiseEntity(CoordinatorEntity[PlugwiseDataUpdateCoordinator]):
         device_id: str,
     ) -> None:
         """Initialise the gateway."""
-        super().__init__(coordinator)
+        # The device_id as context, only changed devices update their entities
+        super().__init__(coordinator, context=device_id)
         self._dev_id = device_id
 
         configuration_url: str | None = None
@@ -86,3 +102,182 @@ class PlugwiseEntity(CoordinatorEntity[PlugwiseDataUpdateCoordinator]):
         """Subscribe to updates."""
         self._handle_coordinator_update()
         await super().async_added_to_hass()
+
+
+class PlugwiseUSBEntity(Entity):
+    """Base class for Plugwise USB entities."""
+
+    entity_description: PlugwiseEntityDescription
+
+    # Github issue #265: the entity_description is not working accordingly
+    def __init__(
+        self, node: PlugwiseNode, entity_description: PlugwiseEntityDescription
+    ) -> None:
+        """Initialize a Pluswise USB entity."""
+        self._attr_available = node.available
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, node.mac)},
+            "name": f"{node.hardware_model} ({node.mac})",
+            "manufacturer": "Plugwise",
+            "model": node.hardware_model,
+            "sw_version": f"{node.firmware_version}",
+        }
+        self._attr_name = f"{entity_description.name} ({node.mac[-5:]})"
+        # Github issue #265
+        self._attr_should_poll = entity_description.should_poll  # type: ignore[attr-defined]
+        # /Github issue #265
+        self._attr_unique_id = f"{node.mac}-{entity_description.key}"
+        self._node = node
+        self.entity_description = entity_description
+        self.node_callbacks = (USB_AVAILABLE_ID, entity_description.key)
+        self._bridge: USBUpdateBridge | None = None  # pw-beta
+        # pw-beta - bind the accessor once, the value is read on a node callback
+        # Github issue #265
+        self._get_value = attrgetter(entity_description.state_request_method)  # type: ignore[attr-defined]
+        # /Github issue #265
+        self._value: Any = self._convert(self._get_value(node))
+
+    @staticmethod
+    def _convert(value: Any) -> Any:
+        """Return the value to cache of a node state."""
+        return value
+
+    async def async_added_to_hass(self):
+        """Subscribe for updates."""
+        # pw-beta
+        if self.platform is not None and self.platform.config_entry is not None:
+            self._bridge = self.hass.data[DOMAIN][
+                self.platform.config_entry.entry_id
+            ].get(BRIDGE)
+        for node_callback in self.node_callbacks:
+            self._node.subscribe_callback(self.sensor_update, node_callback)
+
+    async def async_will_remove_from_hass(self):
+        """Unsubscribe to updates."""
+        for node_callback in self.node_callbacks:
+            self._node.unsubscribe_callback(self.sensor_update, node_callback)
+
+    # pw-beta
+    @callback
+    def async_set_node(self, node: PlugwiseNode) -> None:
+        """Continue with the node discovered, replacing the placeholder node."""
+        if self.hass is not None:
+            for node_callback in self.node_callbacks:
+                self._node.unsubscribe_callback(self.sensor_update, node_callback)
+                node.subscribe_callback(self.sensor_update, node_callback)
+        self._node = node
+        self._attr_available = node.available
+        self._value = self._convert(self._get_value(node))
+        if self.hass is None:
+            return
+
+        if self.registry_entry is not None and self.registry_entry.device_id:
+            dr.async_get(self.hass).async_update_device(
+                self.registry_entry.device_id,
+                model=node.hardware_model,
+                sw_version=f"{node.firmware_version}",
+            )
+        self.async_write_ha_state()
+
+    def sensor_update(self, state):
+        """Handle status update of Entity."""
+        self._attr_available = self._node.available
+        self._value = self._convert(self._get_value(self._node))  # pw-beta
+        # pw-beta - called from the stick threads, hand over to the loop in batches
+        if self._bridge is not None:
+            self._bridge.queue(self)
+        else:
+            self.schedule_update_ha_state()
+
+
+# pw-beta
+# The node states read by the USB entity descriptions
+USB_NODE_STATES = frozenset(
+    description.state_request_method
+    for description in (*PW_BINARY_SENSOR_TYPES, *PW_SENSOR_TYPES, *PW_SWITCH_TYPES)
+    if description.state_request_method
+)
+
+
+class USBPlaceholderNode:
+    """Stand in for a node known from an earlier run, not answering yet.
+
+    The node is unavailable and its states are unknown, the entities
+    continue with the node discovered once it answers.
+    """
+
+    available = False
+    battery_powered = False
+
+    def __init__(
+        self,
+        mac: str,
+        features: tuple[str, ...],
+        hardware_model: str | None,
+        firmware_version: str | None,
+    ) -> None:
+        """Initialize the placeholder node."""
+        self.mac = mac
+        self.features = features
+        self.hardware_model = hardware_model
+        self.firmware_version = firmware_version
+
+    def __getattr__(self, name: str) -> None:
+        """Return an unknown state, the node has no other attributes."""
+        if name in USB_NODE_STATES:
+            return None
+        raise AttributeError(f"{self.__class__.__name__} has no attribute {name!r}")
+
+    def subscribe_callback(self, callback: Callable[[Any], None], sensor: str) -> bool:
+        """Ignore the subscription, the node is not answering."""
+        return False
+
+    def unsubscribe_callback(
+        self, callback: Callable[[Any], None], sensor: str
+    ) -> None:
+        """Ignore the subscription, the node is not answering."""
+
+
+@callback
+def async_usb_placeholder_nodes(
+    hass: HomeAssistant,
+    entry_id: str,
+    domain: str,
+    nodes: Mapping[str, Any],
+    cached: Mapping[str, dict[str, Any]],
+) -> list[USBPlaceholderNode]:
+    """Return placeholders of the nodes known earlier, not discovered yet.
+
+    The nodes come from the node cache, for the nodes missing there from the
+    registered entities of the platform.
+    """
+    placeholders = [
+        USBPlaceholderNode(
+            mac, tuple(node["features"]), node["model"], node["firmware"]
+        )
+        for mac, node in cached.items()
+        if nodes.get(mac) is None
+    ]
+
+    features: dict[str, set[str]] = {}
+    for entity_entry in er.async_entries_for_config_entry(er.async_get(hass), entry_id):
+        mac, _, key = entity_entry.unique_id.partition("-")
+        if (
+            entity_entry.domain == domain
+            and nodes.get(mac) is None
+            and mac not in cached
+        ):
+            features.setdefault(mac, set()).add(key)
+
+    device_registry = dr.async_get(hass)
+    for mac, keys in features.items():
+        device = device_registry.async_get_device({(DOMAIN, mac)})
+        placeholders.append(
+            USBPlaceholderNode(
+                mac,
+                tuple(keys),
+                device.model if device else None,
+                device.sw_version if device else None,
+            )
+        )
+    return placeholders
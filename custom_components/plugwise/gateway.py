@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from aiohttp import ClientError
+import asyncio
 import datetime as dt
+from time import monotonic, time
 from typing import Any
 import voluptuous as vol
 
@@ -15,36 +17,72 @@ from plugwise.exceptions import (
 )
 from plugwise.smile import Smile
 
+from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
+from homeassistant.components.climate.const import DEFAULT_MAX_TEMP, DEFAULT_MIN_TEMP
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_STATE,
+    ATTR_TEMPERATURE,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_PORT,
     CONF_USERNAME,
     CONF_SCAN_INTERVAL,
+    STATE_ON,
     Platform,
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
+    ATTR_BUCKETS,  # pw-beta
+    ATTR_MINUTES,  # pw-beta
+    ATTR_PRESET_MODE,  # pw-beta
+    ATTR_SWITCHES,  # pw-beta
+    ATTR_ZONES,  # pw-beta
+    AVAILABLE_SCHEDULES,
+    CONF_HISTORY_WINDOW,  # pw-beta
+    CONF_POLLING_TIERS,  # pw-beta
     CONF_REFRESH_INTERVAL,  # pw-beta
     COORDINATOR,
+    DEFAULT_COMMAND_CONCURRENCY,  # pw-beta
+    DEFAULT_HISTORY_WINDOW,  # pw-beta
     DEFAULT_PORT,
+    DEFAULT_REFRESH_INTERVAL,  # pw-beta
     DEFAULT_SCAN_INTERVAL,  # pw-beta
     DEFAULT_USERNAME,
+    DHW_SETPOINT,
     DOMAIN,
+    EL_CONSUMED_PEAK_CUMULATIVE,  # pw-beta
+    ENTRY_DATA,  # pw-beta
+    EVENT_RECENT_HISTORY,  # pw-beta
+    EVENT_SET_SWITCHES,  # pw-beta
+    EVENT_SET_ZONES,  # pw-beta
+    GAS_CONSUMED_CUMULATIVE,  # pw-beta
     GATEWAY,
+    HISTORY,  # pw-beta
     LOGGER,
+    MASTER_THERMOSTATS,
+    MAX_BOILER_TEMP,
+    PLATFORMS,
     PLATFORMS_GATEWAY,
     PW_TYPE,
+    REGULATION_MODES,
     SERVICE_DELETE,
+    SERVICE_GET_RECENT_HISTORY,  # pw-beta
+    SERVICE_GET_RECENT_HISTORY_SCHEMA,  # pw-beta
+    SERVICE_SET_SWITCHES,  # pw-beta
+    SERVICE_SET_SWITCHES_SCHEMA,  # pw-beta
+    SERVICE_SET_ZONES,  # pw-beta
+    SERVICE_SET_ZONES_SCHEMA,  # pw-beta
     UNDO_UPDATE_LISTENER,
 )
-from .coordinator import PlugwiseDataUpdateCoordinator
+from .coordinator import PlugwiseData, PlugwiseDataUpdateCoordinator
+from .history import history_capacity
 
 
 async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -73,8 +111,6 @@ async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except (ClientError, ConnectionFailedError) as err:
         raise ConfigEntryNotReady("Failed connecting to the Plugwise Smile") from err
 
-    api.get_all_devices()
-
     # Migrate to the new smile hostname as unique_id
     # This migration is from several years back, can probably be removed
     if entry.unique_id is None and api.smile_version[0] != "1.8.0":
@@ -82,20 +118,12 @@ async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entry, unique_id=api.smile_hostname
         )  # pragma: no cover
 
-    # pw-beta scan-interval
-    update_interval: dt.timedelta = DEFAULT_SCAN_INTERVAL[api.smile_type]
-    if custom_time := entry.options.get(CONF_SCAN_INTERVAL):
-        update_interval = dt.timedelta(seconds=int(custom_time))  # pragma: no cover
-    LOGGER.debug("DUC update interval: %s", update_interval.seconds)
-
-    # pw-beta frontend refresh-interval
-    cooldown = 1.5
-    if custom_refresh := entry.options.get(CONF_REFRESH_INTERVAL):  # pragma: no cover
-        cooldown = custom_refresh
-    LOGGER.debug("DUC cooldown interval: %s", custom_refresh)
+    # pw-beta scan-interval and frontend refresh-interval
+    cooldown, update_interval = _get_intervals(api.smile_type, entry)
 
     # pw-beta - update_interval as extra
     coordinator = PlugwiseDataUpdateCoordinator(hass, api, cooldown, update_interval)
+    coordinator.tiered = entry.options.get(CONF_POLLING_TIERS, False)  # pw-beta
     await coordinator.async_config_entry_first_refresh()
     # Migrate a changed sensor unique_id
     migrate_sensor_entity(hass, coordinator)
@@ -103,8 +131,15 @@ async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # pw-beta
     undo_listener = entry.add_update_listener(_update_listener)
 
+    # Only forward the platforms that will actually create entities
+    platforms = async_get_platforms(coordinator.data)
+    LOGGER.debug("Forwarding platforms: %s", platforms)
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         COORDINATOR: coordinator,  # pw-beta
+        ENTRY_DATA: dict(entry.data),  # pw-beta
+        HISTORY: {},  # pw-beta
+        PLATFORMS: platforms,
         PW_TYPE: GATEWAY,  # pw-beta
         UNDO_UPDATE_LISTENER: undo_listener,  # pw-beta
     }
@@ -131,7 +166,37 @@ async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "Failed to delete the Plugwise Notification for %s", api.smile_name
             )
 
-    hass.config_entries.async_setup_platforms(entry, PLATFORMS_GATEWAY)
+    hass.config_entries.async_setup_platforms(entry, platforms)
+
+    @callback
+    def _async_add_new_platforms() -> None:
+        """Forward the platforms for capabilities that appeared after setup."""
+        for platform in async_get_platforms(coordinator.data):
+            if platform in platforms:
+                continue
+            LOGGER.debug("New capability found, forwarding platform: %s", platform)
+            platforms.append(platform)
+            hass.async_create_task(
+                hass.config_entries.async_forward_entry_setup(entry, platform)
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_platforms))
+
+    # pw-beta - write the hourly statistics of the energy counters
+    if "recorder" in hass.config.components and _has_counters(coordinator.data):
+        # pylint: disable-next=import-outside-toplevel
+        from .statistics import PlugwiseStatistics
+
+        statistics = PlugwiseStatistics(hass, coordinator)
+
+        async def _async_start_statistics() -> None:
+            """Backfill the missing hours, then follow the updates."""
+            await statistics.async_load()
+            entry.async_on_unload(
+                coordinator.async_add_listener(statistics.async_update)
+            )
+
+        hass.async_create_task(_async_start_statistics())
 
     # pw-beta
     for component in PLATFORMS_GATEWAY:
@@ -140,24 +205,351 @@ async def async_setup_entry_gw(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 DOMAIN, SERVICE_DELETE, delete_notification, schema=vol.Schema({})
             )
 
+    # pw-beta: HA service - get_recent_history
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_RECENT_HISTORY):
+
+        async def get_recent_history(call: ServiceCall) -> None:
+            """Service: fire an event with the recent history of a sensor."""
+            _async_fire_recent_history(hass, call)
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_RECENT_HISTORY,
+            get_recent_history,
+            schema=SERVICE_GET_RECENT_HISTORY_SCHEMA,
+        )
+
+    # pw-beta: HA service - set_switches
+    if not hass.services.has_service(DOMAIN, SERVICE_SET_SWITCHES):
+
+        async def set_switches(call: ServiceCall) -> None:
+            """Service: switch a batch of relays on or off."""
+            await _async_set_switches(hass, call)
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SET_SWITCHES,
+            set_switches,
+            schema=SERVICE_SET_SWITCHES_SCHEMA,
+        )
+
+    # pw-beta: HA service - set_zones
+    if not hass.services.has_service(DOMAIN, SERVICE_SET_ZONES):
+
+        async def set_zones(call: ServiceCall) -> None:
+            """Service: set the preset and/or setpoint of a batch of zones."""
+            await _async_set_zones(hass, call)
+
+        hass.services.async_register(
+            DOMAIN, SERVICE_SET_ZONES, set_zones, schema=SERVICE_SET_ZONES_SCHEMA
+        )
+
     return True
 
 
 # pw-beta
-async def _update_listener(hass: HomeAssistant, entry: ConfigEntry):  # pragma: no cover
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+def _has_counters(data: PlugwiseData) -> bool:
+    """Return True when a device reports cumulative energy counters."""
+    return any(
+        key in device.get("sensors", {})
+        for device in data.devices.values()
+        for key in (EL_CONSUMED_PEAK_CUMULATIVE, GAS_CONSUMED_CUMULATIVE)
+    )
+
+
+# pw-beta
+def _get_intervals(smile_type: str, entry: ConfigEntry) -> tuple[float, dt.timedelta]:
+    """Return the refresh cooldown and update interval set via the options."""
+    update_interval: dt.timedelta = DEFAULT_SCAN_INTERVAL[smile_type]
+    if custom_time := entry.options.get(CONF_SCAN_INTERVAL):
+        update_interval = dt.timedelta(seconds=int(custom_time))
+    LOGGER.debug("DUC update interval: %s", update_interval.seconds)
+
+    cooldown: float = entry.options.get(CONF_REFRESH_INTERVAL, DEFAULT_REFRESH_INTERVAL)
+    LOGGER.debug("DUC cooldown interval: %s", cooldown)
+
+    return cooldown, update_interval
+
+
+# pw-beta
+async def _update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Handle config entry updates.
+
+    Only a change in the connection data requires a reload, the options are
+    applied to the running coordinator (and by the climate platform).
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    if dict(entry.data) != entry_data[ENTRY_DATA]:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator: PlugwiseDataUpdateCoordinator = entry_data[COORDINATOR]
+    cooldown, update_interval = _get_intervals(coordinator.api.smile_type, entry)
+    coordinator.async_set_intervals(cooldown, update_interval)
+    coordinator.tiered = entry.options.get(CONF_POLLING_TIERS, False)
+
+    capacity = history_capacity(entry, update_interval)
+    for history in entry_data[HISTORY].values():
+        history.resize(capacity)
+
+
+# pw-beta
+@callback
+def _async_group_by_gateway(
+    hass: HomeAssistant, items: list[tuple[str, Any]], domain: str
+) -> tuple[dict[str, list[tuple[int, str, str, Any]]], list[dict[str, Any] | None]]:
+    """Group (entity_id, item) by the config entry of the Plugwise entity.
+
+    Return the batches holding (index, entity_id, unique_id, item) per
+    entry_id and the results in the order of the items: the failed result of
+    an entity not belonging to a Plugwise gateway, None for the others.
+    """
+    ent_reg = er.async_get(hass)
+    batches: dict[str, list[tuple[int, str, str, Any]]] = {}
+    results: list[dict[str, Any] | None] = [None] * len(items)
+    for index, (entity_id, item) in enumerate(items):
+        if (
+            not (registry_entry := ent_reg.async_get(entity_id))
+            or registry_entry.platform != DOMAIN
+            or registry_entry.domain != domain
+            or COORDINATOR
+            not in hass.data[DOMAIN].get(registry_entry.config_entry_id, {})
+        ):
+            results[index] = {
+                ATTR_ENTITY_ID: entity_id,
+                "success": False,
+                "error": f"Not a Plugwise {domain} entity",
+            }
+            continue
+
+        batches.setdefault(registry_entry.config_entry_id, []).append(
+            (index, entity_id, registry_entry.unique_id, item)
+        )
+
+    return batches, results
+
+
+# pw-beta
+async def _async_set_zones(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Send a batch of zone changes, per gateway with bounded concurrency.
+
+    Each gateway is refreshed once after all its zones are sent, the result
+    per zone is fired as an event.
+    """
+    start = monotonic()
+    batches, results = _async_group_by_gateway(
+        hass,
+        [(zone[ATTR_ENTITY_ID], zone) for zone in call.data[ATTR_ZONES]],
+        CLIMATE_DOMAIN,
+    )
+    for entry_id, zones in batches.items():
+        coordinator: PlugwiseDataUpdateCoordinator = hass.data[DOMAIN][entry_id][
+            COORDINATOR
+        ]
+        semaphore = asyncio.Semaphore(DEFAULT_COMMAND_CONCURRENCY)
+        done = await asyncio.gather(
+            *(
+                _async_set_zone(
+                    coordinator,
+                    semaphore,
+                    entity_id,
+                    unique_id.removesuffix("-climate"),
+                    zone,
+                )
+                for _, entity_id, unique_id, zone in zones
+            )
+        )
+        for (index, *_), result in zip(zones, done):
+            results[index] = result
+        await coordinator.async_request_refresh()
+
+    duration = round((monotonic() - start) * 1000, 1)
+    LOGGER.debug("Set %s zones in %s ms", len(results), duration)
+    hass.bus.async_fire(EVENT_SET_ZONES, {ATTR_ZONES: results, "duration_ms": duration})
+
+
+# pw-beta
+async def _async_set_switches(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Switch a batch of relays, pipelined per gateway.
+
+    Each gateway is refreshed once after all its commands are sent, the new
+    states confirm the result per switch, fired as an event.
+    """
+    start = monotonic()
+    state: str = call.data[ATTR_STATE]
+    batches, results = _async_group_by_gateway(
+        hass,
+        [(entity_id, None) for entity_id in call.data[ATTR_ENTITY_ID]],
+        SWITCH_DOMAIN,
+    )
+    for entry_id, switches in batches.items():
+        coordinator: PlugwiseDataUpdateCoordinator = hass.data[DOMAIN][entry_id][
+            COORDINATOR
+        ]
+        semaphore = asyncio.Semaphore(DEFAULT_COMMAND_CONCURRENCY)
+        targets = [
+            (index, entity_id, *unique_id.split("-", 1))
+            for index, entity_id, unique_id, _ in switches
+        ]
+        sent = await asyncio.gather(
+            *(
+                _async_set_switch(coordinator, semaphore, device_id, key, state)
+                for _, _, device_id, key in targets
+            )
+        )
+        commands_done = monotonic()
+
+        # One refresh to confirm the final states
+        await coordinator.async_refresh()
+        for (index, entity_id, device_id, key), error in zip(targets, sent):
+            if error is None:
+                device = coordinator.data.devices.get(device_id, {})
+                if device.get("switches", {}).get(key) != (state == STATE_ON):
+                    error = "State not confirmed by the gateway"
+            result: dict[str, Any] = {ATTR_ENTITY_ID: entity_id, "success": not error}
+            if error:
+                result["error"] = error
+            results[index] = result
+        LOGGER.debug(
+            "Switched %s relays of %s in %.1f ms, confirmed in %.1f ms",
+            len(targets),
+            coordinator.name,
+            (commands_done - start) * 1000,
+            (monotonic() - start) * 1000,
+        )
+
+    duration = round((monotonic() - start) * 1000, 1)
+    hass.bus.async_fire(
+        EVENT_SET_SWITCHES, {ATTR_SWITCHES: results, "duration_ms": duration}
+    )
+
+
+# pw-beta
+async def _async_set_switch(
+    coordinator: PlugwiseDataUpdateCoordinator,
+    semaphore: asyncio.Semaphore,
+    device_id: str,
+    key: str,
+    state: str,
+) -> str | None:
+    """Send the command of a single switch, return the error if any."""
+    async with semaphore:
+        if (device := coordinator.data.devices.get(device_id)) is None:
+            return "Unknown switch"
+        try:
+            await coordinator.api.set_switch_state(
+                device_id, device.get("members"), key, state
+            )
+        except PlugwiseException as err:
+            return str(err)
+    return None
+
+
+# pw-beta
+async def _async_set_zone(
+    coordinator: PlugwiseDataUpdateCoordinator,
+    semaphore: asyncio.Semaphore,
+    entity_id: str,
+    device_id: str,
+    zone: dict[str, Any],
+) -> dict[str, Any]:
+    """Send the changes of a single zone, return the result."""
+    async with semaphore:
+        try:
+            if (device := coordinator.data.devices.get(device_id)) is None:
+                raise HomeAssistantError("Unknown zone")
+            if (preset := zone.get(ATTR_PRESET_MODE)) is not None:
+                if preset not in (device.get("preset_modes") or []):
+                    raise HomeAssistantError(f"Unsupported preset_mode: {preset}")
+                await coordinator.api.set_preset(device["location"], preset)
+            if (temperature := zone.get(ATTR_TEMPERATURE)) is not None:
+                thermostat = device["thermostat"]
+                if not (
+                    thermostat.get("lower_bound", DEFAULT_MIN_TEMP)
+                    <= temperature
+                    <= thermostat.get("upper_bound", DEFAULT_MAX_TEMP)
+                ):
+                    raise HomeAssistantError(f"Invalid temperature: {temperature}")
+                await coordinator.api.set_temperature(
+                    device["location"], {"setpoint": temperature}
+                )
+        except (HomeAssistantError, PlugwiseException) as err:
+            return {ATTR_ENTITY_ID: entity_id, "success": False, "error": str(err)}
+
+    return {ATTR_ENTITY_ID: entity_id, "success": True}
+
+
+# pw-beta
+@callback
+def _async_fire_recent_history(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Fire an event holding the downsampled recent history of a sensor."""
+    entity_id: str = call.data[ATTR_ENTITY_ID]
+    if (
+        not (registry_entry := er.async_get(hass).async_get(entity_id))
+        or not (entry_data := hass.data[DOMAIN].get(registry_entry.config_entry_id))
+        or not (history := entry_data.get(HISTORY, {}).get(registry_entry.unique_id))
+    ):
+        raise HomeAssistantError(f"No Plugwise sensor history for {entity_id}")
+
+    config_entry = hass.config_entries.async_get_entry(registry_entry.config_entry_id)
+    minutes: int = call.data.get(
+        ATTR_MINUTES,
+        config_entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW),
+    )
+    end = time()
+    start = end - minutes * 60
+    hass.bus.async_fire(
+        EVENT_RECENT_HISTORY,
+        {
+            ATTR_ENTITY_ID: entity_id,
+            "start": start,
+            "end": end,
+            "samples": history.downsample(start, end, call.data[ATTR_BUCKETS]),
+        },
+    )
 
 
 async def async_unload_entry_gw(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(
-        entry, PLATFORMS_GATEWAY
+        entry, hass.data[DOMAIN][entry.entry_id][PLATFORMS]
     ):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id)[UNDO_UPDATE_LISTENER]()  # pw-beta
+        # pw-beta - the services of the gateways go with the last gateway
+        if not any(data[PW_TYPE] == GATEWAY for data in hass.data[DOMAIN].values()):
+            for service in (
+                SERVICE_GET_RECENT_HISTORY,
+                SERVICE_SET_SWITCHES,
+                SERVICE_SET_ZONES,
+            ):
+                hass.services.async_remove(DOMAIN, service)
     return unload_ok
 
 
+@callback
+def async_get_platforms(data: PlugwiseData) -> list[str]:
+    """Return the gateway platforms having candidate entities in the data."""
+    found: set[str] = set()
+    for device in data.devices.values():
+        if device.get("binary_sensors"):
+            found.add(Platform.BINARY_SENSOR)
+        if device.get("dev_class") in MASTER_THERMOSTATS:
+            found.add(Platform.CLIMATE)
+        if MAX_BOILER_TEMP in device or DHW_SETPOINT in device:
+            found.add(Platform.NUMBER)
+        if (
+            len(device.get(AVAILABLE_SCHEDULES, [])) > 1
+            or len(device.get(REGULATION_MODES, [])) > 1
+        ):
+            found.add(Platform.SELECT)
+        if device.get("sensors"):
+            found.add(Platform.SENSOR)
+        if device.get("switches"):
+            found.add(Platform.SWITCH)
+
+    return [platform for platform in PLATFORMS_GATEWAY if platform in found]
+
+
 @callback
 def async_migrate_entity_entry(entry: er.RegistryEntry) -> dict[str, Any] | None:
     """Migrate Plugwise entity entries.
@@ -0,0 +1,227 @@
+"""Health of the links in the Plugwise USB-stick network."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime, timedelta
+import sys
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+import homeassistant.util.dt as dt_util
+
+from plugwise.constants import UTF8_DECODE
+from plugwise.messages.responses import NodePingResponse, NodeResponse
+
+from .const import (
+    USB_NETWORK_DEGRADED_LINKS,
+    USB_NETWORK_PING_MEDIAN,
+    USB_NETWORK_PING_P95,
+    USB_NETWORK_RSSI_WORST,
+)
+
+MIN_SAMPLES = 5
+PUBLISH_INTERVAL = timedelta(minutes=1)
+WINDOW = 60  # pings per node, about one per update cycle
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Return the nearest-rank percentile of the values, at least one."""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+class LinkWindow:
+    """Ring-buffer holding the recent pings of one node.
+
+    The RSSI are stored as signed bytes, the roundtrips as unsigned shorts,
+    four bytes per ping.
+    """
+
+    __slots__ = ("_count", "_next", "_ping", "_rssi_in", "_rssi_out")
+
+    def __init__(self, size: int) -> None:
+        """Initialize the ring-buffer."""
+        self._rssi_in = array("b", bytes(size))
+        self._rssi_out = array("b", bytes(size))
+        self._ping = array("H", bytes(2 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of pings present."""
+        return self._count
+
+    @property
+    def memory_usage(self) -> int:
+        """Return the size of the buffers in bytes."""
+        return (
+            sys.getsizeof(self._rssi_in)
+            + sys.getsizeof(self._rssi_out)
+            + sys.getsizeof(self._ping)
+        )
+
+    def append(self, rssi_in: int, rssi_out: int, ping: int) -> None:
+        """Add a ping, overwriting the oldest one when full."""
+        self._rssi_in[self._next] = max(min(rssi_in, 127), -128)
+        self._rssi_out[self._next] = max(min(rssi_out, 127), -128)
+        self._ping[self._next] = max(min(ping, 0xFFFF), 0)
+        self._next = (self._next + 1) % len(self._ping)
+        if self._count < len(self._ping):
+            self._count += 1
+
+    @property
+    def rssi_in(self) -> Sequence[int]:
+        """Return the inbound RSSI present, in no particular order."""
+        return self._rssi_in[: self._count]
+
+    @property
+    def rssi_out(self) -> Sequence[int]:
+        """Return the outbound RSSI present, in no particular order."""
+        return self._rssi_out[: self._count]
+
+    @property
+    def ping(self) -> Sequence[int]:
+        """Return the roundtrips present, in no particular order."""
+        return self._ping[: self._count]
+
+
+class USBNetworkHealth:
+    """Keep the recent pings of every node, summarize the network.
+
+    The library pings the nodes every update cycle. The RSSI in both
+    directions and the roundtrip of the last pings are kept per node. A
+    link is degraded when the worst tenth of its RSSI is below the RSSI
+    limit or the slowest twentieth of its roundtrips above the roundtrip
+    limit. Once a minute the summary of the network is computed and passed
+    to the listeners (the aggregate sensors), in place of a state per ping
+    and node.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        nodes: Mapping[str, Any],
+        degraded_rssi: int,
+        degraded_ping: int,
+    ) -> None:
+        """Initialize the health."""
+        self._hass = hass
+        self._nodes = nodes
+        self._degraded_rssi = degraded_rssi
+        self._degraded_ping = degraded_ping
+        self._windows: dict[str, LinkWindow] = {}
+        self._last_seen: dict[str, datetime] = {}
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub: CALLBACK_TYPE | None = None
+        self.summary: dict[str, Any] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Start summarizing."""
+        self._unsub = async_track_time_interval(
+            self._hass, self._async_publish, PUBLISH_INTERVAL
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop summarizing."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Call back on every summary, return the function to stop."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Stop calling back."""
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def message_received(self, message: NodeResponse) -> None:
+        """Pass the pings, called by the stick threads."""
+        if isinstance(message, NodePingResponse):
+            self._hass.loop.call_soon_threadsafe(
+                self._async_add_ping,
+                message.mac.decode(UTF8_DECODE),
+                message.rssi_in.value,
+                message.rssi_out.value,
+                message.ping_ms.value,
+            )
+
+    @callback
+    def _async_add_ping(self, mac: str, rssi_in: int, rssi_out: int, ping: int) -> None:
+        """Add a ping to the window of the node."""
+        if (window := self._windows.get(mac)) is None:
+            window = self._windows[mac] = LinkWindow(WINDOW)
+        window.append(rssi_in, rssi_out, ping)
+        self._last_seen[mac] = dt_util.utcnow()
+
+    def link(self, mac: str) -> dict[str, Any]:
+        """Return the percentiles of the link of a node."""
+        if (window := self._windows.get(mac)) is None:
+            return {"samples": 0, "degraded": None}
+        rssi_in = percentile(window.rssi_in, 10)
+        rssi_out = percentile(window.rssi_out, 10)
+        ping = percentile(window.ping, 95)
+        degraded = None
+        if len(window) >= MIN_SAMPLES:
+            degraded = (
+                min(rssi_in, rssi_out) < self._degraded_rssi
+                or ping > self._degraded_ping
+            )
+        return {
+            "samples": len(window),
+            "rssi_in_p10": rssi_in,
+            "rssi_in_p50": percentile(window.rssi_in, 50),
+            "rssi_out_p10": rssi_out,
+            "rssi_out_p50": percentile(window.rssi_out, 50),
+            "ping_p50": percentile(window.ping, 50),
+            "ping_p95": ping,
+            "degraded": degraded,
+        }
+
+    @callback
+    def _async_publish(self, _: datetime | None = None) -> None:
+        """Summarize the network, pass it to the listeners."""
+        links = [self.link(mac) for mac in self._windows]
+        pings = [ping for window in self._windows.values() for ping in window.ping]
+        self.summary = {
+            USB_NETWORK_DEGRADED_LINKS: sum(1 for link in links if link["degraded"]),
+            USB_NETWORK_RSSI_WORST: min(
+                (min(link["rssi_in_p10"], link["rssi_out_p10"]) for link in links),
+                default=None,
+            ),
+            USB_NETWORK_PING_MEDIAN: percentile(pings, 50) if pings else None,
+            USB_NETWORK_PING_P95: percentile(pings, 95) if pings else None,
+        }
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the topology and the links, for the diagnostics."""
+        nodes: dict[str, Any] = {}
+        for mac, node in list(self._nodes.items()):
+            link = self.link(mac)
+            if node is not None:
+                link["model"] = node.hardware_model
+                link["available"] = node.available
+            link["last_seen"] = self._last_seen.get(mac)
+            nodes[mac] = link
+        return {
+            "summary": self.summary,
+            "links": {
+                "degraded": sum(1 for link in nodes.values() if link["degraded"]),
+                "good": sum(1 for link in nodes.values() if link["degraded"] is False),
+                "unknown": sum(
+                    1 for link in nodes.values() if link["degraded"] is None
+                ),
+            },
+            "bytes": sum(window.memory_usage for window in self._windows.values()),
+            "nodes": nodes,
+        }
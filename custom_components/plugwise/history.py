@@ -0,0 +1,115 @@
+"""In-memory recent history of the Plugwise gateway sensors."""
+from __future__ import annotations
+
+from array import array
+from datetime import timedelta
+from math import ceil
+import sys
+
+from homeassistant.config_entries import ConfigEntry
+
+from .const import CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW
+
+
+def history_capacity(entry: ConfigEntry, update_interval: timedelta) -> int:
+    """Return the number of samples needed to cover the history window."""
+    window: int = entry.options.get(CONF_HISTORY_WINDOW, DEFAULT_HISTORY_WINDOW)
+    return ceil(window * 60 / update_interval.total_seconds()) + 1
+
+
+class SensorHistory:
+    """Fixed-size ring-buffer holding the recent samples of one sensor.
+
+    Timestamps and values are stored in two preallocated arrays of doubles,
+    the memory used per sensor does not grow once created.
+    """
+
+    __slots__ = ("_count", "_next", "_times", "_values")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the ring-buffer."""
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """Allocate empty buffers of the capacity."""
+        capacity = max(capacity, 1)
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples present."""
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples."""
+        return len(self._values)
+
+    @property
+    def memory_usage(self) -> int:
+        """Return the size of the buffers in bytes."""
+        return sys.getsizeof(self._times) + sys.getsizeof(self._values)
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def resize(self, capacity: int) -> None:
+        """Change the capacity, keeping the most recent samples."""
+        if max(capacity, 1) == self.capacity:
+            return
+        samples = self.samples()
+        self._allocate(capacity)
+        for timestamp, value in samples[-self.capacity :]:
+            self.append(timestamp, value)
+
+    def samples(self, since: float | None = None) -> list[tuple[float, float]]:
+        """Return the samples not older than since, oldest first."""
+        size = len(self._values)
+        result: list[tuple[float, float]] = []
+        # Walk back from the newest sample, stop at the first one too old
+        for offset in range(1, self._count + 1):
+            index = (self._next - offset) % size
+            if since is not None and self._times[index] < since:
+                break
+            result.append((self._times[index], self._values[index]))
+        result.reverse()
+        return result
+
+    def downsample(
+        self, since: float, until: float, buckets: int
+    ) -> list[dict[str, float]]:
+        """Return the min, mean and max per bucket between since and until.
+
+        Empty buckets are left out.
+        """
+        buckets = max(buckets, 1)
+        width = (until - since) / buckets or 1.0
+        totals: dict[int, list[float]] = {}
+        for timestamp, value in self.samples(since):
+            if timestamp > until:
+                break
+            bucket = min(int((timestamp - since) / width), buckets - 1)
+            if (total := totals.get(bucket)) is None:
+                totals[bucket] = [value, value, value, 1]
+                continue
+            total[0] = min(total[0], value)
+            total[1] += value
+            total[2] = max(total[2], value)
+            total[3] += 1
+
+        return [
+            {
+                "start": since + bucket * width,
+                "min": low,
+                "mean": round(total / count, 3),
+                "max": high,
+            }
+            for bucket, (low, total, high, count) in sorted(totals.items())
+        ]
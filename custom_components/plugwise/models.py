@@ -33,6 +33,7 @@ from .const import (
     BATTERY,
     COMPRESSOR_STATE,
     CURRENT_TEMP,
+    DEFAULT_HEARTBEAT,
     DHW_COMF_MODE,
     DHW_STATE,
     EL_CONSUMED,
@@ -59,10 +60,16 @@ from .const import (
     INTENDED_BOILER_TEMP,
     LOCK,
     MOD_LEVEL,
+    NET_COVERAGE_RATIO,
     NET_EL_CUMULATIVE,
+    NET_EL_OFF_PEAK_TODAY,
+    NET_EL_PEAK_TODAY,
     NET_EL_POINT,
+    NET_EL_THIS_HOUR,
+    NET_EL_TODAY,
     OUTDOOR_AIR_TEMP,
     OUTDOOR_TEMP,
+    POINT_DEADBAND,
     PW_NOTIFICATION,
     RELAY,
     RETURN_TEMP,
@@ -75,10 +82,16 @@ from .const import (
     TEMP_DIFF,
     UNIT_LUMEN,
     USB_MOTION_ID,
+    USB_NETWORK_DEGRADED_LINKS,
+    USB_NETWORK_PING_MEDIAN,
+    USB_NETWORK_PING_P95,
+    USB_NETWORK_RSSI_WORST,
     USB_RELAY_ID,
     VALVE_POS,
     WATER_PRESSURE,
     WATER_TEMP,
+    ZONE_LOWEST_BATTERY,
+    ZONE_VALVE_POS,
 )
 
 
@@ -103,6 +116,13 @@ class PlugwiseSensorEntityDescription(
     should_poll: bool = False
     state_class: str | None = SensorStateClass.MEASUREMENT
     state_request_method: str | None = None
+    # pw-beta - only publish changes larger than the absolute deadband and/or
+    # the relative deadband (%), at most once per min_publish_interval and
+    # at least once per heartbeat (seconds)
+    deadband: float | None = None
+    deadband_relative: float | None = None
+    min_publish_interval: float | None = None
+    heartbeat: float = DEFAULT_HEARTBEAT
 
 
 @dataclass
@@ -278,6 +298,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Consumed Off Peak Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=EL_CONSUMED_PEAK_CUMULATIVE,
@@ -301,6 +322,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Consumed Peak Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=EL_CONSUMED_POINT,
@@ -308,6 +330,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Consumed Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=EL_PRODUCED,
@@ -348,6 +371,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Produced Off Peak Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=EL_PRODUCED_PEAK_CUMULATIVE,
@@ -371,6 +395,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Produced Peak Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=EL_PRODUCED_POINT,
@@ -378,6 +403,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Electricity Produced Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=GAS_CONSUMED_CUMULATIVE,
@@ -439,6 +465,7 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
         name="Net Electricity Point",
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=POWER_WATT,
+        deadband=POINT_DEADBAND,
     ),
     PlugwiseSensorEntityDescription(
         key=OUTDOOR_TEMP,
@@ -525,6 +552,105 @@ PW_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
     ),
 )
 
+# pw-beta - derived by the integration from the P1 cumulative counters
+P1_ENERGY_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
+    PlugwiseSensorEntityDescription(
+        key=NET_EL_TODAY,
+        plugwise_api=SMILE,
+        name="Net Electricity Today",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=NET_EL_THIS_HOUR,
+        plugwise_api=SMILE,
+        name="Net Electricity This Hour",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=NET_EL_PEAK_TODAY,
+        plugwise_api=SMILE,
+        name="Net Electricity Peak Today",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+        entity_registry_enabled_default=False,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=NET_EL_OFF_PEAK_TODAY,
+        plugwise_api=SMILE,
+        name="Net Electricity Off Peak Today",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL,
+        native_unit_of_measurement=ENERGY_KILO_WATT_HOUR,
+        entity_registry_enabled_default=False,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=NET_COVERAGE_RATIO,
+        plugwise_api=SMILE,
+        name="Net Coverage Ratio Today",
+        icon="mdi:solar-power",
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+)
+
+# pw-beta - aggregated by the integration over the devices of a zone
+ZONE_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
+    PlugwiseSensorEntityDescription(
+        key=ZONE_VALVE_POS,
+        plugwise_api=SMILE,
+        name="Zone Valve Position",
+        icon="mdi:valve",
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=ZONE_LOWEST_BATTERY,
+        plugwise_api=SMILE,
+        name="Zone Lowest Battery",
+        device_class=SensorDeviceClass.BATTERY,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+)
+
+# pw-beta - aggregated by the integration over the links of a USB network
+USB_NETWORK_SENSOR_TYPES: tuple[PlugwiseSensorEntityDescription, ...] = (
+    PlugwiseSensorEntityDescription(
+        key=USB_NETWORK_DEGRADED_LINKS,
+        plugwise_api=STICK,
+        name="Network degraded links",
+        icon="mdi:lan-disconnect",
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=USB_NETWORK_RSSI_WORST,
+        plugwise_api=STICK,
+        name="Network worst RSSI",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=USB_NETWORK_PING_MEDIAN,
+        plugwise_api=STICK,
+        name="Network ping roundtrip median",
+        icon="mdi:speedometer",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=TIME_MILLISECONDS,
+    ),
+    PlugwiseSensorEntityDescription(
+        key=USB_NETWORK_PING_P95,
+        plugwise_api=STICK,
+        name="Network ping roundtrip 95th percentile",
+        icon="mdi:speedometer",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=TIME_MILLISECONDS,
+    ),
+)
+
 PW_SWITCH_TYPES: tuple[PlugwiseSwitchEntityDescription, ...] = (
     PlugwiseSwitchEntityDescription(
         key=USB_RELAY_ID,
@@ -0,0 +1,64 @@
+"""Persistent cache of the nodes of a Plugwise USB-stick network."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN, USB_NODE_CACHE_STORAGE_VERSION
+
+SAVE_DELAY = 30
+
+
+class USBNodeCache:
+    """Remember the model, firmware and features of the nodes, per MAC.
+
+    These hardly ever change. At a restart the entities and devices are
+    created from the cache at once, the nodes are verified by the network
+    scan running in the background.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store = Store(
+            hass, USB_NODE_CACHE_STORAGE_VERSION, f"{DOMAIN}.usb_nodes.{entry_id}"
+        )
+        self._nodes: dict[str, dict[str, Any]] = {}
+
+    @property
+    def nodes(self) -> dict[str, dict[str, Any]]:
+        """Return the cached nodes."""
+        return self._nodes
+
+    async def async_load(self) -> None:
+        """Restore the nodes stored before the restart."""
+        if stored := await self._store.async_load():
+            self._nodes = stored["nodes"]
+
+    async def async_save(self) -> None:
+        """Store the nodes now, i.e. at unload."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_update(self, node: Any) -> None:
+        """Store the facts of a node answering."""
+        self._nodes[node.mac] = {
+            "model": node.hardware_model,
+            "firmware": f"{node.firmware_version}",
+            "features": list(node.features),
+            "last_seen": dt_util.utcnow().isoformat(),
+        }
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove(self, mac: str) -> None:
+        """Forget a node removed from the network."""
+        if self._nodes.pop(mac, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the nodes to store."""
+        return {"nodes": self._nodes}
@@ -15,7 +15,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import COORDINATOR, DOMAIN, LOGGER
+from .const import COORDINATOR, DHW_SETPOINT, DOMAIN, LOGGER, MAX_BOILER_TEMP
 from .coordinator import PlugwiseDataUpdateCoordinator
 from .entity import PlugwiseEntity
 
@@ -27,7 +27,7 @@ class PlugwiseNumberEntityDescription(NumberEntityDescription):
 
 NUMBER_TYPES = (
     PlugwiseNumberEntityDescription(
-        key="maximum_boiler_temperature",
+        key=MAX_BOILER_TEMP,
         device_class=NumberDeviceClass.TEMPERATURE,
         name="Maximum boiler temperature setpoint",
         entity_category=EntityCategory.CONFIG,
@@ -35,7 +35,7 @@ NUMBER_TYPES = (
         native_unit_of_measurement=TEMP_CELSIUS,
     ),
     PlugwiseNumberEntityDescription(
-        key="domestic_hot_water_setpoint",
+        key=DHW_SETPOINT,
         device_class=NumberDeviceClass.TEMPERATURE,
         name="Domestic hot water setpoint",
         entity_category=EntityCategory.CONFIG,
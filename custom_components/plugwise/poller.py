@@ -0,0 +1,202 @@
+"""Poll the power of the Plugwise USB nodes adaptively."""
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+# Weight of a new sample in the moving mean and variance of a node
+ALPHA = 0.3
+TICK = timedelta(seconds=1)
+
+
+@dataclass
+class _NodeLoad:
+    """The moving load of a node and its poll schedule."""
+
+    mac: str
+    request: Callable[[], None]
+    mean: float | None = None
+    variance: float = 0.0
+    interval: float = 0.0
+    next_poll: float = 0.0
+    polls: int = 0
+
+
+class USBPowerPoller:
+    """Poll the power of every Circle at an interval following its load.
+
+    The polls are shared out over the nodes within a budget of polls per
+    second for the whole network. Every node gets at least one poll per
+    max interval, the rest of the budget goes to the nodes in proportion
+    to the standard deviation of their recent power, at most one poll per
+    min interval. A flat node is polled seldom, a node feeding a varying
+    load often. A token bucket keeps the polls sent within the budget.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        nodes: Mapping[str, Any],
+        budget: float,
+        min_interval: float,
+        max_interval: float,
+    ) -> None:
+        """Initialize the poller."""
+        self._hass = hass
+        self._nodes = nodes
+        self._budget = budget
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._loads: dict[str, _NodeLoad] = {}
+        self._tokens = budget
+        self._last_tick = time.monotonic()
+        self._reshare = False
+        self._unsub: CALLBACK_TYPE | None = None
+        self.polls = 0
+        self.deferred = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start polling."""
+        self._unsub = async_track_time_interval(self._hass, self._async_tick, TICK)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop polling."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_tick(self, _: datetime | None = None) -> None:
+        """Poll the nodes due, as far as the budget allows."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._budget, self._tokens + (now - self._last_tick) * self._budget
+        )
+        self._last_tick = now
+
+        for mac, node in list(self._nodes.items()):
+            # Unsupported nodes and SEDs
+            if node is None or not node.measures_power:
+                continue
+            if mac not in self._loads:
+                self._loads[mac] = _NodeLoad(mac, self._response_callback(mac))
+                self._reshare = True
+        if self._reshare:
+            self._share_budget()
+
+        for load in sorted(self._loads.values(), key=lambda load: load.next_poll):
+            if load.next_poll > now:
+                break
+            if self._tokens < 1:
+                self.deferred += 1
+                continue
+            load.next_poll = now + load.interval
+            # The pings of the library tell when a node is back
+            if (node := self._nodes.get(load.mac)) is None or not node.available:
+                continue
+            self._tokens -= 1
+            load.polls += 1
+            self.polls += 1
+            node.request_power_update(load.request)
+
+    def _response_callback(self, mac: str) -> Callable[[], None]:
+        """Return the callback of the power responses of a node."""
+
+        def power_received() -> None:
+            """Hand the power of the node to the event loop."""
+            if (node := self._nodes.get(mac)) is not None:
+                self._hass.loop.call_soon_threadsafe(
+                    self._async_add_sample, mac, node.current_power_usage
+                )
+
+        return power_received
+
+    @callback
+    def _async_add_sample(self, mac: str, power: float | None) -> None:
+        """Update the moving mean and variance of the power of a node."""
+        if power is None or (load := self._loads.get(mac)) is None:
+            return
+        if load.mean is None:
+            load.mean = power
+            return
+        delta = power - load.mean
+        load.mean += ALPHA * delta
+        load.variance = (1 - ALPHA) * (load.variance + ALPHA * delta * delta)
+        self._reshare = True
+
+    def _share_budget(self) -> None:
+        """Set the poll interval of every node from its share of the budget."""
+        self._reshare = False
+        if not self._loads:
+            return
+        floor = 1 / self._max_interval
+        ceiling = 1 / self._min_interval
+        # All nodes at their slowest already exceed the budget
+        if (spare := self._budget - floor * len(self._loads)) <= 0:
+            for load in self._loads.values():
+                load.interval = len(self._loads) / self._budget
+            return
+
+        rates = dict.fromkeys(self._loads, floor)
+        deviations = {
+            mac: math.sqrt(load.variance)
+            for mac, load in self._loads.items()
+            if load.variance > 0
+        }
+        # Share the spare rate by deviation, the share of the nodes reaching
+        # the ceiling goes to the others
+        while spare > 0 and deviations:
+            total = sum(deviations.values())
+            capped = {
+                mac
+                for mac, deviation in deviations.items()
+                if rates[mac] + spare * deviation / total >= ceiling
+            }
+            if not capped:
+                for mac, deviation in deviations.items():
+                    rates[mac] += spare * deviation / total
+                break
+            for mac in capped:
+                spare -= ceiling - rates[mac]
+                rates[mac] = ceiling
+                del deviations[mac]
+
+        for mac, load in self._loads.items():
+            interval = 1 / rates[mac]
+            if load.interval and interval < load.interval:
+                # Poll a node turning busy sooner
+                load.next_poll = min(
+                    load.next_poll, load.next_poll - load.interval + interval
+                )
+            load.interval = interval
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the polling, for the diagnostics."""
+        return {
+            "budget": self._budget,
+            "polls": self.polls,
+            "deferred": self.deferred,
+            "rate": round(
+                sum(
+                    1 / load.interval for load in self._loads.values() if load.interval
+                ),
+                3,
+            ),
+            "nodes": {
+                mac: {
+                    "interval": round(load.interval, 1),
+                    "deviation": round(math.sqrt(load.variance), 1),
+                    "polls": load.polls,
+                }
+                for mac, load in self._loads.items()
+            },
+        }
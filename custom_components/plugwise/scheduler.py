@@ -0,0 +1,172 @@
+"""Prioritize the commands sent into the Plugwise USB-stick network."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from threading import Lock
+import time
+from typing import Any
+
+from plugwise.constants import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_MEDIUM
+from plugwise.messages.requests import (
+    CircleClockGetRequest,
+    CircleClockSetRequest,
+    CircleEnergyCountersRequest,
+    CirclePlusRealTimeClockSetRequest,
+    CirclePowerUsageRequest,
+    CircleSwitchRelayRequest,
+    NodeAddRequest,
+    NodeAllowJoiningRequest,
+    NodePingRequest,
+    NodeRemoveRequest,
+    NodeRequest,
+    NodeSleepConfigRequest,
+    ScanConfigureRequest,
+    ScanLightCalibrateRequest,
+    SenseReportIntervalRequest,
+)
+
+COMMAND = "command"
+TELEMETRY = "telemetry"
+OTHER = "other"
+
+COMMANDS = (
+    CircleClockSetRequest,
+    CirclePlusRealTimeClockSetRequest,
+    CircleSwitchRelayRequest,
+    NodeAddRequest,
+    NodeAllowJoiningRequest,
+    NodeRemoveRequest,
+    NodeSleepConfigRequest,
+    ScanConfigureRequest,
+    ScanLightCalibrateRequest,
+    SenseReportIntervalRequest,
+)
+TELEMETRIES = (
+    CircleClockGetRequest,
+    CircleEnergyCountersRequest,
+    CirclePowerUsageRequest,
+    NodePingRequest,
+)
+LATENCY_SAMPLES = 100
+MAX_RATE_LIMITED = 1000
+
+
+class USBCommandScheduler:
+    """Send the commands ahead of the telemetry, rate limit the telemetry.
+
+    Replaces the send method of the message controller of the stick. The
+    controller sends one request at a time from a priority queue; the
+    relay and configuration commands are queued with the high priority,
+    also when resent, the telemetry with the low priority. A telemetry
+    request without callback is dropped when the same request was queued
+    for the node within the interval. The time each request waited in the
+    queue is measured when the controller writes it to the port.
+
+    With skip_library_polls set the power polls of the update loop of the
+    library are dropped, the adaptive poller sends them instead.
+    """
+
+    def __init__(
+        self,
+        send: Callable[..., None],
+        write: Callable[..., Any],
+        interval: float,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._send = send
+        self._write = write
+        self._interval = interval
+        self._lock = Lock()
+        self._last_queued: dict[bytes, float] = {}
+        self._queued: dict[int, tuple[str, float]] = {}
+        self._latency: dict[str, deque[float]] = {
+            kind: deque(maxlen=LATENCY_SAMPLES) for kind in (COMMAND, TELEMETRY, OTHER)
+        }
+        self.sent: dict[str, int] = dict.fromkeys(self._latency, 0)
+        self.rate_limited = 0
+        self.skip_library_polls = False
+        self.skipped = 0
+
+    def send(
+        self,
+        request: NodeRequest,
+        callback: Callable[[], None] | None = None,
+        retry_counter: int = 0,
+        priority: int = PRIORITY_MEDIUM,
+    ) -> None:
+        """Queue a request at the priority of its class."""
+        # The library sends the requests it held for an awake SED as
+        # (message id, (request, callback)), restore the request
+        if isinstance(callback, tuple):
+            request, callback = callback
+        if isinstance(request, COMMANDS):
+            kind, priority = COMMAND, PRIORITY_HIGH
+        elif isinstance(request, TELEMETRIES):
+            kind, priority = TELEMETRY, PRIORITY_LOW
+        else:
+            kind = OTHER
+
+        now = time.monotonic()
+        with self._lock:
+            if kind == TELEMETRY and callback is None and retry_counter == 0:
+                if self.skip_library_polls and isinstance(
+                    request, CirclePowerUsageRequest
+                ):
+                    self.skipped += 1
+                    return
+                key = request.serialize()
+                if now - self._last_queued.get(key, -self._interval) < self._interval:
+                    self.rate_limited += 1
+                    return
+                self._last_queued[key] = now
+                # The energy log addresses requested move on every hour
+                if len(self._last_queued) > MAX_RATE_LIMITED:
+                    self._last_queued = {
+                        queued_key: queued
+                        for queued_key, queued in self._last_queued.items()
+                        if now - queued < self._interval
+                    }
+            self._queued[id(request)] = (kind, now)
+        self._send(request, callback, retry_counter, priority)
+
+    def write(self, request: NodeRequest, *args: Any) -> Any:
+        """Write a request to the port, measuring its time in the queue."""
+        with self._lock:
+            if (queued := self._queued.pop(id(request), None)) is not None:
+                kind, since = queued
+                self._latency[kind].append(time.monotonic() - since)
+                self.sent[kind] += 1
+        return self._write(request, *args)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue latency per class, for the diagnostics."""
+        with self._lock:
+            latencies = {
+                kind: sorted(samples) for kind, samples in self._latency.items()
+            }
+        return {
+            "telemetry_interval": self._interval,
+            "rate_limited": self.rate_limited,
+            "skipped": self.skipped,
+            "queued": len(self._queued),
+            "classes": {
+                kind: {
+                    "sent": self.sent[kind],
+                    "latency_mean_ms": (
+                        round(sum(samples) / len(samples) * 1000, 1)
+                        if samples
+                        else None
+                    ),
+                    "latency_p95_ms": (
+                        round(samples[int(len(samples) * 0.95)] * 1000, 1)
+                        if samples
+                        else None
+                    ),
+                    "latency_max_ms": (
+                        round(samples[-1] * 1000, 1) if samples else None
+                    ),
+                }
+                for kind, samples in latencies.items()
+            },
+        }
@@ -0,0 +1,220 @@
+"""Hold the configuration of the battery powered USB nodes until awake."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from plugwise.constants import PRIORITY_HIGH, UTF8_DECODE
+from plugwise.messages.requests import (
+    NodeRequest,
+    NodeSleepConfigRequest,
+    ScanConfigureRequest,
+)
+from plugwise.messages.responses import NodeAwakeResponse, NodeResponse
+
+from .const import (
+    ATTR_SCAN_DAYLIGHT_MODE,
+    ATTR_SCAN_RESET_TIMER,
+    ATTR_SCAN_SENSITIVITY_MODE,
+    ATTR_SED_CLOCK_INTERVAL,
+    ATTR_SED_CLOCK_SYNC,
+    ATTR_SED_MAINTENANCE_INTERVAL,
+    ATTR_SED_SLEEP_FOR,
+    ATTR_SED_STAY_ACTIVE,
+    DOMAIN,
+    LOGGER,
+    SCAN_SENSITIVITY_HIGH,
+    SCAN_SENSITIVITY_OFF,
+    SED_SCAN_CONFIG,
+    SED_SLEEP_CONFIG,
+    USB_SED_QUEUE_STORAGE_VERSION,
+)
+
+# The sensitivity sent to a Scan, medium for any other mode
+SCAN_SENSITIVITY_VALUES = {SCAN_SENSITIVITY_HIGH: 20, SCAN_SENSITIVITY_OFF: 255}
+SCAN_SENSITIVITY_MEDIUM_VALUE = 30
+APPLY_SAMPLES = 100
+SAVE_DELAY = 5
+# Send once per awake, a SED is asleep again before a retry
+SINGLE_ATTEMPT = -1
+
+
+def _request(mac: str, kind: str, params: Mapping[str, Any]) -> NodeRequest:
+    """Return the request applying a configuration."""
+    mac_bytes = bytes(mac, UTF8_DECODE)
+    if kind == SED_SCAN_CONFIG:
+        return ScanConfigureRequest(
+            mac_bytes,
+            params[ATTR_SCAN_RESET_TIMER],
+            SCAN_SENSITIVITY_VALUES.get(
+                params[ATTR_SCAN_SENSITIVITY_MODE], SCAN_SENSITIVITY_MEDIUM_VALUE
+            ),
+            params[ATTR_SCAN_DAYLIGHT_MODE],
+        )
+    return NodeSleepConfigRequest(
+        mac_bytes,
+        params[ATTR_SED_STAY_ACTIVE],
+        params[ATTR_SED_MAINTENANCE_INTERVAL],
+        params[ATTR_SED_SLEEP_FOR],
+        params[ATTR_SED_CLOCK_SYNC],
+        params[ATTR_SED_CLOCK_INTERVAL],
+    )
+
+
+class USBSEDCommandQueue:
+    """Send the configuration of a SED when it announces it is awake.
+
+    The Scans and Senses only listen shortly after an awake message, for
+    maintenance every few minutes up to a day, or on motion or a button.
+    A configuration is held per node and kind until the node is awake and
+    has accepted it, also over restarts. A newer configuration of the same
+    kind replaces the pending one. A configuration not accepted is sent
+    again at the next awake.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        nodes: Mapping[str, Any],
+        send: Callable[..., None],
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._nodes = nodes
+        self._send = send
+        self._store: Store = Store(
+            hass, USB_SED_QUEUE_STORAGE_VERSION, f"{DOMAIN}.usb_sed_queue.{entry_id}"
+        )
+        # mac -> kind -> {"params", "queued", "attempts"}
+        self._pending: dict[str, dict[str, dict[str, Any]]] = {}
+        self._time_to_apply: deque[float] = deque(maxlen=APPLY_SAMPLES)
+        self.queued = 0
+        self.collapsed = 0
+        self.applied = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of configurations pending."""
+        return sum(len(commands) for commands in self._pending.values())
+
+    async def async_load(self) -> None:
+        """Restore the configurations pending before the restart."""
+        if stored := await self._store.async_load():
+            self._pending = stored["pending"]
+
+    async def async_save(self) -> None:
+        """Store the pending configurations now, i.e. at unload."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_queue(self, mac: str, kind: str, params: Mapping[str, Any]) -> None:
+        """Hold a configuration of a node until it is awake."""
+        commands = self._pending.setdefault(mac, {})
+        if (pending := commands.get(kind)) is not None:
+            # The wait counts from the configuration first asked for
+            self.collapsed += 1
+            queued = pending["queued"]
+        else:
+            self.queued += 1
+            queued = dt_util.utcnow().isoformat()
+        commands[kind] = {"params": dict(params), "queued": queued, "attempts": 0}
+        LOGGER.debug("Hold %s of %s until the node is awake", kind, mac)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def message_received(self, message: NodeResponse) -> None:
+        """Send the configurations of an awake node, called by the stick threads."""
+        if isinstance(message, NodeAwakeResponse):
+            mac = message.mac.decode(UTF8_DECODE)
+            if mac in self._pending:
+                self._hass.loop.call_soon_threadsafe(self._async_awake, mac)
+
+    @callback
+    def _async_awake(self, mac: str) -> None:
+        """Send the configurations pending for a node."""
+        for kind, command in self._pending.get(mac, {}).items():
+            command["attempts"] += 1
+            LOGGER.debug("Send %s to %s, attempt %s", kind, mac, command["attempts"])
+            self._send(
+                _request(mac, kind, command["params"]),
+                self._accepted_callback(mac, kind, command),
+                SINGLE_ATTEMPT,
+                PRIORITY_HIGH,
+            )
+
+    def _accepted_callback(
+        self, mac: str, kind: str, command: dict[str, Any]
+    ) -> Callable[[], None]:
+        """Return the callback of a configuration accepted by the node."""
+
+        def configuration_accepted() -> None:
+            """Hand the accepted configuration to the event loop."""
+            if kind == SED_SLEEP_CONFIG and (node := self._nodes.get(mac)) is not None:
+                # The library only knows the intervals configured through it,
+                # it watches the awake messages of the node by this one
+                node.maintenance_interval = command["params"][
+                    ATTR_SED_MAINTENANCE_INTERVAL
+                ]
+            self._hass.loop.call_soon_threadsafe(
+                self._async_accepted, mac, kind, command
+            )
+
+        return configuration_accepted
+
+    @callback
+    def _async_accepted(self, mac: str, kind: str, command: dict[str, Any]) -> None:
+        """Forget a configuration accepted, unless replaced meanwhile."""
+        if (commands := self._pending.get(mac)) is None or commands.get(
+            kind
+        ) is not command:
+            return
+        del commands[kind]
+        if not commands:
+            del self._pending[mac]
+        self.applied += 1
+        self._time_to_apply.append(_waiting(dt_util.utcnow(), command["queued"]))
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the pending configurations to store."""
+        return {"pending": self._pending}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue depth and time to apply, for the diagnostics."""
+        samples = sorted(self._time_to_apply)
+        now = dt_util.utcnow()
+        return {
+            "depth": self.depth,
+            "queued": self.queued,
+            "collapsed": self.collapsed,
+            "applied": self.applied,
+            "time_to_apply_mean_s": (
+                round(sum(samples) / len(samples), 1) if samples else None
+            ),
+            "time_to_apply_max_s": round(samples[-1], 1) if samples else None,
+            "pending": {
+                mac: {
+                    kind: {
+                        "params": command["params"],
+                        "waiting_s": round(_waiting(now, command["queued"]), 1),
+                        "attempts": command["attempts"],
+                    }
+                    for kind, command in commands.items()
+                }
+                for mac, commands in self._pending.items()
+            },
+        }
+
+
+def _waiting(now: datetime, queued: str) -> float:
+    """Return the seconds since a configuration was queued."""
+    if (since := dt_util.parse_datetime(queued)) is None:
+        return 0.0
+    return (now - since).total_seconds()
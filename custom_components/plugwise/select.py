@@ -15,9 +15,11 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
+    AVAILABLE_SCHEDULES,
     COORDINATOR,
     DOMAIN,
     LOGGER,
+    REGULATION_MODES,
 )
 from .coordinator import PlugwiseDataUpdateCoordinator
 from .entity import PlugwiseEntity
@@ -48,7 +50,7 @@ SELECT_TYPES = (
         icon="mdi:calendar-clock",
         command=lambda api, loc, opt: api.set_schedule_state(loc, opt, STATE_ON),
         current_option="selected_schedule",
-        options="available_schedules",
+        options=AVAILABLE_SCHEDULES,
     ),
     PlugwiseSelectEntityDescription(
         key="select_regulation_mode",
@@ -57,7 +59,7 @@ SELECT_TYPES = (
         entity_category=EntityCategory.CONFIG,
         command=lambda api, loc, opt: api.set_regulation_mode(opt),
         current_option="regulation_mode",
-        options="regulation_modes",
+        options=REGULATION_MODES,
         entity_registry_enabled_default=False,
     ),
 )
@@ -1,27 +1,64 @@
 """Plugwise Sensor component for Home Assistant."""
 from __future__ import annotations
 
+from datetime import datetime
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any
+
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from plugwise.nodes import PlugwiseNode
-
+from .bridge import USBNodeBatch
 from .const import (
+    BRIDGE,
     CB_NEW_NODE,
+    CONF_DEADBAND,
+    CONF_DEADBAND_RELATIVE,
+    CONF_HEARTBEAT,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_SENSOR_FILTERS,
+    CONF_USB_LINK_SENSORS,
     COORDINATOR,
+    DEFAULT_USB_LINK_SENSORS,
     DOMAIN,
+    HEALTH,
+    HISTORY,
     LOGGER,
+    NODE_CACHE,
+    NET_COVERAGE_RATIO,
+    NET_EL_CUMULATIVE,
+    NET_EL_THIS_HOUR,
     PW_TYPE,
     STICK,
     USB,
+    USB_LINK_SENSORS,
+    VALVE_POS,
+    ZONE_VALVE_POS,
 )
 from .coordinator import PlugwiseDataUpdateCoordinator
-from .entity import PlugwiseEntity
-from .models import PW_SENSOR_TYPES, PlugwiseSensorEntityDescription
-from .usb import PlugwiseUSBEntity
+from .energy import P1EnergyTracker
+from .entity import (
+    PlugwiseEntity,
+    PlugwiseUSBEntity,
+    async_usb_placeholder_nodes,
+)
+from .history import SensorHistory, history_capacity
+from .models import (
+    P1_ENERGY_SENSOR_TYPES,
+    PW_SENSOR_TYPES,
+    USB_NETWORK_SENSOR_TYPES,
+    ZONE_SENSOR_TYPES,
+    PlugwiseSensorEntityDescription,
+)
+
+if TYPE_CHECKING:
+    from plugwise.nodes import PlugwiseNode
+
+    from .health import USBNetworkHealth
 
 PARALLEL_UPDATES = 0
 
@@ -41,30 +78,73 @@ async def async_setup_entry(
 async def async_setup_entry_usb(hass, config_entry, async_add_entities):
     """Set up Plugwise sensor based on config_entry."""
     api_stick = hass.data[DOMAIN][config_entry.entry_id][STICK]
+    # pw-beta - the links are summarized by the network sensors, the sensors
+    # per node only on request
+    link_sensors: bool = config_entry.options.get(
+        CONF_USB_LINK_SENSORS, DEFAULT_USB_LINK_SENSORS
+    )
+    skipped: tuple[str, ...] = () if link_sensors else USB_LINK_SENSORS
+    # Turning the option off disables the sensors present, on enables them again
+    ent_reg = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(
+        ent_reg, config_entry.entry_id
+    ):
+        if (
+            entity_entry.domain != Platform.SENSOR
+            or entity_entry.unique_id.partition("-")[2] not in USB_LINK_SENSORS
+        ):
+            continue
+        if not link_sensors and entity_entry.disabled_by is None:
+            ent_reg.async_update_entity(
+                entity_entry.entity_id,
+                disabled_by=er.RegistryEntryDisabler.INTEGRATION,
+            )
+        elif (
+            link_sensors
+            and entity_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+        ):
+            ent_reg.async_update_entity(entity_entry.entity_id, disabled_by=None)
 
-    async def async_add_sensors(mac: str):
-        """Add plugwise sensors for device."""
-        entities: list[USBSensor] = []
-        entities.extend(
-            [
-                USBSensor(api_stick.devices[mac], description)
-                for description in PW_SENSOR_TYPES
-                if description.plugwise_api == STICK
-                and description.key in api_stick.devices[mac].features
-            ]
-        )
-        if entities:
-            async_add_entities(entities)
+    def create_sensors(node: PlugwiseNode) -> list[USBSensor]:
+        """Create plugwise sensors for device."""
+        return [
+            USBSensor(node, description)
+            for description in PW_SENSOR_TYPES
+            if description.plugwise_api == STICK
+            and description.key in node.features
+            and description.key not in skipped
+        ]
 
-    for mac in hass.data[DOMAIN][config_entry.entry_id][Platform.SENSOR]:
-        hass.async_create_task(async_add_sensors(mac))
+    health = hass.data[DOMAIN][config_entry.entry_id][HEALTH]
+    async_add_entities(
+        USBNetworkSensor(health, api_stick.mac, description)
+        for description in USB_NETWORK_SENSOR_TYPES
+    )
 
-    def discoved_device(mac: str):
-        """Add sensors for newly discovered device."""
-        hass.async_create_task(async_add_sensors(mac))
+    # pw-beta - all entities in one call, the nodes discovered later in batches
+    batch = USBNodeBatch(
+        hass,
+        hass.data[DOMAIN][config_entry.entry_id][BRIDGE].interval,
+        api_stick.devices,
+        create_sensors,
+        async_add_entities,
+    )
 
     # Listen for discovered nodes
-    api_stick.subscribe_stick_callback(discoved_device, CB_NEW_NODE)
+    api_stick.subscribe_stick_callback(batch.node_discovered, CB_NEW_NODE)
+
+    # pw-beta - the nodes answered so far, the nodes not answering (yet) from
+    # the node cache or registry as unavailable placeholders
+    batch.async_add(
+        list(api_stick.devices),
+        async_usb_placeholder_nodes(
+            hass,
+            config_entry.entry_id,
+            Platform.SENSOR,
+            api_stick.devices,
+            hass.data[DOMAIN][config_entry.entry_id][NODE_CACHE].nodes,
+        ),
+    )
 
 
 async def async_setup_entry_gateway(
@@ -74,6 +154,11 @@ async def async_setup_entry_gateway(
 ) -> None:
     """Set up the Smile sensors from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    # pw-beta
+    histories: dict[str, SensorHistory] = hass.data[DOMAIN][config_entry.entry_id][
+        HISTORY
+    ]
+    capacity = history_capacity(config_entry, coordinator.update_interval)
 
     entities: list[PlugwiseSensorEntity] = []
     for device_id, device in coordinator.data.devices.items():
@@ -84,38 +169,240 @@ async def async_setup_entry_gateway(
             ):
                 continue
 
+            history = histories.setdefault(
+                f"{device_id}-{description.key}", SensorHistory(capacity)
+            )
             entities.append(
                 PlugwiseSensorEntity(
                     coordinator,
                     device_id,
                     description,
+                    history,
+                )
+            )
+            LOGGER.debug("Add %s sensor", description.key)
+
+    # pw-beta - energy totals derived from the P1 counters
+    for device_id, device in coordinator.data.devices.items():
+        if NET_EL_CUMULATIVE not in device.get("sensors", {}):
+            continue
+
+        tracker = P1EnergyTracker(hass, config_entry.entry_id)
+        await tracker.async_load()
+        for description in P1_ENERGY_SENSOR_TYPES:
+            entities.append(
+                PlugwiseP1EnergySensorEntity(
+                    coordinator, device_id, description, tracker
                 )
             )
             LOGGER.debug("Add %s sensor", description.key)
 
+    # pw-beta - aggregates of the zones holding more than the thermostat
+    for location in {
+        device.get("location") for device in coordinator.data.devices.values()
+    }:
+        if (
+            not location
+            or not (zone := coordinator.zones.zone(location))
+            or not zone.primary
+            or len(zone.devices) < 2
+        ):
+            continue
+        for description in ZONE_SENSOR_TYPES:
+            source = VALVE_POS if description.key == ZONE_VALVE_POS else "battery"
+            if not any(
+                source in coordinator.data.devices[device_id].get("sensors", {})
+                for device_id in zone.devices - {zone.primary}
+            ):
+                continue
+            entities.append(
+                PlugwiseZoneSensorEntity(coordinator, zone.primary, description)
+            )
+            LOGGER.debug("Add %s sensor", description.key)
+
     async_add_entities(entities)
 
 
 class PlugwiseSensorEntity(PlugwiseEntity, SensorEntity):
     """Represent Plugwise Sensors."""
 
+    entity_description: PlugwiseSensorEntityDescription
+
     def __init__(
         self,
         coordinator: PlugwiseDataUpdateCoordinator,
         device_id: str,
         description: PlugwiseSensorEntityDescription,
+        history: SensorHistory | None = None,
     ) -> None:
         """Initialise the sensor."""
         super().__init__(coordinator, device_id)
         self.entity_description = description
         self._attr_unique_id = f"{device_id}-{description.key}"
         self._attr_name = (f"{self.device.get('name', '')} {description.name}").lstrip()
+        self._history = history  # pw-beta
+        self._published_at: float | None = None  # pw-beta
+        self._published_value: Any = None  # pw-beta
 
     @property
     def native_value(self) -> int | float | None:
         """Return the value reported by the sensor."""
         return self.device["sensors"].get(self.entity_description.key)
 
+    # pw-beta
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only publish meaningful changes, with a guaranteed heartbeat."""
+        now = monotonic()
+        value = self.native_value if self.available else None
+        # Record every sample, also the ones the deadband does not publish
+        self._record_history(value)
+        if not self._publish_required(now, value):
+            if value != self._published_value:
+                # Keep getting updates until the held back value is published
+                self.coordinator.async_mark_dirty(self._dev_id)
+            return
+
+        self._published_at = now
+        self._published_value = value
+        super()._handle_coordinator_update()
+
+    # pw-beta
+    def _record_history(self, value: Any) -> None:
+        """Add a numeric value to the recent history."""
+        if self._history is not None and isinstance(value, (int, float)):
+            self._history.append(time(), value)
+
+    # pw-beta
+    def _publish_required(self, now: float, value: Any) -> bool:
+        """Return True when the deadband and publish intervals are passed."""
+        description = self.entity_description
+        settings: dict[str, float] = {}
+        if entry := self.coordinator.config_entry:
+            settings = entry.options.get(CONF_SENSOR_FILTERS, {}).get(
+                self.unique_id, {}
+            )
+
+        deadband = settings.get(CONF_DEADBAND, description.deadband)
+        relative = settings.get(CONF_DEADBAND_RELATIVE, description.deadband_relative)
+        min_interval = settings.get(
+            CONF_MIN_PUBLISH_INTERVAL, description.min_publish_interval
+        )
+        heartbeat = settings.get(CONF_HEARTBEAT, description.heartbeat)
+
+        last_value = self._published_value
+        if (
+            self._published_at is None
+            or not (deadband or relative or min_interval)
+            or not isinstance(value, (int, float))
+            or not isinstance(last_value, (int, float))
+        ):
+            return True
+
+        elapsed = now - self._published_at
+        if elapsed >= heartbeat:
+            return True
+        if min_interval and elapsed < min_interval:
+            return False
+
+        change = abs(value - last_value)
+        if deadband and change < deadband:
+            return False
+        if relative and change < abs(last_value) * relative / 100:
+            return False
+
+        return change > 0
+
+
+# pw-beta
+class PlugwiseP1EnergySensorEntity(PlugwiseEntity, SensorEntity):
+    """Represent an energy total derived from the P1 counters."""
+
+    entity_description: PlugwiseSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PlugwiseDataUpdateCoordinator,
+        device_id: str,
+        description: PlugwiseSensorEntityDescription,
+        tracker: P1EnergyTracker,
+    ) -> None:
+        """Initialise the sensor."""
+        super().__init__(coordinator, device_id)
+        self.entity_description = description
+        self._attr_unique_id = f"{device_id}-{description.key}"
+        self._attr_name = (f"{self.device.get('name', '')} {description.name}").lstrip()
+        self._tracker = tracker
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the derived value."""
+        return self._tracker.value(self.entity_description.key)
+
+    @property
+    def last_reset(self) -> datetime | None:
+        """Return the start of the current period."""
+        if self.entity_description.key == NET_COVERAGE_RATIO:
+            return None
+        if self.entity_description.key == NET_EL_THIS_HOUR:
+            return self._tracker.hour_start
+        return self._tracker.day_start
+
+    async def async_added_to_hass(self) -> None:
+        """Process the data present when added."""
+        self._tracker.async_update(self.coordinator.data, self.device["sensors"])
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Process the new counter values, once for all derived sensors."""
+        if self.available:
+            self._tracker.async_update(self.coordinator.data, self.device["sensors"])
+        super()._handle_coordinator_update()
+
+
+# pw-beta
+class PlugwiseZoneSensorEntity(PlugwiseEntity, SensorEntity):
+    """Represent an aggregate over the devices of the zone of a thermostat."""
+
+    entity_description: PlugwiseSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PlugwiseDataUpdateCoordinator,
+        device_id: str,
+        description: PlugwiseSensorEntityDescription,
+    ) -> None:
+        """Initialise the sensor."""
+        super().__init__(coordinator, device_id)
+        self.entity_description = description
+        self._attr_unique_id = f"{device_id}-{description.key}"
+        self._attr_name = (f"{self.device.get('name', '')} {description.name}").lstrip()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the mean valve position or the lowest battery level."""
+        if not (zone := self.coordinator.zones.zone_of(self._dev_id)):
+            return None
+
+        devices = self.coordinator.data.devices
+        if self.entity_description.key == ZONE_VALVE_POS:
+            positions = [
+                position
+                for device_id in zone.valves
+                if (position := devices[device_id]["sensors"].get(VALVE_POS))
+                is not None
+            ]
+            return round(sum(positions) / len(positions), 1) if positions else None
+
+        levels = [
+            level
+            for device_id in zone.devices
+            if (level := devices[device_id].get("sensors", {}).get("battery"))
+            is not None
+        ]
+        return min(levels, default=None)
+
 
 # Github issue #265
 class USBSensor(PlugwiseUSBEntity, SensorEntity):  # type: ignore[misc]
@@ -127,12 +414,49 @@ class USBSensor(PlugwiseUSBEntity, SensorEntity):  # type: ignore[misc]
         """Initialize sensor entity."""
         super().__init__(node, description)
 
+    @staticmethod
+    def _convert(value: Any) -> float | None:
+        """Return the rounded value of the node state."""
+        if value is not None:
+            return float(round(value, 3))
+        return None
+
     @property
     def native_value(self) -> float | None:
         """Return the native value of the sensor."""
-        # Github issue #265
-        state_value = getattr(self._node, self.entity_description.state_request_method)  # type: ignore[attr-defined]
-        # /Github issue #265
-        if state_value is not None:
-            return float(round(state_value, 3))
-        return None
+        return self._value  # pw-beta - cached on the node callback
+
+
+# pw-beta
+class USBNetworkSensor(SensorEntity):
+    """Represent an aggregate over the links of the USB-stick network."""
+
+    entity_description: PlugwiseSensorEntityDescription
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        health: USBNetworkHealth,
+        stick_mac: str,
+        description: PlugwiseSensorEntityDescription,
+    ) -> None:
+        """Initialise the sensor."""
+        self._health = health
+        self.entity_description = description
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, stick_mac)},
+            "name": f"Stick ({stick_mac})",
+            "manufacturer": "Plugwise",
+            "model": "Stick",
+        }
+        self._attr_name = description.name
+        self._attr_unique_id = f"{stick_mac}-{description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate of the last summary."""
+        return self._health.summary.get(self.entity_description.key)
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the summaries."""
+        self.async_on_remove(self._health.async_add_listener(self.async_write_ha_state))
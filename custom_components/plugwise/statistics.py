@@ -0,0 +1,159 @@
+"""Long-term statistics of the Plugwise energy counters."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import ENERGY_KILO_WATT_HOUR, VOLUME_CUBIC_METERS
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EL_CONSUMED_OFF_PEAK_CUMULATIVE,
+    EL_CONSUMED_PEAK_CUMULATIVE,
+    EL_PRODUCED_OFF_PEAK_CUMULATIVE,
+    EL_PRODUCED_PEAK_CUMULATIVE,
+    GAS_CONSUMED_CUMULATIVE,
+    LOGGER,
+)
+from .coordinator import PlugwiseDataUpdateCoordinator
+from .models import PW_SENSOR_TYPES
+
+HOUR = timedelta(hours=1)
+STATISTIC_COUNTERS: dict[str, str] = {
+    EL_CONSUMED_OFF_PEAK_CUMULATIVE: ENERGY_KILO_WATT_HOUR,
+    EL_CONSUMED_PEAK_CUMULATIVE: ENERGY_KILO_WATT_HOUR,
+    EL_PRODUCED_OFF_PEAK_CUMULATIVE: ENERGY_KILO_WATT_HOUR,
+    EL_PRODUCED_PEAK_CUMULATIVE: ENERGY_KILO_WATT_HOUR,
+    GAS_CONSUMED_CUMULATIVE: VOLUME_CUBIC_METERS,
+}
+STATISTIC_NAMES: dict[str, str] = {
+    description.key: str(description.name)
+    for description in PW_SENSOR_TYPES
+    if description.key in STATISTIC_COUNTERS
+}
+
+
+def hourly_statistics(
+    last_start: datetime | None,
+    last_state: float | None,
+    last_sum: float,
+    value: float,
+    until: datetime,
+) -> list[StatisticData]:
+    """Return the hourly rows after last_start up to, not including, until.
+
+    The counter value is known at the end of the last stored hour and now,
+    the hours missed in between (gateway unreachable, Home Assistant down)
+    are filled by linear interpolation. A counter going down is a reset.
+    """
+    if last_start is None or last_state is None:
+        # Nothing stored yet, the current value becomes the starting point
+        return [StatisticData(start=until - HOUR, state=value, sum=last_sum)]
+
+    hours = int((until - last_start) / HOUR) - 1
+    if hours < 1:
+        return []
+
+    base = last_state if value >= last_state else 0.0
+    step = (value - base) / hours
+    rows: list[StatisticData] = []
+    for hour in range(1, hours + 1):
+        state = value if hour == hours else base + step * hour
+        rows.append(
+            StatisticData(
+                start=last_start + HOUR * hour,
+                state=state,
+                sum=last_sum + step * hour,
+            )
+        )
+    return rows
+
+
+class PlugwiseStatistics:
+    """Write the hourly statistics of the counters of a gateway.
+
+    The rows are written once per hour, all missing hours in one insert.
+    They go to external statistics (plugwise:<device>_<key>), next to the
+    statistics the recorder compiles from the sensor states: the recorder of
+    Core 2022.7 only takes rows from an integration for external statistic
+    ids. The external statistics hold the hours of an outage the sensors
+    miss.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: PlugwiseDataUpdateCoordinator
+    ) -> None:
+        """Initialize the statistics writer."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._last: dict[str, dict[str, Any]] = {}
+        self._next_hour: datetime | None = None
+
+    @staticmethod
+    def statistic_id(device_id: str, key: str) -> str:
+        """Return the statistic_id of a counter."""
+        return f"{DOMAIN}:{device_id}_{key}"
+
+    async def async_load(self) -> None:
+        """Get the last stored row of every counter."""
+        if not await get_instance(self._hass).async_db_ready:
+            return
+        for device_id, device in self._coordinator.data.devices.items():
+            for key in STATISTIC_COUNTERS:
+                if key not in device.get("sensors", {}):
+                    continue
+                statistic_id = self.statistic_id(device_id, key)
+                last = await get_instance(self._hass).async_add_executor_job(
+                    get_last_statistics, self._hass, 1, statistic_id, True
+                )
+                self._last[statistic_id] = (
+                    last[statistic_id][0] if last else {"start": None, "state": None}
+                )
+        self.async_update()
+
+    @callback
+    def async_update(self) -> None:
+        """Write the rows of the hours passed, once per hour."""
+        now = dt_util.utcnow()
+        if self._next_hour is not None and now < self._next_hour:
+            return
+        until = now.replace(minute=0, second=0, microsecond=0)
+        self._next_hour = until + HOUR
+
+        for device_id, device in self._coordinator.data.devices.items():
+            sensors = device.get("sensors", {})
+            for key, unit in STATISTIC_COUNTERS.items():
+                statistic_id = self.statistic_id(device_id, key)
+                if (value := sensors.get(key)) is None or (
+                    last := self._last.get(statistic_id)
+                ) is None:
+                    continue
+                rows = hourly_statistics(
+                    last["start"], last["state"], last.get("sum") or 0.0, value, until
+                )
+                if not rows:
+                    continue
+
+                LOGGER.debug("Add %s statistics rows for %s", len(rows), statistic_id)
+                name = f"{device.get('name', '')} {STATISTIC_NAMES[key]}"
+                async_add_external_statistics(
+                    self._hass,
+                    StatisticMetaData(
+                        has_mean=False,
+                        has_sum=True,
+                        name=name.lstrip(),
+                        source=DOMAIN,
+                        statistic_id=statistic_id,
+                        unit_of_measurement=unit,
+                    ),
+                    rows,
+                )
+                self._last[statistic_id] = dict(rows[-1])
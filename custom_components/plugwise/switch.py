@@ -1,7 +1,7 @@
 """Plugwise Switch component for HomeAssistant."""
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -12,23 +12,30 @@ from homeassistant.const import (
     Platform,
 )
 
-from plugwise.nodes import PlugwiseNode
-
+from .bridge import USBNodeBatch
 from .const import (
+    BRIDGE,
     CB_NEW_NODE,
     COORDINATOR,
     DOMAIN,
     LOGGER,
+    NODE_CACHE,
     PW_TYPE,
     SMILE,
     STICK,
     USB,
 )
 from .coordinator import PlugwiseDataUpdateCoordinator
-from .entity import PlugwiseEntity
+from .entity import (
+    PlugwiseEntity,
+    PlugwiseUSBEntity,
+    async_usb_placeholder_nodes,
+)
 from .util import plugwise_command
 from .models import PW_SWITCH_TYPES, PlugwiseSwitchEntityDescription
-from .usb import PlugwiseUSBEntity
+
+if TYPE_CHECKING:
+    from plugwise.nodes import PlugwiseNode
 
 
 async def async_setup_entry(
@@ -47,29 +54,38 @@ async def async_setup_entry_usb(hass, config_entry, async_add_entities):
     """Set up the USB switches from a config entry."""
     api_stick = hass.data[DOMAIN][config_entry.entry_id][STICK]
 
-    async def async_add_switches(mac: str):
-        """Add plugwise switches."""
-        entities: list[USBSwitch] = []
-        entities.extend(
-            [
-                USBSwitch(api_stick.devices[mac], description)
-                for description in PW_SWITCH_TYPES
-                if description.plugwise_api == STICK
-                and description.key in api_stick.devices[mac].features
-            ]
-        )
-        if entities:
-            async_add_entities(entities)
-
-    for mac in hass.data[DOMAIN][config_entry.entry_id][Platform.SWITCH]:
-        hass.async_create_task(async_add_switches(mac))
-
-    def discoved_device(mac: str):
-        """Add switches for newly discovered device."""
-        hass.async_create_task(async_add_switches(mac))
+    def create_switches(node: PlugwiseNode) -> list[USBSwitch]:
+        """Create plugwise switches."""
+        return [
+            USBSwitch(node, description)
+            for description in PW_SWITCH_TYPES
+            if description.plugwise_api == STICK and description.key in node.features
+        ]
+
+    # pw-beta - all entities in one call, the nodes discovered later in batches
+    batch = USBNodeBatch(
+        hass,
+        hass.data[DOMAIN][config_entry.entry_id][BRIDGE].interval,
+        api_stick.devices,
+        create_switches,
+        async_add_entities,
+    )
 
     # Listen for discovered nodes
-    api_stick.subscribe_stick_callback(discoved_device, CB_NEW_NODE)
+    api_stick.subscribe_stick_callback(batch.node_discovered, CB_NEW_NODE)
+
+    # pw-beta - the nodes answered so far, the nodes not answering (yet) from
+    # the node cache or registry as unavailable placeholders
+    batch.async_add(
+        list(api_stick.devices),
+        async_usb_placeholder_nodes(
+            hass,
+            config_entry.entry_id,
+            Platform.SWITCH,
+            api_stick.devices,
+            hass.data[DOMAIN][config_entry.entry_id][NODE_CACHE].nodes,
+        ),
+    )
 
 
 async def async_setup_entry_gateway(
@@ -150,8 +166,7 @@ class USBSwitch(PlugwiseUSBEntity, SwitchEntity):  # type: ignore[misc]
     @property
     def is_on(self) -> bool:
         """Return true if the switch is on."""
-        # Github issue #265
-        return getattr(self._node, self.entity_description.state_request_method)  # type: ignore[attr-defined]
+        return self._value  # pw-beta - cached on the node callback
 
     def turn_off(self, **kwargs):
         """Instruct the switch to turn off."""
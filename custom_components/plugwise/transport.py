@@ -0,0 +1,264 @@
+"""Asyncio transport of the Plugwise USB-stick protocol."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+
+from plugwise.constants import (
+    BAUD_RATE,
+    BYTE_SIZE,
+    MESSAGE_FOOTER,
+    MESSAGE_HEADER,
+    RESPONSE_TYPE_SUCCESS,
+    RESPONSE_TYPE_TIMEOUT,
+    STOPBITS,
+    UTF8_DECODE,
+)
+from plugwise.exceptions import (
+    NetworkDown,
+    PortError,
+    StickInitError,
+    TimeoutException,
+)
+from plugwise.messages.requests import NodeRequest, StickInitRequest
+from plugwise.messages.responses import (
+    NodeAckSmallResponse,
+    NodeResponse,
+    StickInitResponse,
+    get_message_response,
+)
+from plugwise.util import inc_seq_id
+
+from .const import DEFAULT_STICK_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _Request:
+    """A request awaiting the acknowledge of the stick and its response."""
+
+    message: NodeRequest
+    response: asyncio.Future[NodeResponse] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+    seq_id: bytes | None = None
+
+
+class StickProtocol(asyncio.Protocol):
+    """Frame the stick messages and match the responses to the requests.
+
+    The stick acknowledges every request with the next sequence id, the
+    response carries the same sequence id. The sequence id of a request is
+    known ahead from the first acknowledge on, so a late acknowledge of a
+    request given up is not taken for another one. Every request awaits its
+    own future, many requests can be outstanding at once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self.transport: asyncio.Transport | None = None
+        self.connected: asyncio.Future[
+            None
+        ] = asyncio.get_running_loop().create_future()
+        self.closed: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._buffer = b""
+        self._unacknowledged: deque[_Request] = deque()
+        self._pending: dict[bytes, _Request] = {}
+        self._next_seq_id: bytes | None = None
+        # Sequence ids of the requests given up before their acknowledge
+        self._timed_out: set[bytes] = set()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport of the opened port."""
+        self.transport = transport  # type: ignore[assignment]
+        self.connected.set_result(None)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail the outstanding requests."""
+        self.transport = None
+        for request in (*self._unacknowledged, *self._pending.values()):
+            if not request.response.done():
+                request.response.set_exception(PortError(exc))
+        self._unacknowledged.clear()
+        self._pending.clear()
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    async def async_close(self) -> None:
+        """Close the port, return once released."""
+        if self.transport is not None:
+            self.transport.close()
+            await self.closed
+
+    def data_received(self, data: bytes) -> None:
+        """Process the complete messages received."""
+        self._buffer += data
+        while (header := self._buffer.find(MESSAGE_HEADER)) != -1 and (
+            footer := self._buffer.find(MESSAGE_FOOTER, header)
+        ) != -1:
+            frame = self._buffer[header : footer + len(MESSAGE_FOOTER)]
+            self._buffer = self._buffer[footer + len(MESSAGE_FOOTER) :]
+            if (message := _deserialize(frame)) is not None:
+                self._process(message)
+
+    def _process(self, message: NodeResponse) -> None:
+        """Acknowledge or answer the request the message belongs to."""
+        if isinstance(message, NodeAckSmallResponse):
+            # The stick gave up waiting for the node
+            if (request := self._pending.pop(message.seq_id, None)) is not None:
+                if not request.response.done():
+                    request.response.set_exception(
+                        TimeoutException(
+                            f"{message.ack_id!r} on {request.message.__class__.__name__}"
+                        )
+                    )
+                return
+            # A timeout of a request given up while pending acknowledges none
+            if (
+                message.ack_id == RESPONSE_TYPE_TIMEOUT
+                or (request := self._acknowledged(message.seq_id)) is None
+            ):
+                _LOGGER.debug(
+                    "Unsolicited acknowledge %r of %r", message.ack_id, message.seq_id
+                )
+                return
+            if message.ack_id != RESPONSE_TYPE_SUCCESS:
+                request.response.set_exception(
+                    TimeoutException(
+                        f"{message.ack_id!r} on {request.message.__class__.__name__}"
+                    )
+                )
+                return
+            self._pending[message.seq_id] = request
+            return
+
+        if (request := self._pending.pop(message.seq_id, None)) is None:
+            _LOGGER.debug("Unsolicited %s", message.__class__.__name__)
+            return
+        if not request.response.done():
+            request.response.set_result(message)
+
+    def _acknowledged(self, seq_id: bytes) -> _Request | None:
+        """Return the request an acknowledge belongs to, None when given up."""
+        for request in self._unacknowledged:
+            if request.seq_id == seq_id:
+                self._unacknowledged.remove(request)
+                # The stick acknowledges in order, no older one follows
+                self._timed_out.clear()
+                return request
+        if seq_id in self._timed_out:
+            self._timed_out.discard(seq_id)
+            return None
+        if not self._unacknowledged:
+            return None
+        # The first acknowledge, or the stick did not take a request given up:
+        # follow the sequence ids of the stick from here
+        request = self._unacknowledged.popleft()
+        request.seq_id = seq_id
+        for other in self._unacknowledged:
+            seq_id = inc_seq_id(seq_id)
+            other.seq_id = seq_id
+        self._next_seq_id = inc_seq_id(seq_id)
+        return request
+
+    async def async_request(
+        self, message: NodeRequest, timeout: float = DEFAULT_STICK_TIMEOUT
+    ) -> NodeResponse:
+        """Send a request, return its response."""
+        if self.transport is None:
+            raise PortError("Not connected")
+        request = _Request(message, seq_id=self._next_seq_id)
+        if self._next_seq_id is not None:
+            self._next_seq_id = inc_seq_id(self._next_seq_id)
+        self._unacknowledged.append(request)
+        self.transport.write(message.serialize())
+        try:
+            return await asyncio.wait_for(request.response, timeout)
+        except asyncio.TimeoutError as err:
+            if request in self._unacknowledged:
+                self._unacknowledged.remove(request)
+                if request.seq_id is not None:
+                    if self._timed_out:
+                        # Again no acknowledge, the stick did not take the
+                        # requests given up before
+                        self._timed_out.clear()
+                    else:
+                        self._timed_out.add(request.seq_id)
+            elif self._pending.get(request.seq_id) is request:
+                del self._pending[request.seq_id]
+            raise TimeoutException(
+                f"No response on {message.__class__.__name__}"
+            ) from err
+
+
+def _deserialize(frame: bytes) -> NodeResponse | None:
+    """Return the message of a frame, None when unknown or invalid."""
+    message = get_message_response(frame[4:8], len(frame) - 2, frame[8:12])
+    if message is None:
+        return None
+    # The library hands out one shared instance per message id
+    message = message.__class__()
+    try:
+        message.deserialize(frame)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Invalid %s message: %s", message.__class__.__name__, err)
+        return None
+    return message
+
+
+async def async_connect_stick(port: str) -> StickProtocol:
+    """Open the serial port of a stick."""
+    # pylint: disable=import-outside-toplevel
+    import serial
+    import serial_asyncio
+
+    loop = asyncio.get_running_loop()
+    try:
+        _, protocol = await serial_asyncio.create_serial_connection(
+            loop,
+            StickProtocol,
+            port,
+            baudrate=BAUD_RATE,
+            bytesize=BYTE_SIZE,
+            parity=serial.PARITY_NONE,
+            stopbits=STOPBITS,
+        )
+    except (OSError, serial.SerialException) as err:
+        raise PortError(err) from err
+    await protocol.connected
+    return protocol
+
+
+async def _async_stick_init(
+    protocol: StickProtocol, timeout: float
+) -> StickInitResponse:
+    """Initialize the stick on an open port, return its response."""
+    try:
+        response = await protocol.async_request(StickInitRequest(), timeout)
+    except TimeoutException as err:
+        if isinstance(err.__cause__, asyncio.TimeoutError):
+            raise StickInitError from err
+        raise
+
+    if not isinstance(response, StickInitResponse):
+        raise StickInitError
+    if response.network_is_online.value != 1:
+        raise NetworkDown
+    return response
+
+
+async def async_init_stick(port: str, timeout: float = DEFAULT_STICK_TIMEOUT) -> str:
+    """Initialize a stick, return its MAC.
+
+    Raise StickInitError when the stick does not answer, NetworkDown when
+    its network is not online.
+    """
+    protocol = await async_connect_stick(port)
+    try:
+        response = await _async_stick_init(protocol, timeout)
+    finally:
+        await protocol.async_close()
+    return response.mac.decode(UTF8_DECODE)
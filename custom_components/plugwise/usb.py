@@ -2,11 +2,11 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_utc_time_change
 
 from plugwise.exceptions import (
     CirclePlusError,
@@ -15,27 +15,45 @@ from plugwise.exceptions import (
     StickInitError,
     TimeoutException,
 )
-from plugwise.nodes import PlugwiseNode
 from plugwise.stick import Stick
 
+from .bridge import USBUpdateBridge
+from .health import USBNetworkHealth
+from .node_cache import USBNodeCache
+from .poller import USBPowerPoller
+from .scheduler import USBCommandScheduler
+from .sed_queue import USBSEDCommandQueue
 from .const import (
     ATTR_MAC_ADDRESS,
+    BRIDGE,
     CB_JOIN_REQUEST,
+    CB_NEW_NODE,
     CONF_USB_PATH,
+    CONF_USB_UPDATE_INTERVAL,
+    DEFAULT_USB_DEGRADED_PING,
+    DEFAULT_USB_DEGRADED_RSSI,
+    DEFAULT_USB_ENERGY_BACKFILL,
+    DEFAULT_USB_POLL_BUDGET,
+    DEFAULT_USB_POLL_MAX_INTERVAL,
+    DEFAULT_USB_POLL_MIN_INTERVAL,
+    DEFAULT_USB_TELEMETRY_INTERVAL,
+    DEFAULT_USB_UPDATE_INTERVAL,
     DOMAIN,
+    ENERGY_LOG,
+    HEALTH,
+    NODE_CACHE,
     PLATFORMS_USB,
+    POLLER,
     PW_TYPE,
+    SCHEDULER,
+    SED_QUEUE,
     SERVICE_USB_DEVICE_ADD,
     SERVICE_USB_DEVICE_REMOVE,
     SERVICE_USB_DEVICE_SCHEMA,
     STICK,
     UNDO_UPDATE_LISTENER,
     USB,
-    USB_AVAILABLE_ID,
-    USB_MOTION_ID,
-    USB_RELAY_ID,
 )
-from .models import PlugwiseEntityDescription
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,29 +64,12 @@ async def async_setup_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry):
     device_registry = dr.async_get(hass)
 
     def discover_finished():
-        """Create entities for all discovered nodes."""
+        """Start the updates once all registered nodes are discovered."""
         _LOGGER.debug(
             "Successfully discovered %s out of %s registered nodes",
             str(len(api_stick.devices)),
             str(api_stick.joined_nodes),
         )
-        for component in PLATFORMS_USB:
-            hass.data[DOMAIN][config_entry.entry_id][component] = []
-
-        for mac, pw_device in api_stick.devices.items():
-            # Skip unsupported devices
-            if pw_device is not None:
-                if USB_RELAY_ID in pw_device.features:
-                    hass.data[DOMAIN][config_entry.entry_id][Platform.SWITCH].append(
-                        mac
-                    )
-                if USB_MOTION_ID in pw_device.features:
-                    hass.data[DOMAIN][config_entry.entry_id][
-                        Platform.BINARY_SENSOR
-                    ].append(mac)
-                hass.data[DOMAIN][config_entry.entry_id][Platform.SENSOR].append(mac)
-
-        hass.config_entries.async_setup_platforms(config_entry, PLATFORMS_USB)
 
         def add_new_node(mac):
             """Add Listener when a new Plugwise node joined the network."""
@@ -83,6 +84,11 @@ async def async_setup_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry):
             )
 
         api_stick.auto_update()
+        # pw-beta
+        if ENERGY_LOG in hass.data[DOMAIN][config_entry.entry_id]:
+            hass.add_job(
+                hass.data[DOMAIN][config_entry.entry_id][ENERGY_LOG].async_import
+            )
 
         if config_entry.pref_disable_new_entities:
             _LOGGER.debug("Configuring stick NOT to accept any new join requests")
@@ -96,10 +102,31 @@ async def async_setup_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry):
         hass.async_add_executor_job(api_stick.disconnect)
 
     api_stick = Stick(config_entry.data[CONF_USB_PATH])
-    hass.data[DOMAIN][config_entry.entry_id] = {PW_TYPE: USB, STICK: api_stick}
+    # pw-beta - the node callbacks are written to the states in batches
+    bridge = USBUpdateBridge(
+        hass,
+        config_entry.options.get(CONF_USB_UPDATE_INTERVAL, DEFAULT_USB_UPDATE_INTERVAL),
+    )
+    # pw-beta - the nodes known from the previous run
+    node_cache = USBNodeCache(hass, config_entry.entry_id)
+    await node_cache.async_load()
+    hass.data[DOMAIN][config_entry.entry_id] = {
+        PW_TYPE: USB,
+        STICK: api_stick,
+        BRIDGE: bridge,
+        NODE_CACHE: node_cache,
+    }
     try:
         _LOGGER.debug("Connect to USB-Stick")
         await hass.async_add_executor_job(api_stick.connect)
+        # pw-beta - before any node is created, the nodes keep the send method
+        controller = api_stick.msg_controller
+        scheduler = USBCommandScheduler(
+            controller.send, controller.connection.send, DEFAULT_USB_TELEMETRY_INTERVAL
+        )
+        controller.send = scheduler.send
+        controller.connection.send = scheduler.write
+        hass.data[DOMAIN][config_entry.entry_id][SCHEDULER] = scheduler
         _LOGGER.debug("Initialize USB-stick")
         await hass.async_add_executor_job(api_stick.initialize_stick)
         _LOGGER.debug("Discover Circle+ node")
@@ -123,6 +150,88 @@ async def async_setup_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry):
         _LOGGER.warning("Timeout")
         await hass.async_add_executor_job(api_stick.disconnect)
         raise ConfigEntryNotReady from TimeoutException
+
+    def node_discovered(mac):
+        """Remember the node in the cache."""
+        hass.loop.call_soon_threadsafe(node_cache.async_update, api_stick.devices[mac])
+
+    api_stick.subscribe_stick_callback(node_discovered, CB_NEW_NODE)
+
+    # pw-beta - pass the processed messages on to the listeners below
+    message_listeners = []
+    process_message = controller.message_processor
+
+    def message_processor(message):
+        """Pass the processed messages to the listeners."""
+        process_message(message)
+        for listener in message_listeners:
+            listener(message)
+
+    controller.message_processor = message_processor
+
+    # pw-beta - hold the configuration of the SEDs until they are awake
+    sed_queue = USBSEDCommandQueue(
+        hass, config_entry.entry_id, api_stick.devices, controller.send
+    )
+    await sed_queue.async_load()
+    message_listeners.append(sed_queue.message_received)
+    hass.data[DOMAIN][config_entry.entry_id][SED_QUEUE] = sed_queue
+
+    # pw-beta - summarize the pings of the nodes
+    health = USBNetworkHealth(
+        hass, api_stick.devices, DEFAULT_USB_DEGRADED_RSSI, DEFAULT_USB_DEGRADED_PING
+    )
+    message_listeners.append(health.message_received)
+    health.async_start()
+    hass.data[DOMAIN][config_entry.entry_id][HEALTH] = health
+
+    # pw-beta - poll the power of the Circles following their load, in place
+    # of the uniform polls of the library
+    poller = USBPowerPoller(
+        hass,
+        api_stick.devices,
+        DEFAULT_USB_POLL_BUDGET,
+        DEFAULT_USB_POLL_MIN_INTERVAL,
+        DEFAULT_USB_POLL_MAX_INTERVAL,
+    )
+    scheduler.skip_library_polls = True
+    poller.async_start()
+    hass.data[DOMAIN][config_entry.entry_id][POLLER] = poller
+
+    # pw-beta - import the hourly energy logs of the Circles into statistics
+    if "recorder" in hass.config.components:
+        # pylint: disable-next=import-outside-toplevel
+        from .energy_log import USBEnergyLogImport
+
+        energy_log = USBEnergyLogImport(
+            hass, api_stick.devices, controller.send, DEFAULT_USB_ENERGY_BACKFILL
+        )
+        message_listeners.append(energy_log.message_received)
+        hass.data[DOMAIN][config_entry.entry_id][ENERGY_LOG] = energy_log
+        config_entry.async_on_unload(
+            async_track_utc_time_change(
+                hass, energy_log.async_import, minute=5, second=0
+            )
+        )
+
+    # pw-beta - set up the platforms right away, the entities are created as
+    # the nodes answer (or from the cache), not after the scan of the network
+    hass.config_entries.async_setup_platforms(config_entry, PLATFORMS_USB)
+    reported: set[str] = set()
+    scan_discovered = api_stick.node_discovered_by_scan
+
+    def node_discovered_by_scan(nodes_off_line=False):
+        """Report the nodes answering the scan as new nodes."""
+        for mac, pw_device in list(api_stick.devices.items()):
+            # Skip unsupported devices
+            if pw_device is not None and mac not in reported:
+                reported.add(mac)
+                api_stick.do_callback(CB_NEW_NODE, mac)
+        scan_discovered(nodes_off_line)
+
+    # The library only calls back once the scan has finished
+    api_stick.node_discovered_by_scan = node_discovered_by_scan
+
     _LOGGER.debug("Start discovery of registered nodes")
     api_stick.scan(discover_finished)
 
@@ -153,6 +262,7 @@ async def async_setup_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry):
                 "Remove device %s from Home Assistant", service.data[ATTR_MAC_ADDRESS]
             )
             device_registry.async_remove_device(device_entry.id)
+        node_cache.async_remove(service.data[ATTR_MAC_ADDRESS])  # pw-beta
 
     hass.services.async_register(
         DOMAIN, SERVICE_USB_DEVICE_ADD, device_add, SERVICE_USB_DEVICE_SCHEMA
@@ -172,7 +282,17 @@ async def async_unload_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry)
     )
     hass.data[DOMAIN][config_entry.entry_id][UNDO_UPDATE_LISTENER]()
     if unload_ok:
+        hass.data[DOMAIN][config_entry.entry_id][BRIDGE].async_shutdown()
+        hass.data[DOMAIN][config_entry.entry_id][POLLER].async_shutdown()
+        hass.data[DOMAIN][config_entry.entry_id][HEALTH].async_shutdown()
         api_stick = hass.data[DOMAIN][config_entry.entry_id]["stick"]
+        # pw-beta - keep the last seen time of the nodes still answering
+        node_cache = hass.data[DOMAIN][config_entry.entry_id][NODE_CACHE]
+        for node in api_stick.devices.values():
+            if node is not None and node.available:
+                node_cache.async_update(node)
+        await node_cache.async_save()
+        await hass.data[DOMAIN][config_entry.entry_id][SED_QUEUE].async_save()
         await hass.async_add_executor_job(api_stick.disconnect)
         hass.data[DOMAIN].pop(config_entry.entry_id)
     return unload_ok
@@ -181,46 +301,3 @@ async def async_unload_entry_usb(hass: HomeAssistant, config_entry: ConfigEntry)
 async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
     """Handle options update."""
     await hass.config_entries.async_reload(config_entry.entry_id)
-
-
-class PlugwiseUSBEntity(Entity):
-    """Base class for Plugwise USB entities."""
-
-    entity_description: PlugwiseEntityDescription
-
-    # Github issue #265: the entity_description is not working accordingly
-    def __init__(
-        self, node: PlugwiseNode, entity_description: PlugwiseEntityDescription
-    ) -> None:
-        """Initialize a Pluswise USB entity."""
-        self._attr_available = node.available
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, node.mac)},
-            "name": f"{node.hardware_model} ({node.mac})",
-            "manufacturer": "Plugwise",
-            "model": node.hardware_model,
-            "sw_version": f"{node.firmware_version}",
-        }
-        self._attr_name = f"{entity_description.name} ({node.mac[-5:]})"
-        # Github issue #265
-        self._attr_should_poll = entity_description.should_poll  # type: ignore[attr-defined]
-        # /Github issue #265
-        self._attr_unique_id = f"{node.mac}-{entity_description.key}"
-        self._node = node
-        self.entity_description = entity_description
-        self.node_callbacks = (USB_AVAILABLE_ID, entity_description.key)
-
-    async def async_added_to_hass(self):
-        """Subscribe for updates."""
-        for node_callback in self.node_callbacks:
-            self._node.subscribe_callback(self.sensor_update, node_callback)
-
-    async def async_will_remove_from_hass(self):
-        """Unsubscribe to updates."""
-        for node_callback in self.node_callbacks:
-            self._node.unsubscribe_callback(self.sensor_update, node_callback)
-
-    def sensor_update(self, state):
-        """Handle status update of Entity."""
-        self.schedule_update_ha_state()
-        self._attr_available = self._node.available
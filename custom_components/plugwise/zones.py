@@ -0,0 +1,119 @@
+"""Location index of the devices of a Plugwise Adam."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import MASTER_THERMOSTATS, ZONE_VALVES
+
+
+@dataclass
+class Zone:
+    """The devices sharing a location."""
+
+    location: str
+    devices: set[str] = field(default_factory=set)
+    primary: str | None = None
+    valves: set[str] = field(default_factory=set)
+
+
+class ZoneIndex:
+    """Map the locations to their devices, primary thermostat and valves.
+
+    Only the devices added, removed or moved to another location are
+    processed on an update, the lookups are dict accesses.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._zones: dict[str, Zone] = {}
+        self._locations: dict[str, str] = {}
+        self._classes: dict[str, str] = {}
+        self._thermostats: set[str] = set()
+
+    def __len__(self) -> int:
+        """Return the number of zones."""
+        return len(self._zones)
+
+    def zone(self, location: str) -> Zone | None:
+        """Return the zone of a location."""
+        return self._zones.get(location)
+
+    @property
+    def thermostats(self) -> set[str]:
+        """Return the thermostats, the devices having a climate entity."""
+        return self._thermostats
+
+    def zone_of(self, device_id: str) -> Zone | None:
+        """Return the zone a device belongs to."""
+        if (location := self._locations.get(device_id)) is None:
+            return None
+        return self._zones[location]
+
+    def update(self, devices: dict[str, dict[str, Any]]) -> set[str]:
+        """Apply the device changes, return the locations changed."""
+        changed: set[str] = set()
+        for device_id, device in devices.items():
+            location: str | None = device.get("location")
+            if (previous := self._locations.get(device_id)) == location:
+                continue
+            if previous is not None:
+                self._remove(device_id, previous)
+                changed.add(previous)
+            if location is not None:
+                self._add(device_id, device.get("dev_class", ""), location)
+                changed.add(location)
+
+        for device_id in self._locations.keys() - devices.keys():
+            location = self._locations[device_id]
+            self._remove(device_id, location)
+            changed.add(location)
+
+        return changed
+
+    def _add(self, device_id: str, dev_class: str, location: str) -> None:
+        """Add a device to the zone of its location."""
+        self._locations[device_id] = location
+        self._classes[device_id] = dev_class
+        zone = self._zones.setdefault(location, Zone(location))
+        zone.devices.add(device_id)
+        if dev_class in ZONE_VALVES:
+            zone.valves.add(device_id)
+        if dev_class in MASTER_THERMOSTATS:
+            self._thermostats.add(device_id)
+        if dev_class in MASTER_THERMOSTATS and self._ranks_before(
+            device_id, zone.primary
+        ):
+            zone.primary = device_id
+
+    def _remove(self, device_id: str, location: str) -> None:
+        """Remove a device from the zone of its former location."""
+        del self._locations[device_id]
+        self._classes.pop(device_id, None)
+        zone = self._zones[location]
+        zone.devices.discard(device_id)
+        zone.valves.discard(device_id)
+        self._thermostats.discard(device_id)
+        if not zone.devices:
+            del self._zones[location]
+            return
+
+        if zone.primary == device_id:
+            zone.primary = None
+            for member in zone.devices:
+                if self._classes[member] in MASTER_THERMOSTATS and self._ranks_before(
+                    member, zone.primary
+                ):
+                    zone.primary = member
+
+    def _ranks_before(self, device_id: str, primary: str | None) -> bool:
+        """Return True when the device is a better primary thermostat.
+
+        A valve only acts as the primary of a zone without a thermostat.
+        """
+        if primary is None:
+            return True
+        return (
+            self._classes[primary] in ZONE_VALVES
+            and self._classes[device_id] not in ZONE_VALVES
+        )
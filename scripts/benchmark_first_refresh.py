@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Measure the cold start of a Smile: discovery plus the first data.
+
+Point it to a Smile, or to the local Smile emulator of python-plugwise
+serving one of its userdata sets:
+
+    python3 scripts/benchmark_first_refresh.py <host> <password> [port] [runs]
+
+'two-pass' is the former start-up: get_all_devices() on the event loop
+followed by a full async_update(). 'single-pass' is the current start-up:
+get_all_devices() in an executor, its output being the first data.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+
+import aiohttp
+from plugwise.smile import Smile
+
+
+async def _cold_start(
+    host: str, password: str, port: int, single_pass: bool
+) -> tuple[float, float]:
+    """Return the connect time and the discovery + first data time in ms."""
+    async with aiohttp.ClientSession() as websession:
+        api = Smile(
+            host=host,
+            password=password,
+            port=port,
+            timeout=30,
+            websession=websession,
+        )
+        start = time.perf_counter()
+        await api.connect()
+        connected = time.perf_counter()
+        if single_pass:
+            await asyncio.get_running_loop().run_in_executor(None, api.get_all_devices)
+        else:
+            api.get_all_devices()
+            await api.async_update()
+        done = time.perf_counter()
+    return (connected - start) * 1000, (done - connected) * 1000
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    host, password = sys.argv[1], sys.argv[2]
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else 80
+    runs = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+
+    results: dict[str, list[float]] = {}
+    for name, single_pass in (("two-pass", False), ("single-pass", True)):
+        results[name] = [
+            (await _cold_start(host, password, port, single_pass))[1]
+            for _ in range(runs)
+        ]
+
+    print(f"Discovery + first data, median of {runs} runs (connect excluded)")
+    for name, timings in results.items():
+        print(f"  {name:12}: {statistics.median(timings):8.1f} ms")
+    saved = statistics.median(results["two-pass"]) - statistics.median(
+        results["single-pass"]
+    )
+    print(f"  {'saved':12}: {saved:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Measure the import cost of the Plugwise integration with and without USB.
+
+Run from the repository root inside an environment having Home Assistant and
+the plugwise module installed (i.e. the venv created by core-testing.sh):
+
+    python3 scripts/benchmark_import.py [runs]
+
+Every measurement runs in a fresh interpreter so nothing is cached in
+sys.modules. The 'gateway' scenario imports what a network-only setup loads,
+the 'usb' scenario adds what is loaded once a USB-stick entry is set up.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+
+GATEWAY_MODULES = [
+    "custom_components.plugwise",
+    "custom_components.plugwise.config_flow",
+    "custom_components.plugwise.binary_sensor",
+    "custom_components.plugwise.sensor",
+    "custom_components.plugwise.switch",
+]
+USB_MODULES = [
+    "custom_components.plugwise.usb",
+    "homeassistant.components.usb",
+    "serial.tools.list_ports",
+]
+WATCHED = ["custom_components.plugwise.usb", "serial.tools.list_ports"]
+
+# Import Home Assistant itself first, it is always loaded and not part of the
+# cost of this integration.
+TEMPLATE = """
+import sys, time
+import homeassistant.core
+start = time.perf_counter()
+for module in {modules!r}:
+    __import__(module)
+elapsed = time.perf_counter() - start
+loaded = [module for module in {watched!r} if module in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def _measure(modules: list[str], runs: int) -> tuple[float, str]:
+    """Return the median import time in ms and the watched modules loaded."""
+    timings: list[float] = []
+    loaded = ""
+    code = TEMPLATE.format(modules=modules, watched=WATCHED)
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            cwd=ROOT,
+            text=True,
+        )
+        elapsed, _, loaded = result.stdout.strip().partition(" ")
+        timings.append(float(elapsed) * 1000)
+    return statistics.median(timings), loaded or "-"
+
+
+def main() -> None:
+    """Run the benchmark."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    gateway, gateway_loaded = _measure(GATEWAY_MODULES, runs)
+    usb, usb_loaded = _measure(GATEWAY_MODULES + USB_MODULES, runs)
+    print(f"Median of {runs} runs")
+    print(f"  gateway only : {gateway:8.1f} ms  (loaded: {gateway_loaded})")
+    print(f"  with USB     : {usb:8.1f} ms  (loaded: {usb_loaded})")
+    print(f"  saved        : {usb - gateway:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
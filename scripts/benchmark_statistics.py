@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Measure the import of a year of hourly statistics of one energy counter.
+
+Run from the repository root inside an environment having Home Assistant
+installed (i.e. the venv created by core-testing.sh):
+
+    python3 scripts/benchmark_statistics.py [hours]
+
+A recorder with a temporary SQLite database is started. 'bulk' writes all
+rows in one async_add_external_statistics() call, as done when backfilling
+after an outage. 'per-hour' writes the same rows one call per hour, as they
+would arrive without batching.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.statistics import hourly_statistics  # noqa: E402
+
+
+def _metadata(name: str) -> StatisticMetaData:
+    """Return the metadata of a benchmark statistic."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=name,
+        source="plugwise",
+        statistic_id=f"plugwise:benchmark_{name}",
+        unit_of_measurement="kWh",
+    )
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    hours = int(sys.argv[1]) if len(sys.argv) > 1 else 24 * 365
+    until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    last_start = until - timedelta(hours=hours + 1)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+        await async_setup_component(
+            hass,
+            "recorder",
+            {"recorder": {"db_url": f"sqlite:///{config_dir}/benchmark.db"}},
+        )
+        await hass.async_start()
+        recorder = get_instance(hass)
+        await recorder.async_db_ready
+
+        start = time.perf_counter()
+        rows = hourly_statistics(last_start, 0.0, 0.0, hours * 0.5, until)
+        built = time.perf_counter()
+        async_add_external_statistics(hass, _metadata("bulk"), rows)
+        await recorder.async_block_till_done()
+        bulk = time.perf_counter()
+
+        rows = hourly_statistics(last_start, 0.0, 0.0, hours * 0.5, until)
+        start_single = time.perf_counter()
+        for row in rows:
+            async_add_external_statistics(hass, _metadata("single"), [row])
+        await recorder.async_block_till_done()
+        single = time.perf_counter()
+
+        await hass.async_stop()
+
+    print(f"{len(rows)} hourly rows")
+    print(f"  build rows : {(built - start) * 1000:8.1f} ms")
+    print(f"  bulk       : {(bulk - built) * 1000:8.1f} ms")
+    print(f"  per-hour   : {(single - start_single) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Measure adding the USB sensors of a large Circle network.
+
+Run from the repository root inside an environment having Home Assistant
+installed (i.e. the venv created by core-testing.sh):
+
+    python3 scripts/benchmark_usb_setup.py [circles]
+
+'per-node' schedules a task calling async_add_entities for every node, as
+done before the discovery was batched. 'batched' adds the entities of all
+nodes in one call. Each run uses a fresh Home Assistant instance.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.const import STICK  # noqa: E402
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.models import PW_SENSOR_TYPES  # noqa: E402
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.sensor import USBSensor  # noqa: E402
+
+DESCRIPTIONS = [
+    description
+    for description in PW_SENSOR_TYPES
+    if description.plugwise_api == STICK and description.state_request_method
+]
+
+
+class FakeNode:
+    """A Circle answering every described state with zero."""
+
+    def __init__(self, mac: str) -> None:
+        """Initialize the node."""
+        self.available = True
+        self.features = tuple(description.key for description in DESCRIPTIONS)
+        self.firmware_version = "2011-06-27T10:47:37+00:00"
+        self.hardware_model = "Circle"
+        self.mac = mac
+
+    def subscribe_callback(self, *args: Any) -> None:
+        """Ignore the subscriptions."""
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a state."""
+        return 0.0
+
+
+async def run(circles: int, batched: bool) -> float:
+    """Add the sensors of the network, return the time taken."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="sensor",
+            platform_name="plugwise",
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        nodes = [FakeNode(f"000D6F00{circle:08X}") for circle in range(circles)]
+
+        start = time.perf_counter()
+        if batched:
+            await platform.async_add_entities(
+                [
+                    USBSensor(node, description)
+                    for node in nodes
+                    for description in DESCRIPTIONS
+                ]
+            )
+        else:
+            for node in nodes:
+                hass.async_create_task(
+                    platform.async_add_entities(
+                        [USBSensor(node, description) for description in DESCRIPTIONS]
+                    )
+                )
+            await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+
+        await hass.async_stop(force=True)
+    return elapsed
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    circles = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    per_node = await run(circles, False)
+    batched = await run(circles, True)
+
+    print(f"{circles} Circles, {circles * len(DESCRIPTIONS)} sensors")
+    print(f"  per-node : {per_node * 1000:8.1f} ms")
+    print(f"  batched  : {batched * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Measure the library Stick against a simulated USB-stick.
+
+Run from the repository root inside an environment having Home Assistant
+installed (i.e. the venv created by core-testing.sh), no stick is needed:
+
+    python3 scripts/benchmark_usb_stick.py [circles] [latency] [loss]
+
+The simulated stick answers on a pseudo-terminal with a Circle+ and the
+given number of Circles, the node responses are delayed by the latency (in
+seconds) and lost with the given probability. Measured are the discovery
+of the network, the requests answered per second while the update loop
+polls, and the time a relay command takes to reach the stick meanwhile.
+'library' sends as the library does, 'scheduled' sends through the command
+scheduler of the integration.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import statistics
+import sys
+import threading
+import time
+
+from plugwise.stick import Stick
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.scheduler import USBCommandScheduler  # noqa: E402
+
+# pylint: disable-next=wrong-import-position
+from tests.components.plugwise.stick_simulator import StickSimulator  # noqa: E402
+
+RELAY_REQUEST = b"0017"
+TOGGLES = 10
+UPDATE_INTERVAL = 2
+WINDOW = 10
+
+
+def run(circles: int, latency: float, loss: float, scheduled: bool) -> None:
+    """Run the scenario once, print the results."""
+    with StickSimulator(circles, latency=latency, loss=loss) as simulator:
+        stick = Stick(simulator.port)
+        stick.connect()
+        if scheduled:
+            controller = stick.msg_controller
+            scheduler = USBCommandScheduler(
+                controller.send, controller.connection.send, UPDATE_INTERVAL
+            )
+            controller.send = scheduler.send
+            controller.connection.send = scheduler.write
+        stick.initialize_stick()
+
+        scanned = threading.Event()
+        start = time.perf_counter()
+        stick.initialize_circle_plus()
+        stick.scan(scanned.set)
+        scanned.wait(10 + circles * 5)
+        discovery = time.perf_counter() - start
+
+        stick.auto_update(UPDATE_INTERVAL)
+        answered = sum(simulator.received.values())
+        start = time.perf_counter()
+        time.sleep(WINDOW)
+        throughput = (sum(simulator.received.values()) - answered) / (
+            time.perf_counter() - start
+        )
+
+        circle = next(
+            node
+            for mac, node in stick.devices.items()
+            if node is not None and mac != stick.circle_plus_mac
+        )
+        latencies: list[float] = []
+        for _ in range(TOGGLES):
+            sent = len(simulator.received_at.get(RELAY_REQUEST, []))
+            start = time.monotonic()
+            circle.relay_state = not circle.relay_state
+            while len(simulator.received_at.get(RELAY_REQUEST, [])) == sent:
+                if time.monotonic() - start > 30:
+                    break
+                time.sleep(0.005)
+            else:
+                latencies.append(simulator.received_at[RELAY_REQUEST][-1] - start)
+            time.sleep(0.5)
+        stick.disconnect()
+
+    print(f"  {'scheduled' if scheduled else 'library'}")
+    print(f"    discovery  : {discovery:8.1f} s ({len(stick.devices)} nodes)")
+    print(f"    throughput : {throughput:8.1f} requests/s")
+    if latencies:
+        print(
+            f"    relay      : {statistics.mean(latencies) * 1000:8.1f} ms mean, "
+            f"{max(latencies) * 1000:.1f} ms max ({len(latencies)}/{TOGGLES})"
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    circles = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    loss = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    print(f"{circles} Circles, {latency * 1000:.0f} ms latency, {loss:.0%} loss")
+    run(circles, latency, loss, False)
+    run(circles, latency, loss, True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Measure the reads of the state of the USB sensors.
+
+Run from the repository root inside an environment having Home Assistant
+installed (i.e. the venv created by core-testing.sh):
+
+    python3 scripts/benchmark_usb_values.py [circles] [reads]
+
+A USBSensor is created for every Circle sensor of a simulated network.
+'getattr' reads the node through the described method and rounds the value
+on every access, as done before the values were cached. 'cached' reads the
+value snapshotted on the last node callback.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.const import STICK  # noqa: E402
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.models import PW_SENSOR_TYPES  # noqa: E402
+
+# pylint: disable-next=wrong-import-position
+from custom_components.plugwise.sensor import USBSensor  # noqa: E402
+
+DESCRIPTIONS = [
+    description
+    for description in PW_SENSOR_TYPES
+    if description.plugwise_api == STICK and description.state_request_method
+]
+
+
+class FakeNode:
+    """A Circle answering every described state with a random value."""
+
+    def __init__(self, mac: str) -> None:
+        """Initialize the node."""
+        self.available = True
+        self.features = tuple(description.key for description in DESCRIPTIONS)
+        self.firmware_version = "2011-06-27T10:47:37+00:00"
+        self.hardware_model = "Circle"
+        self.mac = mac
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a random state."""
+        return random.uniform(0, 3000)
+
+
+def getattr_read(entity: USBSensor) -> float | None:
+    """Return the value as read before the values were cached."""
+    # pylint: disable-next=protected-access
+    value = getattr(entity._node, entity.entity_description.state_request_method)
+    if value is not None:
+        return float(round(value, 3))
+    return None
+
+
+def main() -> None:
+    """Run the benchmark."""
+    circles = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    entities = [
+        USBSensor(FakeNode(f"000D6F00{circle:08X}"), description)
+        for circle in range(circles)
+        for description in DESCRIPTIONS
+    ]
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        for entity in entities:
+            getattr_read(entity)
+    uncached = time.perf_counter()
+    for _ in range(reads):
+        for entity in entities:
+            entity.native_value  # pylint: disable=pointless-statement
+    cached = time.perf_counter()
+
+    total = len(entities) * reads
+    print(f"{len(entities)} sensors, {total} reads")
+    print(f"  getattr : {(uncached - start) / total * 1e9:8.1f} ns/read")
+    print(f"  cached  : {(cached - uncached) / total * 1e9:8.1f} ns/read")
+
+
+if __name__ == "__main__":
+    main()
@@ -95,6 +95,7 @@ def mock_smile_adam() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -122,6 +123,7 @@ def mock_smile_adam_2() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -149,6 +151,7 @@ def mock_smile_adam_3() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -175,6 +178,7 @@ def mock_smile_anna() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -201,6 +205,7 @@ def mock_smile_anna_2() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -227,6 +232,7 @@ def mock_smile_anna_3() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -251,6 +257,7 @@ def mock_smile_p1() -> Generator[None, MagicMock, None]:
 
         smile.notifications = _read_json(chosen_env, "notifications")
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
@@ -273,10 +280,19 @@ def mock_stretch() -> Generator[None, MagicMock, None]:
 
         smile.connect.return_value = True
         smile.async_update.return_value = _read_json(chosen_env, "all_data")
+        smile.gw_data, smile.gw_devices = _read_json(chosen_env, "all_data")
 
         yield smile
 
 
+@pytest.fixture
+def mock_stick() -> Generator[MagicMock, None, None]:
+    """Return a mocked library Stick."""
+    stick = MagicMock(mac="000D6F0099999999", devices={})
+    with patch("homeassistant.components.plugwise.usb.Stick", return_value=stick):
+        yield stick
+
+
 @pytest.fixture
 async def init_integration(
     hass: HomeAssistant, mock_config_entry: MockConfigEntry
@@ -0,0 +1,340 @@
+"""Simulate a Plugwise USB-stick and its network on a pseudo-terminal.
+
+The simulator answers on the slave side of a pty the way a stick does: an
+acknowledge with a sequence id for every request, then the response of the
+node with the same sequence id. The network holds a Circle+, Circles and
+Scans. Scans only answer shortly after announcing they are awake. The
+latency of the responses and the loss of node responses can be set, a
+lost response is followed by the timeout acknowledge of the stick.
+
+Only the standard library is used, the simulator serves the tests of the
+asyncio transport as well as the benchmarks of the library Stick.
+"""
+from __future__ import annotations
+
+from binascii import crc_hqx
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import heapq
+import os
+import random
+import select
+import struct
+import threading
+import time
+import tty
+
+HEADER = b"\x05\x05\x03\x03"
+FOOTER = b"\r\n"
+ACK_SUCCESS = b"00C1"
+ACK_TIMEOUT = b"00E1"
+RELAY_SWITCHED_OFF = b"00DE"
+RELAY_SWITCHED_ON = b"00D8"
+LOGADDR_OFFSET = 278528
+PULSES_PER_WATT = 0.4689385193
+NO_NODE = b"FFFFFFFFFFFFFFFF"
+
+NODE_TYPE_CIRCLE_PLUS = 1
+NODE_TYPE_CIRCLE = 2
+NODE_TYPE_SCAN = 6
+HW_VERSIONS = {
+    NODE_TYPE_CIRCLE_PLUS: b"000000070073",
+    NODE_TYPE_CIRCLE: b"000000070140",
+    NODE_TYPE_SCAN: b"000000080007",
+}
+# Requests without the MAC of a node
+NO_MAC_REQUESTS = (b"000A", b"0008")
+
+
+def _frame(body: bytes) -> bytes:
+    """Return the framed message."""
+    return HEADER + body + b"%04X" % crc_hqx(body, 0) + FOOTER
+
+
+def _log_date(stamp: datetime) -> bytes:
+    """Return a timestamp as logged by the nodes."""
+    month = stamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    minutes = int((stamp - month).total_seconds() // 60)
+    return b"%02X%02X%04X" % (stamp.year - 2000, stamp.month, minutes)
+
+
+@dataclass
+class SimulatedNode:
+    """A node of the simulated network."""
+
+    mac: bytes
+    node_type: int
+    address: int
+    watts: float = 0.0
+    relay: bool = True
+    awake_until: float = 0.0
+    last_log_address: int = 20
+
+    @property
+    def sleeping(self) -> bool:
+        """Return True when a battery powered node does not listen."""
+        return self.node_type == NODE_TYPE_SCAN and time.monotonic() > self.awake_until
+
+
+@dataclass(order=True)
+class _Scheduled:
+    """A message written at its due time."""
+
+    due: float
+    order: int
+    data: bytes = field(compare=False)
+
+
+class StickSimulator:
+    """A USB-stick with a Circle+, Circles and Scans behind a pty.
+
+    Use it as context manager, the port to open is `port`.
+    """
+
+    def __init__(
+        self,
+        circles: int = 2,
+        scans: int = 0,
+        latency: float = 0.0,
+        loss: float = 0.0,
+        timeout: float = 0.5,
+        awake_interval: float = 5.0,
+        network_online: bool = True,
+        seed: int | None = 0,
+    ) -> None:
+        """Initialize the simulator."""
+        self.latency = latency
+        self.loss = loss
+        self.timeout = timeout
+        self.awake_interval = awake_interval
+        self.network_online = network_online
+        self.stick_mac = b"000D6F0099999999"
+        self.nodes: dict[bytes, SimulatedNode] = {}
+        self.received: Counter[bytes] = Counter()
+        self.received_at: dict[bytes, list[float]] = {}
+        self.lost = 0
+        self._random = random.Random(seed)
+        node_types = (
+            [NODE_TYPE_CIRCLE_PLUS]
+            + [NODE_TYPE_CIRCLE] * circles
+            + [NODE_TYPE_SCAN] * scans
+        )
+        for address, node_type in enumerate(node_types):
+            mac = b"000D6F%010X" % (address + 1)
+            self.nodes[mac] = SimulatedNode(
+                mac, node_type, address, self._random.uniform(0, 2000)
+            )
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._buffer = b""
+        self._seq_id = 0
+        self._queue: list[_Scheduled] = []
+        self._order = 0
+        self._next_awake = time.monotonic()
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def circle_plus(self) -> SimulatedNode:
+        """Return the Circle+."""
+        return next(iter(self.nodes.values()))
+
+    def __enter__(self) -> StickSimulator:
+        """Start the simulator."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop the simulator."""
+        self.stop()
+
+    def start(self) -> None:
+        """Start answering on the pty."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="stick_simulator")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop answering and close the pty."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _run(self) -> None:
+        """Read the requests, write the scheduled messages when due."""
+        while self._running:
+            now = time.monotonic()
+            self._announce_awake(now)
+            while self._queue and self._queue[0].due <= now:
+                os.write(self._master, heapq.heappop(self._queue).data)
+            wait = min(
+                (self._queue[0].due - now) if self._queue else 0.05,
+                max(self._next_awake - now, 0),
+                0.05,
+            )
+            readable, _, _ = select.select([self._master], [], [], max(wait, 0))
+            if readable:
+                self._buffer += os.read(self._master, 4096)
+                self._process_buffer()
+
+    def _schedule(self, delay: float, data: bytes) -> None:
+        """Write a message after the delay."""
+        self._order += 1
+        heapq.heappush(
+            self._queue, _Scheduled(time.monotonic() + delay, self._order, data)
+        )
+
+    def _announce_awake(self, now: float) -> None:
+        """Let the Scans announce they are awake."""
+        if now < self._next_awake:
+            return
+        self._next_awake = now + self.awake_interval
+        for node in self.nodes.values():
+            if node.node_type == NODE_TYPE_SCAN:
+                node.awake_until = now + min(self.awake_interval / 2, 2.0)
+                self._schedule(0, _frame(b"004FFFFE" + node.mac + b"00"))
+
+    def _process_buffer(self) -> None:
+        """Answer the complete requests received."""
+        while (start := self._buffer.find(HEADER)) != -1 and (
+            end := self._buffer.find(FOOTER, start)
+        ) != -1:
+            request = self._buffer[start + len(HEADER) : end - 4]
+            self._buffer = self._buffer[end + len(FOOTER) :]
+            self._answer(request)
+
+    def _answer(self, request: bytes) -> None:
+        """Acknowledge a request, schedule the response of the node."""
+        msg_id = request[:4]
+        self.received[msg_id] += 1
+        self.received_at.setdefault(msg_id, []).append(time.monotonic())
+        seq_id = b"%04X" % self._seq_id
+        self._seq_id = (self._seq_id + 1) % 0xFFFC
+        self._schedule(0, _frame(b"0000" + seq_id + ACK_SUCCESS))
+
+        if msg_id in NO_MAC_REQUESTS:
+            node, args = None, request[4:]
+        else:
+            node, args = self.nodes.get(request[4:20]), request[20:]
+            if node is None:
+                self._schedule(self.timeout, _frame(b"0000" + seq_id + ACK_TIMEOUT))
+                return
+
+        if (node is not None and node.sleeping) or self._random.random() < self.loss:
+            self.lost += 1
+            self._schedule(self.timeout, _frame(b"0000" + seq_id + ACK_TIMEOUT))
+            return
+        if (response := self._response(msg_id, node, args)) is not None:
+            self._schedule(self.latency, _frame(response[:4] + seq_id + response[4:]))
+
+    def _response(
+        self, msg_id: bytes, node: SimulatedNode | None, args: bytes
+    ) -> bytes | None:
+        """Return the response without sequence id, None when only acked."""
+        now = datetime.utcnow()
+        if msg_id == b"000A":  # StickInitRequest
+            return (
+                b"0011"
+                + self.stick_mac
+                + b"00"
+                + (b"01" if self.network_online else b"00")
+                + self.circle_plus.mac
+                + b"1234FF"
+            )
+        if node is None:
+            return None
+        if msg_id == b"0023":  # NodeInfoRequest
+            return (
+                b"0024"
+                + node.mac
+                + _log_date(now)
+                + b"%08X" % (node.last_log_address * 32 + LOGADDR_OFFSET)
+                + (b"01" if node.relay else b"00")
+                + b"85"
+                + HW_VERSIONS[node.node_type]
+                + b"4E0843A9"
+                + b"%02X" % node.node_type
+            )
+        if msg_id == b"0018":  # CirclePlusScanRequest
+            address = int(args[:2], 16)
+            linked = [
+                linked
+                for linked in self.nodes.values()
+                if linked.address == address + 1
+            ]
+            return (
+                b"0019"
+                + node.mac
+                + (linked[0].mac if linked else NO_NODE)
+                + b"%02X" % address
+            )
+        if msg_id == b"0026":  # CircleCalibrationRequest
+            return (
+                b"0027"
+                + node.mac
+                + struct.pack("!f", 1.0).hex().upper().encode()
+                + b"00000000" * 3
+            )
+        if msg_id == b"0029":  # CirclePlusRealTimeClockGetRequest
+            return (
+                b"003A"
+                + node.mac
+                + now.strftime("%S%M%H").encode()
+                + b"%02d" % now.isoweekday()
+                + now.strftime("%d%m%y").encode()
+            )
+        if msg_id == b"003E":  # CircleClockGetRequest
+            return (
+                b"003F"
+                + node.mac
+                + b"%02X%02X%02X" % (now.hour, now.minute, now.second)
+                + b"%02X" % now.isoweekday()
+                + b"00"
+                + b"0000"
+            )
+        if msg_id == b"000D":  # NodePingRequest
+            return (
+                b"000E"
+                + node.mac
+                # RSSI in and out, signed bytes
+                + b"%02X%02X"
+                % (
+                    self._random.randint(-90, -40) & 0xFF,
+                    self._random.randint(-90, -40) & 0xFF,
+                )
+                + b"%04X" % int(self.latency * 1000)
+            )
+        if msg_id == b"0012":  # CirclePowerUsageRequest
+            node.watts = max(node.watts + self._random.uniform(-50, 50), 0)
+            pulses = int(node.watts * PULSES_PER_WATT) if node.relay else 0
+            return (
+                b"0013"
+                + node.mac
+                + b"%04X%04X" % (pulses, pulses * 8)
+                + b"%08X" % (pulses * 1800)
+                + b"00000000"
+                + b"0000"
+            )
+        if msg_id == b"0048":  # CircleEnergyCountersRequest
+            address = (int(args[:8], 16) - LOGADDR_OFFSET) // 32
+            hour = now.replace(minute=0, second=0, microsecond=0)
+            first = hour - timedelta(hours=(node.last_log_address - address) * 4 + 3)
+            logs = b"".join(
+                _log_date(first + timedelta(hours=slot))
+                + b"%08X" % int(node.watts * PULSES_PER_WATT * 3600)
+                for slot in range(4)
+            )
+            return b"0049" + node.mac + logs + args[:8]
+        if msg_id == b"0017":  # CircleSwitchRelayRequest
+            node.relay = args[:2] == b"01"
+            return (
+                b"0000"
+                + (RELAY_SWITCHED_ON if node.relay else RELAY_SWITCHED_OFF)
+                + node.mac
+            )
+        return None
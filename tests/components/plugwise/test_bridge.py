@@ -0,0 +1,91 @@
+"""Tests for the Plugwise USB update bridge."""
+import asyncio
+from threading import Thread
+from unittest.mock import MagicMock
+
+from homeassistant.components.plugwise.bridge import USBNodeBatch, USBUpdateBridge
+from homeassistant.core import HomeAssistant
+
+
+async def test_bridge_collapses_updates(hass: HomeAssistant) -> None:
+    """Test the callbacks of the stick threads are written once per drain."""
+    bridge = USBUpdateBridge(hass, 0.01)
+    entities = [MagicMock(hass=hass) for _ in range(3)]
+
+    def flood() -> None:
+        for _ in range(100):
+            for entity in entities:
+                bridge.queue(entity)
+
+    thread = Thread(target=flood)
+    thread.start()
+    await hass.async_add_executor_job(thread.join)
+    await asyncio.sleep(0.05)
+
+    assert bridge.drains == 1
+    for entity in entities:
+        entity.async_write_ha_state.assert_called_once()
+    assert bridge.received == 300
+    assert bridge.collapsed == 297
+    assert bridge.written == 3
+    assert bridge.as_dict()["pending"] == 0
+
+
+async def test_bridge_drops_removed_entities(hass: HomeAssistant) -> None:
+    """Test the entities removed before the drain are not written."""
+    bridge = USBUpdateBridge(hass, 10)
+    removed = MagicMock(hass=None)
+    bridge.queue(removed)
+    await hass.async_block_till_done()
+    bridge._async_drain()
+    removed.async_write_ha_state.assert_not_called()
+    assert bridge.dropped == 1
+
+    bridge.queue(MagicMock(hass=hass))
+    await hass.async_block_till_done()
+    bridge.async_shutdown()
+    assert bridge.dropped == 2
+    assert bridge.drains == 1
+
+
+def _create(node: MagicMock) -> list[MagicMock]:
+    """Create an entity of a node."""
+    return [MagicMock(unique_id=f"{node.mac}-power", node=node)]
+
+
+async def test_node_batch(hass: HomeAssistant) -> None:
+    """Test the nodes are added in one call, the discovered ones in batches."""
+    nodes = {"mac1": MagicMock(mac="mac1"), "mac2": MagicMock(mac="mac2")}
+    add_entities = MagicMock()
+    batch = USBNodeBatch(hass, 0.01, nodes, _create, add_entities)
+
+    batch.async_add(list(nodes))
+    entities = add_entities.call_args[0][0]
+    assert [entity.unique_id for entity in entities] == ["mac1-power", "mac2-power"]
+
+    def discover() -> None:
+        for mac in ("mac2", "mac3", "mac4", "mac3"):
+            nodes[mac] = MagicMock(mac=mac)
+            batch.node_discovered(mac)
+
+    await hass.async_add_executor_job(discover)
+    await asyncio.sleep(0.05)
+    assert add_entities.call_count == 2
+    entities = add_entities.call_args[0][0]
+    assert [entity.unique_id for entity in entities] == ["mac3-power", "mac4-power"]
+
+
+async def test_node_batch_placeholders(hass: HomeAssistant) -> None:
+    """Test a placeholder continues with the node once it answered."""
+    nodes: dict[str, MagicMock] = {}
+    add_entities = MagicMock()
+    batch = USBNodeBatch(hass, 0.01, nodes, _create, add_entities)
+
+    batch.async_add([], [MagicMock(mac="mac1")])
+    placeholder = add_entities.call_args[0][0][0]
+    assert placeholder.unique_id == "mac1-power"
+
+    nodes["mac1"] = MagicMock(mac="mac1")
+    batch.async_add(["mac1"])
+    placeholder.async_set_node.assert_called_once_with(nodes["mac1"])
+    assert add_entities.call_count == 1
@@ -1,5 +1,6 @@
 """Tests for the Plugwise Climate integration."""
 
+from copy import deepcopy
 from unittest.mock import MagicMock
 
 from plugwise.exceptions import PlugwiseException
@@ -11,10 +12,11 @@ from homeassistant.components.climate.const import (
     HVAC_MODE_HEAT,
     HVAC_MODE_HEAT_COOL,
 )
+from homeassistant.components.plugwise.const import COORDINATOR, DOMAIN
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_capture_events
 
 TEST_HOST = "1.1.1.1"
 TEST_PASSWORD = "test_password"
@@ -114,6 +116,39 @@ async def test_adam_climate_adjust_negative_testing(
         )
 
 
+async def test_adam_set_zones(
+    hass: HomeAssistant, mock_smile_adam: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test a batch of zone changes, with a single refresh and a result per zone."""
+    events = async_capture_events(hass, "plugwise_set_zones")
+    await hass.services.async_call(
+        "plugwise",
+        "set_zones",
+        {
+            "zones": [
+                {"entity_id": "climate.zone_lisa_wk", "preset_mode": "away"},
+                {"entity_id": "climate.zone_thermostat_jessie", "temperature": 18},
+                {"entity_id": "climate.zone_thermostat_jessie", "temperature": 150},
+                {"entity_id": "climate.unknown", "preset_mode": "away"},
+            ]
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    mock_smile_adam.set_preset.assert_called_once_with(
+        "c50f167537524366a5af7aa3942feb1e", "away"
+    )
+    assert mock_smile_adam.set_temperature.call_count == 1
+    assert len(events) == 1
+    assert [zone["success"] for zone in events[0].data["zones"]] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+
+
 async def test_adam_climate_entity_climate_changes(
     hass: HomeAssistant, mock_smile_adam: MagicMock, init_integration: MockConfigEntry
 ) -> None:
@@ -212,6 +247,25 @@ async def test_anna_climate_entity_attributes(
     assert state.attributes["target_temp_step"] == 0.1
 
 
+async def test_anna_climate_follows_heater(
+    hass: HomeAssistant, mock_smile_anna: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test the hvac_action follows a change of the heater data only."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    gateway, devices = deepcopy(mock_smile_anna.async_update.return_value)
+    devices[gateway["heater_id"]]["binary_sensors"]["heating_state"] = False
+    mock_smile_anna.async_update.return_value = [gateway, devices]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.fan_out["devices_changed"] == 2
+    state = hass.states.get("climate.anna")
+    assert state.attributes["hvac_action"] == "idle"
+
+
 async def test_anna_2_climate_entity_attributes(
     hass: HomeAssistant,
     mock_smile_anna_2: MagicMock,
@@ -19,9 +19,13 @@ from homeassistant.components.plugwise.config_flow import CONF_MANUAL_PATH
 from homeassistant.components import zeroconf
 from homeassistant.components.plugwise.const import (
     API,
+    CONF_HISTORY_WINDOW,
     CONF_HOMEKIT_EMULATION,
+    CONF_POLLING_TIERS,
     CONF_REFRESH_INTERVAL,
+    CONF_USB_LINK_SENSORS,
     CONF_USB_PATH,
+    CONF_USB_UPDATE_INTERVAL,
     DEFAULT_PORT,
     DOMAIN,
     FLOW_NET,
@@ -505,16 +509,19 @@ async def test_options_flow_thermo(hass, mock_smile_anna_2) -> None:
 
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["data"] == {
+            CONF_HISTORY_WINDOW: 15,
             CONF_HOMEKIT_EMULATION: False,
+            CONF_POLLING_TIERS: False,
             CONF_REFRESH_INTERVAL: 3.0,
             CONF_SCAN_INTERVAL: 60,
         }
 
 
 @patch("serial.tools.list_ports.comports", MagicMock(return_value=[com_port()]))
-@patch("plugwise.Stick.connect", MagicMock(return_value=None))
-@patch("plugwise.Stick.initialize_stick", MagicMock(return_value=None))
-@patch("plugwise.Stick.disconnect", MagicMock(return_value=None))
+@patch(
+    "homeassistant.components.plugwise.transport.async_init_stick",
+    AsyncMock(return_value="01:23:45:67:AB"),
+)
 async def test_user_flow_select(hass):
     """Test user flow when USB-stick is selected from list."""
     port = com_port()
@@ -528,6 +535,8 @@ async def test_user_flow_select(hass):
     )
     assert result["type"] == FlowResultType.CREATE_ENTRY
     assert result["data"] == {PW_TYPE: STICK, CONF_USB_PATH: TEST_USBPORT}
+    # The link sensors per node are off for a new stick
+    assert result["options"] == {CONF_USB_LINK_SENSORS: False}
 
     # Retry to ensure configuring the same port is not allowed
     result = await hass.config_entries.flow.async_init(
@@ -564,13 +573,9 @@ async def test_user_flow_manual(hass):
     )
 
     with patch(
-        "homeassistant.components.plugwise.config_flow.Stick",
-    ) as usb_mock:
-        usb_mock.return_value.connect = MagicMock(return_value=True)
-        usb_mock.return_value.initialize_stick = MagicMock(return_value=True)
-        usb_mock.return_value.disconnect = MagicMock(return_value=True)
-        usb_mock.return_value.mac = "01:23:45:67:AB"
-
+        "homeassistant.components.plugwise.transport.async_init_stick",
+        return_value="01:23:45:67:AB",
+    ):
         result = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             user_input={CONF_USB_PATH: TEST_USBPORT2},
@@ -621,8 +626,10 @@ async def test_empty_connection(hass):
     assert result["errors"] == {}
 
 
-@patch("plugwise.Stick.connect", MagicMock(return_value=None))
-@patch("plugwise.Stick.initialize_stick", MagicMock(side_effect=(StickInitError)))
+@patch(
+    "homeassistant.components.plugwise.transport.async_init_stick",
+    AsyncMock(side_effect=StickInitError),
+)
 async def test_failed_initialization(hass):
     """Test we handle failed initialization of Plugwise USB-stick."""
     result = await hass.config_entries.flow.async_init(
@@ -642,8 +649,10 @@ async def test_failed_initialization(hass):
     assert result["errors"] == {"base": "stick_init"}
 
 
-@patch("plugwise.Stick.connect", MagicMock(return_value=None))
-@patch("plugwise.Stick.initialize_stick", MagicMock(side_effect=(NetworkDown)))
+@patch(
+    "homeassistant.components.plugwise.transport.async_init_stick",
+    AsyncMock(side_effect=NetworkDown),
+)
 async def test_network_down_exception(hass):
     """Test we handle network_down exception."""
     result = await hass.config_entries.flow.async_init(
@@ -663,8 +672,10 @@ async def test_network_down_exception(hass):
     assert result["errors"] == {"base": "network_down"}
 
 
-@patch("plugwise.Stick.connect", MagicMock(return_value=None))
-@patch("plugwise.Stick.initialize_stick", MagicMock(side_effect=(TimeoutException)))
+@patch(
+    "homeassistant.components.plugwise.transport.async_init_stick",
+    AsyncMock(side_effect=TimeoutException),
+)
 async def test_timeout_exception(hass):
     """Test we handle time exception."""
     result = await hass.config_entries.flow.async_init(
@@ -730,3 +741,34 @@ async def test_options_flow_stick_with_input(hass) -> None:
 
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["title"] == ""
+
+
+async def test_options_flow_stick_update_interval(hass) -> None:
+    """Test config flow options for the USB-stick update interval and sensors."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=CONF_NAME,
+        data={FLOW_TYPE: FLOW_USB, CONF_USB_PATH: TEST_USBPORT},
+    )
+    hass.data[DOMAIN] = {entry.entry_id: {"api_stick": MagicMock()}}
+    entry.add_to_hass(hass)
+
+    with patch(
+        "homeassistant.components.plugwise.async_setup_entry", return_value=True
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "usb"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_USB_UPDATE_INTERVAL: 0.5, CONF_USB_LINK_SENSORS: True},
+        )
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        assert result["data"] == {
+            CONF_USB_UPDATE_INTERVAL: 0.5,
+            CONF_USB_LINK_SENSORS: True,
+        }
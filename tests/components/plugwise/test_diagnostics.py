@@ -16,9 +16,20 @@ async def test_diagnostics(
     init_integration: MockConfigEntry,
 ) -> None:
     """Test diagnostics."""
-    assert await get_diagnostics_for_config_entry(
+    diagnostics = await get_diagnostics_for_config_entry(
         hass, hass_client, init_integration
-    ) == {
+    )
+    history = diagnostics.pop("history")
+    fan_out = diagnostics.pop("fan_out")
+    assert fan_out["listeners"] == fan_out["notified"]
+    assert history["fe799307f1624099878210aa0b9f1475-outdoor_temperature"] == {
+        "samples": 1,
+        "capacity": 16,
+        "bytes": history["fe799307f1624099878210aa0b9f1475-outdoor_temperature"][
+            "bytes"
+        ],
+    }
+    assert diagnostics == {
         "gateway": {
             "smile_name": "Adam",
             "gateway_id": "fe799307f1624099878210aa0b9f1475",
@@ -0,0 +1,152 @@
+"""Tests for the Plugwise import of the Circle energy logs."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from plugwise.exceptions import PortError
+from plugwise.messages.requests import NodeInfoRequest, NodeRequest
+from plugwise.messages.responses import CircleEnergyCountersResponse, NodeInfoResponse
+
+from homeassistant.components.plugwise.energy_log import (
+    USBEnergyLogImport,
+    energy_log_rows,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+UNTIL = datetime(2022, 7, 1, 10, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+LAST_ADDRESS = 40
+MAC = "000D6F0000000002"
+MAC_2 = "000D6F0000000003"
+MAC_3 = "000D6F0000000004"
+
+
+def test_energy_log_rows() -> None:
+    """Test the logs become hourly rows continuing the sum."""
+    logs = [(UNTIL - HOUR * hours, 0.1 * hours) for hours in (2, 0, 1)]
+    rows = energy_log_rows(logs, UNTIL - HOUR * 3, UNTIL, 5.0)
+    assert [row["start"] for row in rows] == [
+        UNTIL - HOUR * 3,
+        UNTIL - HOUR * 2,
+        UNTIL - HOUR,
+    ]
+    assert [round(row["sum"], 3) for row in rows] == [5.2, 5.3, 5.3]
+    assert [row["state"] for row in rows] == [row["sum"] for row in rows]
+
+
+def test_energy_log_rows_window() -> None:
+    """Test the hours stored already and the running hour are left out."""
+    logs = [(UNTIL - HOUR * hours, 1.0) for hours in range(-1, 6)]
+    rows = energy_log_rows(logs, UNTIL - HOUR * 2, UNTIL, 0.0)
+    assert [row["start"] for row in rows] == [UNTIL - HOUR * 2, UNTIL - HOUR]
+    assert rows[-1]["sum"] == 2.0
+
+
+def test_energy_log_rows_unlogged_hours() -> None:
+    """Test the hours not logged are skipped."""
+    logs = [(UNTIL, 1.0), (UNTIL - HOUR * 4, 1.0)]
+    rows = energy_log_rows(logs, UNTIL - HOUR * 6, UNTIL, 0.0)
+    assert [row["start"] for row in rows] == [UNTIL - HOUR * 5, UNTIL - HOUR]
+    assert [row["sum"] for row in rows] == [1.0, 2.0]
+
+
+def _answer(
+    energy_log: USBEnergyLogImport, until: datetime, skip: int | None = None
+) -> MagicMock:
+    """Return a send answering as a Circle logging 100 pulses an hour."""
+
+    def send(request: NodeRequest) -> None:
+        """Pass the response of the request, as the stick threads do."""
+        if isinstance(request, NodeInfoRequest):
+            response = NodeInfoResponse()
+            response.last_logaddr.value = LAST_ADDRESS
+        else:
+            if (address := request.args[0].value) == skip:
+                return
+            response = CircleEnergyCountersResponse()
+            response.logaddr.value = address
+            for slot in range(1, 5):
+                hours = (LAST_ADDRESS - address) * 4 + 4 - slot
+                logged = until.replace(tzinfo=None) - HOUR * hours
+                getattr(response, f"logdate{slot}").value = logged
+                getattr(response, f"pulses{slot}").value = 100
+        response.mac = request.mac
+        energy_log.message_received(response)
+
+    return MagicMock(side_effect=send)
+
+
+async def test_import_node(hass: HomeAssistant) -> None:
+    """Test the logs of the backfill period are read and written at once."""
+    node = MagicMock(hardware_model="Circle")
+    node.pulses_to_kws.side_effect = lambda pulses, seconds: pulses / 1000
+    energy_log = USBEnergyLogImport(hass, {MAC: node}, MagicMock(), HOUR * 6)
+    until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    energy_log._send = send = _answer(energy_log, until)
+
+    with patch(
+        "homeassistant.components.plugwise.energy_log.get_instance"
+    ) as get_instance, patch(
+        "homeassistant.components.plugwise.energy_log.async_add_external_statistics"
+    ) as add_statistics:
+        get_instance.return_value.async_add_executor_job = AsyncMock(return_value={})
+        await energy_log._async_import_node(MAC, node)
+
+    # The info, then the addresses covering 6 hours and the unaligned slots
+    assert send.call_count == 4
+    rows = add_statistics.call_args[0][2]
+    assert [row["start"] for row in rows] == [
+        until - HOUR * hours for hours in range(6, 0, -1)
+    ]
+    assert round(rows[-1]["sum"], 3) == 0.6
+    assert energy_log.imported == 6
+
+
+async def test_import_node_missing_log(hass: HomeAssistant) -> None:
+    """Test only the hours before a log not answered are written."""
+    node = MagicMock(hardware_model="Circle")
+    node.pulses_to_kws.side_effect = lambda pulses, seconds: pulses / 1000
+    energy_log = USBEnergyLogImport(hass, {MAC: node}, MagicMock(), HOUR * 6)
+    until = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    energy_log._send = _answer(energy_log, until, LAST_ADDRESS)
+
+    with patch(
+        "homeassistant.components.plugwise.energy_log.get_instance"
+    ) as get_instance, patch(
+        "homeassistant.components.plugwise.energy_log.async_add_external_statistics"
+    ) as add_statistics, patch(
+        "homeassistant.components.plugwise.energy_log.FETCH_TIMEOUT", 0.01
+    ):
+        get_instance.return_value.async_add_executor_job = AsyncMock(return_value={})
+        await energy_log._async_import_node(MAC, node)
+
+    rows = add_statistics.call_args[0][2]
+    assert [row["start"] for row in rows] == [until - HOUR * 6, until - HOUR * 5]
+    assert energy_log.failed == 1
+
+
+async def test_import_continues_after_failure(hass: HomeAssistant) -> None:
+    """Test a Circle failing does not stop the import of the others."""
+    nodes = {
+        mac: MagicMock(measures_power=True, available=True)
+        for mac in (MAC, MAC_2, MAC_3)
+    }
+    energy_log = USBEnergyLogImport(hass, nodes, MagicMock(), HOUR * 6)
+
+    with patch.object(
+        energy_log,
+        "_async_import_node",
+        AsyncMock(side_effect=[PortError("Stick gone"), HomeAssistantError, None]),
+    ) as import_node:
+        await energy_log.async_import()
+
+    assert [call.args[0] for call in import_node.call_args_list] == [
+        MAC,
+        MAC_2,
+        MAC_3,
+    ]
+    assert energy_log.failed == 2
+    assert energy_log.last_import is not None
@@ -0,0 +1,80 @@
+"""Tests for the Plugwise USB network health."""
+from unittest.mock import MagicMock
+
+from plugwise.messages.responses import NodePingResponse
+
+from homeassistant.components.plugwise.const import (
+    USB_NETWORK_DEGRADED_LINKS,
+    USB_NETWORK_PING_MEDIAN,
+    USB_NETWORK_PING_P95,
+    USB_NETWORK_RSSI_WORST,
+)
+from homeassistant.components.plugwise.health import (
+    LinkWindow,
+    USBNetworkHealth,
+    percentile,
+)
+from homeassistant.core import HomeAssistant
+
+GOOD = "000D6F0000000001"
+WEAK = "000D6F0000000002"
+
+
+def _ping(mac: str, rssi_in: int, rssi_out: int, ping: int) -> NodePingResponse:
+    """Return the ping response of a node."""
+    message = NodePingResponse()
+    message.mac = bytes(mac, "utf-8")
+    message.rssi_in.value = rssi_in
+    message.rssi_out.value = rssi_out
+    message.ping_ms.value = ping
+    return message
+
+
+def test_link_window() -> None:
+    """Test the window keeps the last pings in four bytes each."""
+    window = LinkWindow(3)
+    for ping in range(5):
+        window.append(-60 - ping, -200, 70000 if ping == 4 else ping)
+    assert len(window) == 3
+    assert sorted(window.rssi_in) == [-64, -63, -62]
+    assert set(window.rssi_out) == {-128}
+    assert sorted(window.ping) == [2, 3, 0xFFFF]
+    assert percentile(window.ping, 50) == 3
+    assert percentile(window.ping, 95) == 0xFFFF
+
+
+async def test_network_health(hass: HomeAssistant) -> None:
+    """Test the degraded links are detected and the network summarized."""
+    nodes = {
+        GOOD: MagicMock(hardware_model="Circle+", available=True),
+        WEAK: MagicMock(hardware_model="Circle", available=True),
+        "000D6F0000000003": None,
+    }
+    health = USBNetworkHealth(hass, nodes, -85, 500)
+    listener = MagicMock()
+    remove_listener = health.async_add_listener(listener)
+
+    for sample in range(10):
+        health.message_received(_ping(GOOD, -50, -55, 20))
+        health.message_received(_ping(WEAK, -70, -92 + sample, 40))
+    await hass.async_block_till_done()
+    assert health.link(GOOD)["degraded"] is False
+    assert health.link(WEAK)["degraded"] is True
+
+    health._async_publish()
+    listener.assert_called_once()
+    assert health.summary == {
+        USB_NETWORK_DEGRADED_LINKS: 1,
+        USB_NETWORK_RSSI_WORST: -91,
+        USB_NETWORK_PING_MEDIAN: 40,
+        USB_NETWORK_PING_P95: 40,
+    }
+
+    diagnostics = health.as_dict()
+    assert diagnostics["links"] == {"degraded": 1, "good": 1, "unknown": 1}
+    assert diagnostics["nodes"][WEAK]["model"] == "Circle"
+    assert diagnostics["nodes"][WEAK]["rssi_out_p50"] == -87
+
+    remove_listener()
+    health._async_publish()
+    listener.assert_called_once()
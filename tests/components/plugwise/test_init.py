@@ -1,5 +1,7 @@
 """Tests for the Plugwise Climate integration."""
 import asyncio
+from copy import deepcopy
+from datetime import timedelta
 import aiohttp
 
 from unittest.mock import MagicMock
@@ -13,18 +15,44 @@ from plugwise.exceptions import (
 )
 import pytest
 
-from homeassistant.components.plugwise.const import COORDINATOR, DOMAIN
+from homeassistant.components.plugwise.const import (
+    BRIDGE,
+    CONF_HOMEKIT_EMULATION,
+    CONF_POLLING_TIERS,
+    CONF_REFRESH_INTERVAL,
+    CONF_USB_PATH,
+    COORDINATOR,
+    DOMAIN,
+    HEALTH,
+    PLATFORMS,
+    PLATFORMS_USB,
+    POLLER,
+    PW_TYPE,
+    SCHEDULER,
+    SED_QUEUE,
+    SERVICE_GET_RECENT_HISTORY,
+    SERVICE_SET_SWITCHES,
+    SERVICE_SET_ZONES,
+    STICK,
+)
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, Platform
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_platform import async_get_platforms
 
 from tests.common import MockConfigEntry
+from tests.components.recorder.common import async_wait_recording_done
 
 HEATER_ID = "1cbf783bb11e4a7c8a6843dee3a86927"  # Opentherm device_id for migration
 PLUG_ID = "cd0ddb54ef694e11ac18ed1cbce5dbbd"  # VCR device_id for migration
+P1_ID = "e950c7d5e1ee407a858e2a8b5016c8b3"
+USB_PORT = "/dev/ttyUSB0"
 
 
 async def test_load_unload_config_entry(
@@ -39,14 +67,265 @@ async def test_load_unload_config_entry(
 
     assert mock_config_entry.state is ConfigEntryState.LOADED
     assert len(mock_smile_anna.connect.mock_calls) == 1
+    # The discovery output is the first data, no second update on start-up
+    assert len(mock_smile_anna.get_all_devices.mock_calls) == 1
+    assert not mock_smile_anna.async_update.mock_calls
+    assert hass.services.has_service(DOMAIN, SERVICE_GET_RECENT_HISTORY)
+    assert hass.services.has_service(DOMAIN, SERVICE_SET_SWITCHES)
+    assert hass.services.has_service(DOMAIN, SERVICE_SET_ZONES)
 
     await hass.config_entries.async_unload(mock_config_entry.entry_id)
     await hass.async_block_till_done()
 
     assert not hass.data.get(DOMAIN)
+    assert not hass.services.has_service(DOMAIN, SERVICE_GET_RECENT_HISTORY)
+    assert not hass.services.has_service(DOMAIN, SERVICE_SET_SWITCHES)
+    assert not hass.services.has_service(DOMAIN, SERVICE_SET_ZONES)
     assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
 
 
+async def test_forward_only_used_platforms(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_p1: MagicMock,
+) -> None:
+    """Test a power-only gateway only sets up the sensor platform."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    platforms = hass.data[DOMAIN][mock_config_entry.entry_id][PLATFORMS]
+    assert platforms == [Platform.SENSOR]
+    assert not hass.states.async_entity_ids(SWITCH_DOMAIN)
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_forward_new_platform_on_update(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_p1: MagicMock,
+) -> None:
+    """Test a platform is added when a new capability shows up."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    gateway, devices = mock_smile_p1.async_update.return_value
+    devices = dict(devices)
+    devices["0123456789abcdef0123456789abcdef"] = {
+        "dev_class": "vcr",
+        "name": "New Plug",
+        "location": gateway["gateway_id"],
+        "sensors": {"electricity_consumed": 1.0},
+        "switches": {"relay": True, "lock": False},
+    }
+    mock_smile_p1.async_update.return_value = [gateway, devices]
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    platforms = hass.data[DOMAIN][mock_config_entry.entry_id][PLATFORMS]
+    assert platforms == [Platform.SENSOR, Platform.SWITCH]
+    assert hass.states.get("switch.new_plug_relay")
+
+
+async def test_update_only_changed_devices(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_adam: MagicMock,
+) -> None:
+    """Test only the entities of devices with changed data are updated."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    gateway, devices = deepcopy(mock_smile_adam.async_update.return_value)
+    devices[PLUG_ID]["sensors"]["electricity_consumed"] = 123.4
+    mock_smile_adam.async_update.return_value = [gateway, devices]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.fan_out["devices_changed"] == 1
+    assert coordinator.fan_out["notified"] < coordinator.fan_out["listeners"]
+    state = hass.states.get("sensor.nas_electricity_consumed")
+    assert float(state.state) == 123.4
+
+
+async def test_statistics_with_recorder(
+    hass: HomeAssistant,
+    recorder_mock: MagicMock,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_p1: MagicMock,
+) -> None:
+    """Test the counter statistics are written when the recorder is loaded."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    statistic_id = f"{DOMAIN}:{P1_ID}_electricity_consumed_peak_cumulative"
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True
+    )
+    assert last[statistic_id][0]["state"] == 442.932
+
+    await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+async def test_polling_tiers(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_adam: MagicMock,
+) -> None:
+    """Test the fast tier only requests the appliances."""
+    entry = mock_config_entry
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options={CONF_POLLING_TIERS: True})
+    mock_smile_adam._smile_legacy = False
+    mock_smile_adam._get_device_data.return_value = {
+        "electricity_consumed": 55.5,
+        "relay": False,
+    }
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not mock_smile_adam.async_update.mock_calls
+    mock_smile_adam._request.assert_called_with("/core/appliances")
+    state = hass.states.get("sensor.nas_electricity_consumed")
+    assert float(state.state) == 55.5
+    assert hass.states.get("switch.nas_relay").state == "off"
+
+    # A command requests a full update
+    await coordinator.async_request_refresh()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(mock_smile_adam.async_update.mock_calls) == 1
+
+
+async def test_polling_tiers_cooling(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_adam_3: MagicMock,
+) -> None:
+    """Test the fast tier keeps the heater cooling, as the full update does."""
+    entry = mock_config_entry
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options={CONF_POLLING_TIERS: True})
+    mock_smile_adam_3._smile_legacy = False
+    # The appliances report heating, the cooling mode of the Adam turns it over
+    mock_smile_adam_3._get_device_data.return_value = {
+        "cooling_state": False,
+        "heating_state": True,
+    }
+
+    def update_for_cooling(devices: dict[str, dict]) -> None:
+        """Turn the heating of the heater over to cooling, as the library."""
+        for device in devices.values():
+            if device["dev_class"] == "heater_central":
+                binary_sensors = device["binary_sensors"]
+                if binary_sensors["heating_state"]:
+                    binary_sensors["cooling_state"] = True
+                    binary_sensors["heating_state"] = False
+
+    mock_smile_adam_3.update_for_cooling.side_effect = update_for_cooling
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not mock_smile_adam_3.async_update.mock_calls
+    refreshed = mock_smile_adam_3.update_for_cooling.call_args[0][0]
+    assert set(refreshed) == {
+        "056ee145a816487eaa69243c3280f8bf",
+        "e8ef2a01ed3b4139a53bf749204fe6b4",
+    }
+    assert hass.states.get("binary_sensor.opentherm_cooling").state == "on"
+    assert hass.states.get("binary_sensor.opentherm_heating").state == "off"
+    assert hass.states.get("climate.anna").attributes["hvac_action"] == "cooling"
+
+
+async def test_polling_tiers_fallback(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_adam: MagicMock,
+) -> None:
+    """Test every update is a full update without the Smile internals."""
+    entry = mock_config_entry
+    entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(entry, options={CONF_POLLING_TIERS: True})
+    mock_smile_adam._smile_legacy = False
+    del mock_smile_adam._get_device_data
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    assert not coordinator.supports_tiers
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(mock_smile_adam.async_update.mock_calls) == 1
+    assert not mock_smile_adam._request.mock_calls
+    assert entry.state is ConfigEntryState.LOADED
+
+
+async def test_options_applied_without_reload(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_smile_adam: MagicMock,
+) -> None:
+    """Test option changes are applied to the running coordinator."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR]
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert "off" not in hass.states.get("climate.zone_lisa_wk").attributes["hvac_modes"]
+
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        options={
+            CONF_HOMEKIT_EMULATION: True,
+            CONF_REFRESH_INTERVAL: 3.0,
+            CONF_SCAN_INTERVAL: 120,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert len(mock_smile_adam.connect.mock_calls) == 1
+    assert hass.data[DOMAIN][mock_config_entry.entry_id][COORDINATOR] is coordinator
+    assert coordinator.update_interval == timedelta(seconds=120)
+    assert coordinator._debounced_refresh.cooldown == 3.0
+    assert "off" in hass.states.get("climate.zone_lisa_wk").attributes["hvac_modes"]
+
+    # A change in the connection data still reloads the entry
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={**mock_config_entry.data, CONF_PASSWORD: "new-password"},
+    )
+    await hass.async_block_till_done()
+
+    assert len(mock_smile_adam.connect.mock_calls) == 2
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+
+
 @pytest.mark.parametrize(
     "side_effect",
     [
@@ -179,3 +458,55 @@ async def test_migrate_unique_id_relay(
     entity_migrated = entity_registry.async_get(entity.entity_id)
     assert entity_migrated
     assert entity_migrated.unique_id == new_unique_id
+
+
+async def test_load_unload_usb_entry(
+    hass: HomeAssistant, hass_storage: dict, mock_stick: MagicMock
+) -> None:
+    """Test the USB-stick entry sets up and shuts down its helpers."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={PW_TYPE: STICK, CONF_USB_PATH: USB_PORT}
+    )
+    entry.add_to_hass(hass)
+    stick = mock_stick
+    controller = stick.msg_controller
+    process_message = controller.message_processor
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    stick.connect.assert_called_once()
+    stick.initialize_stick.assert_called_once()
+    stick.initialize_circle_plus.assert_called_once()
+    stick.scan.assert_called_once()
+    assert {platform.domain for platform in async_get_platforms(hass, DOMAIN)} == set(
+        PLATFORMS_USB
+    )
+
+    data = hass.data[DOMAIN][entry.entry_id]
+    bridge, poller, health = data[BRIDGE], data[POLLER], data[HEALTH]
+    assert data[STICK] is stick
+    # The commands of the nodes go through the scheduler
+    assert controller.send == data[SCHEDULER].send
+    assert data[SCHEDULER].skip_library_polls
+    assert poller._unsub is not None
+    assert health._unsub is not None
+    assert data[SED_QUEUE].depth == 0
+    # The messages are processed by the library, then passed on
+    message = MagicMock()
+    controller.message_processor(message)
+    process_message.assert_called_once_with(message)
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert entry.entry_id not in hass.data[DOMAIN]
+    assert not async_get_platforms(hass, DOMAIN)
+    stick.disconnect.assert_called_once()
+    assert bridge._timer is None
+    assert poller._unsub is None
+    assert health._unsub is None
+    assert f"{DOMAIN}.usb_nodes.{entry.entry_id}" in hass_storage
+    assert f"{DOMAIN}.usb_sed_queue.{entry.entry_id}" in hass_storage
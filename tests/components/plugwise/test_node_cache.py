@@ -0,0 +1,63 @@
+"""Tests for the Plugwise USB node cache."""
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from homeassistant.components.plugwise.entity import async_usb_placeholder_nodes
+from homeassistant.components.plugwise.node_cache import USBNodeCache
+from homeassistant.core import HomeAssistant
+
+MAC = "000D6F0000000001"
+
+
+async def test_node_cache_restart(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the nodes are restored after a restart, removed nodes forgotten."""
+    cache = USBNodeCache(hass, "entry")
+    await cache.async_load()
+    assert not cache.nodes
+
+    node = MagicMock(
+        mac=MAC,
+        hardware_model="Circle",
+        firmware_version="2011-06-27T10:47:37+00:00",
+        features=("relay", "power_1s"),
+    )
+    cache.async_update(node)
+    cache.async_update(MagicMock(mac="000D6F0000000002", features=()))
+    cache.async_remove("000D6F0000000002")
+    await cache.async_save()
+
+    cache = USBNodeCache(hass, "entry")
+    await cache.async_load()
+    assert list(cache.nodes) == [MAC]
+    assert cache.nodes[MAC]["model"] == "Circle"
+    assert cache.nodes[MAC]["features"] == ["relay", "power_1s"]
+
+
+async def test_node_cache_placeholders(hass: HomeAssistant) -> None:
+    """Test the nodes not discovered yet are placeholders from the cache."""
+    cached = {
+        MAC: {
+            "model": "Circle",
+            "firmware": "2011-06-27T10:47:37+00:00",
+            "features": ["relay", "power_1s"],
+            "last_seen": "2022-07-01T10:00:00+00:00",
+        }
+    }
+    placeholders = async_usb_placeholder_nodes(hass, "entry", "sensor", {}, cached)
+    assert len(placeholders) == 1
+    assert placeholders[0].mac == MAC
+    assert placeholders[0].hardware_model == "Circle"
+    assert placeholders[0].features == ("relay", "power_1s")
+    assert not placeholders[0].available
+    assert placeholders[0].current_power_usage is None
+    assert placeholders[0].relay_state is None
+    # Only the states are unknown, a method call fails as on a missing method
+    with pytest.raises(AttributeError):
+        placeholders[0].update_power_usage()
+
+    discovered = {MAC: MagicMock()}
+    assert not async_usb_placeholder_nodes(hass, "entry", "sensor", discovered, cached)
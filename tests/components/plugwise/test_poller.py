@@ -0,0 +1,42 @@
+"""Tests for the Plugwise USB adaptive power poller."""
+from unittest.mock import MagicMock
+
+from homeassistant.components.plugwise.poller import USBPowerPoller
+from homeassistant.core import HomeAssistant
+
+
+def _circle() -> MagicMock:
+    """Return an available Circle."""
+    return MagicMock(available=True, measures_power=True)
+
+
+async def test_poller_shares_budget_by_load(hass: HomeAssistant) -> None:
+    """Test the varying nodes get the spare budget, the flat ones the floor."""
+    nodes = {"flat": _circle(), "busy": _circle(), "sed": None}
+    poller = USBPowerPoller(hass, nodes, 1.0, 5, 120)
+    poller._async_tick()
+    assert poller.polls == 1
+
+    for power in (0.0, 0.0, 0.0, 0.0):
+        poller._async_add_sample("flat", power)
+    for power in (100.0, 900.0, 50.0, 1200.0):
+        poller._async_add_sample("busy", power)
+    poller._share_budget()
+
+    stats = poller.as_dict()
+    assert stats["nodes"]["flat"]["interval"] == 120
+    assert stats["nodes"]["busy"]["interval"] == 5
+    assert stats["rate"] <= 1.0
+
+
+async def test_poller_keeps_to_budget(hass: HomeAssistant) -> None:
+    """Test the polls due beyond the budget are deferred."""
+    nodes = {f"circle{index}": _circle() for index in range(10)}
+    nodes["circle0"].available = False
+    poller = USBPowerPoller(hass, nodes, 2.0, 5, 120)
+    poller._async_tick()
+
+    assert poller.polls == 2
+    assert poller.deferred == 7
+    assert not nodes["circle0"].request_power_update.called
+    assert sum(node.request_power_update.call_count for node in nodes.values()) == 2
@@ -0,0 +1,92 @@
+"""Tests for the Plugwise USB command scheduler."""
+from unittest.mock import MagicMock
+
+from plugwise.constants import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_MEDIUM
+from plugwise.messages.requests import (
+    CirclePowerUsageRequest,
+    CircleSwitchRelayRequest,
+    NodeInfoRequest,
+    NodePingRequest,
+)
+
+from homeassistant.components.plugwise.scheduler import USBCommandScheduler
+
+MAC = b"000D6F0000000001"
+
+
+def test_scheduler_priorities() -> None:
+    """Test the commands are queued ahead of the telemetry, also when resent."""
+    send = MagicMock()
+    scheduler = USBCommandScheduler(send, MagicMock(), 5)
+
+    scheduler.send(CirclePowerUsageRequest(MAC))
+    scheduler.send(CircleSwitchRelayRequest(MAC, True), None, 1)
+    scheduler.send(NodeInfoRequest(MAC), None, 0, PRIORITY_LOW)
+    scheduler.send(NodeInfoRequest(MAC))
+
+    assert [call.args[3] for call in send.call_args_list] == [
+        PRIORITY_LOW,
+        PRIORITY_HIGH,
+        PRIORITY_LOW,
+        PRIORITY_MEDIUM,
+    ]
+
+
+def test_scheduler_rate_limits_telemetry() -> None:
+    """Test a repeated telemetry request of a node is dropped."""
+    send = MagicMock()
+    scheduler = USBCommandScheduler(send, MagicMock(), 5)
+
+    scheduler.send(CirclePowerUsageRequest(MAC))
+    scheduler.send(CirclePowerUsageRequest(MAC))
+    scheduler.send(CirclePowerUsageRequest(b"000D6F0000000002"))
+    # Retries and requests awaiting a callback are always sent
+    scheduler.send(CirclePowerUsageRequest(MAC), None, 1)
+    scheduler.send(CirclePowerUsageRequest(MAC), MagicMock())
+
+    assert send.call_count == 4
+    assert scheduler.rate_limited == 1
+
+
+def test_scheduler_latency() -> None:
+    """Test the time in the queue is measured per class."""
+    write = MagicMock()
+    scheduler = USBCommandScheduler(MagicMock(), write, 5)
+    relay = CircleSwitchRelayRequest(MAC, True)
+    scheduler.send(relay)
+    scheduler.send(CirclePowerUsageRequest(MAC))
+
+    scheduler.write(relay)
+    write.assert_called_once_with(relay)
+
+    stats = scheduler.as_dict()
+    assert stats["queued"] == 1
+    assert stats["classes"]["command"]["sent"] == 1
+    assert stats["classes"]["command"]["latency_max_ms"] >= 0
+    assert stats["classes"]["telemetry"]["sent"] == 0
+    assert stats["classes"]["telemetry"]["latency_mean_ms"] is None
+
+
+def test_scheduler_skips_library_polls() -> None:
+    """Test the power polls of the library are dropped for the poller."""
+    send = MagicMock()
+    scheduler = USBCommandScheduler(send, MagicMock(), 5)
+    scheduler.skip_library_polls = True
+
+    scheduler.send(CirclePowerUsageRequest(MAC))
+    scheduler.send(CirclePowerUsageRequest(MAC), MagicMock())
+
+    assert send.call_count == 1
+    assert scheduler.as_dict()["skipped"] == 1
+
+
+def test_scheduler_restores_sed_requests() -> None:
+    """Test the requests the library held for an awake SED are sent."""
+    send = MagicMock()
+    scheduler = USBCommandScheduler(send, MagicMock(), 5)
+    request = NodePingRequest(MAC)
+    callback = MagicMock()
+
+    scheduler.send(NodePingRequest.ID, (request, callback), -1, PRIORITY_HIGH)
+
+    assert send.call_args.args == (request, callback, -1, PRIORITY_LOW)
@@ -0,0 +1,101 @@
+"""Tests for the Plugwise USB command queue of the battery powered nodes."""
+from typing import Any
+from unittest.mock import MagicMock
+
+from plugwise.constants import PRIORITY_HIGH
+from plugwise.messages.requests import NodeSleepConfigRequest, ScanConfigureRequest
+from plugwise.messages.responses import NodeAwakeResponse
+
+from homeassistant.components.plugwise.const import SED_SCAN_CONFIG, SED_SLEEP_CONFIG
+from homeassistant.components.plugwise.sed_queue import USBSEDCommandQueue
+from homeassistant.core import HomeAssistant
+
+MAC = "000D6F0000000001"
+SCAN_CONFIG = {"sensitivity_mode": "high", "reset_timer": 10, "day_light": False}
+SLEEP_CONFIG = {
+    "stay_active": 10,
+    "sleep_for": 60,
+    "maintenance_interval": 60,
+    "clock_sync": False,
+    "clock_interval": 1440,
+}
+
+
+def _awake(mac: str) -> NodeAwakeResponse:
+    """Return the awake message of a node."""
+    message = NodeAwakeResponse()
+    message.mac = bytes(mac, "utf-8")
+    return message
+
+
+async def test_sed_queue_sends_when_awake(hass: HomeAssistant) -> None:
+    """Test the configuration is sent at the next awake, collapsed."""
+    node = MagicMock(maintenance_interval=1440)
+    send = MagicMock()
+    queue = USBSEDCommandQueue(hass, "entry", {MAC: node}, send)
+
+    queue.async_queue(MAC, SED_SLEEP_CONFIG, {**SLEEP_CONFIG, "stay_active": 5})
+    queue.async_queue(MAC, SED_SLEEP_CONFIG, SLEEP_CONFIG)
+    queue.async_queue(MAC, SED_SCAN_CONFIG, SCAN_CONFIG)
+    assert queue.as_dict()["depth"] == 2
+    assert queue.as_dict()["collapsed"] == 1
+    assert not send.called
+
+    queue.message_received(_awake("000D6F0000000002"))
+    queue.message_received(_awake(MAC))
+    await hass.async_block_till_done()
+
+    requests = {type(call.args[0]): call.args for call in send.call_args_list}
+    assert set(requests) == {NodeSleepConfigRequest, ScanConfigureRequest}
+    sleep_config = requests[NodeSleepConfigRequest]
+    assert sleep_config[0].serialize() == (
+        NodeSleepConfigRequest(MAC.encode(), 10, 60, 60, False, 1440).serialize()
+    )
+    assert sleep_config[2:] == (-1, PRIORITY_HIGH)
+
+    # Accepted by the node
+    sleep_config[1]()
+    await hass.async_block_till_done()
+    assert node.maintenance_interval == 60
+    diagnostics = queue.as_dict()
+    assert diagnostics["depth"] == 1
+    assert diagnostics["applied"] == 1
+    assert diagnostics["time_to_apply_max_s"] is not None
+    assert list(diagnostics["pending"][MAC]) == [SED_SCAN_CONFIG]
+
+
+async def test_sed_queue_not_accepted(hass: HomeAssistant) -> None:
+    """Test a configuration is sent again, a replaced one not forgotten."""
+    send = MagicMock()
+    queue = USBSEDCommandQueue(hass, "entry", {}, send)
+    queue.async_queue(MAC, SED_SCAN_CONFIG, SCAN_CONFIG)
+    queue.message_received(_awake(MAC))
+    await hass.async_block_till_done()
+
+    # Replaced before the node accepted the first one
+    queue.async_queue(MAC, SED_SCAN_CONFIG, {**SCAN_CONFIG, "reset_timer": 20})
+    send.call_args.args[1]()
+    await hass.async_block_till_done()
+    assert queue.as_dict()["depth"] == 1
+
+    queue.message_received(_awake(MAC))
+    await hass.async_block_till_done()
+    assert send.call_count == 2
+    assert queue.as_dict()["pending"][MAC][SED_SCAN_CONFIG]["attempts"] == 1
+
+
+async def test_sed_queue_restart(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the pending configurations are kept over a restart."""
+    queue = USBSEDCommandQueue(hass, "entry", {}, MagicMock())
+    queue.async_queue(MAC, SED_SCAN_CONFIG, SCAN_CONFIG)
+    await queue.async_save()
+
+    send = MagicMock()
+    queue = USBSEDCommandQueue(hass, "entry", {}, send)
+    await queue.async_load()
+    assert queue.depth == 1
+    queue.message_received(_awake(MAC))
+    await hass.async_block_till_done()
+    assert isinstance(send.call_args.args[0], ScanConfigureRequest)
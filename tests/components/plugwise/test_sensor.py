@@ -1,10 +1,34 @@
 """Tests for the Plugwise Sensor integration."""
 
-from unittest.mock import MagicMock
+from copy import deepcopy
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
 
+from homeassistant.components.plugwise.const import (
+    CONF_DEADBAND,
+    CONF_SENSOR_FILTERS,
+    CONF_USB_LINK_SENSORS,
+    CONF_USB_PATH,
+    COORDINATOR,
+    DOMAIN,
+    EL_CONSUMED_PEAK_CUMULATIVE,
+    EVENT_RECENT_HISTORY,
+    NET_EL_THIS_HOUR,
+    NET_EL_TODAY,
+    P1_ENERGY_STORAGE_VERSION,
+    PW_TYPE,
+    SERVICE_GET_RECENT_HISTORY,
+    STICK,
+)
+from homeassistant.components.plugwise.energy import P1EnergyTracker
+from homeassistant.components.plugwise.history import SensorHistory
+from homeassistant.components.plugwise.models import PW_SENSOR_TYPES
+from homeassistant.components.plugwise.sensor import USBSensor
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+import homeassistant.util.dt as dt_util
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_capture_events
 
 
 async def test_adam_climate_sensor_entities(
@@ -87,6 +111,101 @@ async def test_p1_dsmr_sensor_entities(
     assert float(state.state) == 584.85
 
 
+async def test_p1_sensor_deadband(
+    hass: HomeAssistant, mock_smile_p1: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test only changes outside the deadband are published."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id][COORDINATOR]
+    gateway, devices = deepcopy(mock_smile_p1.async_update.return_value)
+    sensors = devices["e950c7d5e1ee407a858e2a8b5016c8b3"]["sensors"]
+    mock_smile_p1.async_update.return_value = [gateway, devices]
+
+    sensors["net_electricity_point"] = -2814.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_point")
+    assert float(state.state) == -2816.0
+
+    sensors["net_electricity_point"] = -2800.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_point")
+    assert float(state.state) == -2800.0
+
+    # The deadband can be set per entity via the options
+    hass.config_entries.async_update_entry(
+        init_integration,
+        options={
+            CONF_SENSOR_FILTERS: {
+                "e950c7d5e1ee407a858e2a8b5016c8b3-net_electricity_point": {
+                    CONF_DEADBAND: 50.0
+                }
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    sensors["net_electricity_point"] = -2780.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_point")
+    assert float(state.state) == -2800.0
+
+    # Back at the published value, the steady device is not updated again
+    sensors["net_electricity_point"] = -2800.0
+    for _ in range(2):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert coordinator.fan_out["devices_changed"] == 0
+
+
+async def test_p1_sensor_recent_history(
+    hass: HomeAssistant, mock_smile_p1: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test the recent history includes the values filtered by the deadband."""
+    coordinator = hass.data[DOMAIN][init_integration.entry_id][COORDINATOR]
+    gateway, devices = deepcopy(mock_smile_p1.async_update.return_value)
+    sensors = devices["e950c7d5e1ee407a858e2a8b5016c8b3"]["sensors"]
+    mock_smile_p1.async_update.return_value = [gateway, devices]
+
+    sensors["net_electricity_point"] = -2814.0
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_RECENT_HISTORY)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_RECENT_HISTORY,
+        {"entity_id": "sensor.p1_net_electricity_point", "buckets": 1},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(events) == 1
+    assert events[0].data["entity_id"] == "sensor.p1_net_electricity_point"
+    samples = events[0].data["samples"]
+    assert len(samples) == 1
+    assert samples[0]["min"] == -2816.0
+    assert samples[0]["mean"] == -2815.0
+    assert samples[0]["max"] == -2814.0
+
+
+def test_sensor_history_resize() -> None:
+    """Test a resized history keeps the most recent samples."""
+    history = SensorHistory(4)
+    for sample in range(6):
+        history.append(float(sample), sample * 10.0)
+
+    history.resize(2)
+    assert history.capacity == 2
+    assert history.samples() == [(4.0, 40.0), (5.0, 50.0)]
+
+    history.resize(3)
+    history.append(6.0, 60.0)
+    history.append(7.0, 70.0)
+    assert history.samples() == [(5.0, 50.0), (6.0, 60.0), (7.0, 70.0)]
+
+
 async def test_stretch_sensor_entities(
     hass: HomeAssistant, mock_stretch: MagicMock, init_integration: MockConfigEntry
 ) -> None:
@@ -98,3 +217,141 @@ async def test_stretch_sensor_entities(
     state = hass.states.get("sensor.droger_52559_electricity_consumed_interval")
     assert state
     assert float(state.state) == 0.0
+
+
+async def test_p1_derived_energy_sensors(
+    hass: HomeAssistant, mock_smile_p1: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test the energy totals derived from the P1 counters."""
+    state = hass.states.get("sensor.p1_net_electricity_today")
+    assert state
+    assert float(state.state) == 0.0
+    state = hass.states.get("sensor.p1_net_coverage_ratio_today")
+    assert state
+    assert state.state == "unknown"
+
+    coordinator = hass.data[DOMAIN][init_integration.entry_id][COORDINATOR]
+    gateway, devices = deepcopy(mock_smile_p1.async_update.return_value)
+    sensors = devices["e950c7d5e1ee407a858e2a8b5016c8b3"]["sensors"]
+    mock_smile_p1.async_update.return_value = [gateway, devices]
+
+    sensors["electricity_consumed_peak_cumulative"] = 444.432
+    sensors["electricity_produced_peak_cumulative"] = 397.059
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_today")
+    assert float(state.state) == 1.0
+    state = hass.states.get("sensor.p1_net_coverage_ratio_today")
+    assert float(state.state) == 33.3
+
+    # A counter going down becomes the new baseline
+    sensors["electricity_consumed_peak_cumulative"] = 0.2
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_today")
+    assert float(state.state) == 1.0
+
+    sensors["electricity_consumed_peak_cumulative"] = 0.7
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.p1_net_electricity_today")
+    assert float(state.state) == 1.5
+
+
+async def test_p1_energy_over_period_boundary(
+    hass: HomeAssistant, hass_storage: dict
+) -> None:
+    """Test the energy of a restart or outage into a new period is left out."""
+    now = dt_util.now()
+    hass_storage[f"{DOMAIN}.p1_energy.entry"] = {
+        "version": P1_ENERGY_STORAGE_VERSION,
+        "key": f"{DOMAIN}.p1_energy.entry",
+        "data": {
+            "counters": {EL_CONSUMED_PEAK_CUMULATIVE: 100.0},
+            "day": {EL_CONSUMED_PEAK_CUMULATIVE: 2.0},
+            "hour_net": 0.5,
+            "day_start": dt_util.start_of_local_day(
+                now - timedelta(days=1)
+            ).isoformat(),
+            "hour_start": (now - timedelta(hours=1)).isoformat(),
+        },
+    }
+    tracker = P1EnergyTracker(hass, "entry")
+    await tracker.async_load()
+
+    tracker.async_update(object(), {EL_CONSUMED_PEAK_CUMULATIVE: 110.0})
+    assert tracker.value(NET_EL_TODAY) == 0.0
+    assert tracker.value(NET_EL_THIS_HOUR) == 0.0
+
+    tracker.async_update(object(), {EL_CONSUMED_PEAK_CUMULATIVE: 110.5})
+    assert tracker.value(NET_EL_THIS_HOUR) == 0.5
+
+    # No readings for two hours
+    with patch.object(dt_util, "now", return_value=now + timedelta(hours=2)):
+        tracker.async_update(object(), {EL_CONSUMED_PEAK_CUMULATIVE: 112.0})
+    assert tracker.value(NET_EL_THIS_HOUR) == 0.0
+
+
+async def test_adam_zone_sensors(
+    hass: HomeAssistant, mock_smile_adam: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test the aggregates over the devices of a zone."""
+    state = hass.states.get("sensor.zone_lisa_wk_zone_valve_position")
+    assert state
+    assert float(state.state) == 100.0
+
+    state = hass.states.get("sensor.zone_lisa_bios_zone_lowest_battery")
+    assert state
+    assert float(state.state) == 62
+
+    # A zone without other devices reporting has no aggregates
+    assert not hass.states.get("sensor.cv_kraan_garage_zone_lowest_battery")
+
+
+async def test_usb_sensor_cached_value(hass: HomeAssistant) -> None:
+    """Test the USB sensor value is read on the node callback only."""
+    description = next(
+        description
+        for description in PW_SENSOR_TYPES
+        if description.state_request_method == "current_power_usage"
+    )
+    node = MagicMock(mac="000D6F0000000001", current_power_usage=12.34567)
+    sensor = USBSensor(node, description)
+    assert sensor.native_value == 12.346
+
+    node.current_power_usage = 20.0
+    assert sensor.native_value == 12.346
+
+    with patch.object(sensor, "schedule_update_ha_state"):
+        sensor.sensor_update(None)
+    assert sensor.native_value == 20.0
+
+
+async def test_usb_link_sensors_option(
+    hass: HomeAssistant, mock_stick: MagicMock
+) -> None:
+    """Test the link sensors present are disabled by the option, not removed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={PW_TYPE: STICK, CONF_USB_PATH: "/dev/ttyUSB0"},
+        options={CONF_USB_LINK_SENSORS: False},
+    )
+    entry.add_to_hass(hass)
+    ent_reg = er.async_get(hass)
+    ping = ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "000D6F0000000001-ping", config_entry=entry
+    )
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert (ping := ent_reg.async_get(ping.entity_id))
+    assert ping.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+
+    # Enabled again with the option
+    await hass.config_entries.async_unload(entry.entry_id)
+    hass.config_entries.async_update_entry(entry, options={CONF_USB_LINK_SENSORS: True})
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert ent_reg.async_get(ping.entity_id).disabled_by is None
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,37 @@
+"""Tests for the Plugwise long-term statistics of the energy counters."""
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.plugwise.statistics import hourly_statistics
+
+START = datetime(2022, 7, 1, 10, tzinfo=timezone.utc)
+
+
+def test_statistics_first_row() -> None:
+    """Test the first row is the starting point of the sum."""
+    rows = hourly_statistics(None, None, 0.0, 442.932, START)
+    assert rows == [{"start": START - timedelta(hours=1), "state": 442.932, "sum": 0.0}]
+
+
+def test_statistics_next_hour() -> None:
+    """Test nothing is added within the hour, one row after the hour."""
+    assert not hourly_statistics(START, 442.0, 1.0, 442.5, START + timedelta(hours=1))
+
+    rows = hourly_statistics(START, 442.0, 1.0, 442.5, START + timedelta(hours=2))
+    assert rows == [{"start": START + timedelta(hours=1), "state": 442.5, "sum": 1.5}]
+
+
+def test_statistics_backfill() -> None:
+    """Test the hours missed during an outage are added in one batch."""
+    rows = hourly_statistics(START, 440.0, 0.0, 444.0, START + timedelta(hours=5))
+    assert [row["start"] for row in rows] == [
+        START + timedelta(hours=hour) for hour in range(1, 5)
+    ]
+    assert [row["state"] for row in rows] == [441.0, 442.0, 443.0, 444.0]
+    assert [row["sum"] for row in rows] == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_statistics_counter_reset() -> None:
+    """Test a counter going down is handled as a reset."""
+    rows = hourly_statistics(START, 440.0, 10.0, 2.0, START + timedelta(hours=3))
+    assert [row["state"] for row in rows] == [1.0, 2.0]
+    assert [row["sum"] for row in rows] == [11.0, 12.0]
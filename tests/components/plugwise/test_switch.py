@@ -1,4 +1,5 @@
 """Tests for the Plugwise switch integration."""
+from copy import deepcopy
 from unittest.mock import MagicMock
 
 from plugwise.exceptions import PlugwiseException
@@ -10,7 +11,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
 
-from tests.common import MockConfigEntry
+from tests.common import MockConfigEntry, async_capture_events
 
 
 async def test_adam_climate_switch_entities(
@@ -26,6 +27,44 @@ async def test_adam_climate_switch_entities(
     assert state.state == "on"
 
 
+async def test_adam_set_switches(
+    hass: HomeAssistant, mock_smile_adam: MagicMock, init_integration: MockConfigEntry
+) -> None:
+    """Test switching a batch of relays with a single confirming refresh."""
+    gateway, devices = deepcopy(mock_smile_adam.async_update.return_value)
+    devices["78d1126fc4c743db81b61c20e88342a7"]["switches"]["relay"] = False
+    mock_smile_adam.async_update.return_value = [gateway, devices]
+    events = async_capture_events(hass, "plugwise_set_switches")
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_switches",
+        {
+            "entity_id": [
+                "switch.unknown",
+                "switch.cv_pomp_relay",
+                "switch.fibaro_hc2_relay",
+            ],
+            "state": "off",
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert mock_smile_adam.set_switch_state.call_count == 2
+    assert mock_smile_adam.async_update.call_count == 1
+    assert hass.states.get("switch.cv_pomp_relay").state == "off"
+    assert len(events) == 1
+    results = events[0].data["switches"]
+    # The results are in the order of the request
+    assert results[0]["entity_id"] == "switch.unknown"
+    assert not results[0]["success"]
+    assert results[1] == {"entity_id": "switch.cv_pomp_relay", "success": True}
+    # The gateway did not confirm the new state
+    assert results[2]["entity_id"] == "switch.fibaro_hc2_relay"
+    assert not results[2]["success"]
+
+
 async def test_adam_climate_switch_negative_testing(
     hass: HomeAssistant, mock_smile_adam: MagicMock, init_integration: MockConfigEntry
 ):
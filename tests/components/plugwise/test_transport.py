@@ -0,0 +1,174 @@
+"""Tests for the Plugwise USB-stick asyncio transport."""
+import asyncio
+from unittest.mock import MagicMock
+
+from plugwise.constants import MESSAGE_FOOTER, MESSAGE_HEADER
+from plugwise.exceptions import NetworkDown, TimeoutException
+from plugwise.messages.requests import NodePingRequest, StickInitRequest
+from plugwise.messages.responses import NodePingResponse, StickInitResponse
+from plugwise.util import crc_fun
+import pytest
+
+from homeassistant.components.plugwise.transport import (
+    StickProtocol,
+    async_connect_stick,
+    async_init_stick,
+)
+from homeassistant.core import HomeAssistant
+
+from .stick_simulator import StickSimulator
+
+STICK_INIT = (
+    b"0011ABCD"
+    + b"0123456789ABCDEF"  # stick MAC
+    + b"0001"  # network online
+    + b"0123456789ABCDEF"  # Circle+ MAC
+    + b"1234FF"
+)
+CIRCLE = b"000D6F0000000001"
+CIRCLE_2 = b"000D6F0000000002"
+
+
+def _frame(body: bytes) -> bytes:
+    """Return the framed message."""
+    return MESSAGE_HEADER + body + b"%04X" % crc_fun(body) + MESSAGE_FOOTER
+
+
+def _ack(seq_id: bytes, ack_id: bytes = b"00C1") -> bytes:
+    """Return the framed acknowledge of the stick."""
+    return _frame(b"0000" + seq_id + ack_id)
+
+
+async def test_response_by_sequence_id(hass: HomeAssistant) -> None:
+    """Test a split response is matched to its request by the sequence id."""
+    protocol = StickProtocol()
+    protocol.connection_made(MagicMock())
+
+    task = asyncio.create_task(protocol.async_request(StickInitRequest(), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(b"noise" + _ack(b"ABCD"))
+    frame = _frame(STICK_INIT)
+    protocol.data_received(frame[:10])
+    protocol.data_received(frame[10:])
+
+    response = await task
+    assert isinstance(response, StickInitResponse)
+    assert response.network_is_online.value == 1
+    assert response.mac == b"0123456789ABCDEF"
+
+
+async def test_request_errors(hass: HomeAssistant) -> None:
+    """Test a NACK or no answer fails the request."""
+    protocol = StickProtocol()
+    protocol.connection_made(MagicMock())
+
+    task = asyncio.create_task(protocol.async_request(StickInitRequest(), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABCE", b"00C2"))
+    with pytest.raises(TimeoutException):
+        await task
+
+    with pytest.raises(TimeoutException) as err:
+        await protocol.async_request(StickInitRequest(), 0.01)
+    assert isinstance(err.value.__cause__, asyncio.TimeoutError)
+
+
+def _pong(seq_id: bytes, mac: bytes, ping: int) -> bytes:
+    """Return the framed ping response of a node."""
+    return _frame(b"000E" + seq_id + mac + b"3C" + b"40" + b"%04X" % ping)
+
+
+async def test_stick_timeout_of_pending_request(hass: HomeAssistant) -> None:
+    """Test a timeout acknowledge fails the pending request only."""
+    protocol = StickProtocol()
+    protocol.connection_made(MagicMock())
+
+    lost = asyncio.create_task(protocol.async_request(NodePingRequest(CIRCLE), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABCD"))
+    answered = asyncio.create_task(protocol.async_request(NodePingRequest(CIRCLE_2), 1))
+    await asyncio.sleep(0)
+    # The stick gives up on the first node before acknowledging the second
+    protocol.data_received(_ack(b"ABCD", b"00E1"))
+    protocol.data_received(_ack(b"ABCE"))
+    protocol.data_received(_pong(b"ABCE", CIRCLE_2, 20))
+
+    with pytest.raises(TimeoutException):
+        await lost
+    assert (await answered).mac == CIRCLE_2
+
+
+async def test_late_acknowledge(hass: HomeAssistant) -> None:
+    """Test a late acknowledge is not taken for the next request."""
+    protocol = StickProtocol()
+    protocol.connection_made(MagicMock())
+
+    first = asyncio.create_task(protocol.async_request(NodePingRequest(CIRCLE), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABCD") + _pong(b"ABCD", CIRCLE, 20))
+    await first
+
+    with pytest.raises(TimeoutException):
+        await protocol.async_request(NodePingRequest(CIRCLE), 0.01)
+    answered = asyncio.create_task(protocol.async_request(NodePingRequest(CIRCLE_2), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABCE") + _ack(b"ABCF"))
+    protocol.data_received(_pong(b"ABCE", CIRCLE, 20) + _pong(b"ABCF", CIRCLE_2, 30))
+    assert (await answered).mac == CIRCLE_2
+
+    # The stick did not take two requests, its sequence ids are followed again
+    for _ in range(2):
+        with pytest.raises(TimeoutException):
+            await protocol.async_request(NodePingRequest(CIRCLE), 0.01)
+    answered = asyncio.create_task(protocol.async_request(NodePingRequest(CIRCLE_2), 1))
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABD0") + _pong(b"ABD0", CIRCLE_2, 30))
+    assert (await answered).mac == CIRCLE_2
+
+
+async def test_concurrent_responses(hass: HomeAssistant) -> None:
+    """Test concurrent responses of the same kind do not overwrite each other."""
+    protocol = StickProtocol()
+    protocol.connection_made(MagicMock())
+
+    tasks = [
+        asyncio.create_task(protocol.async_request(NodePingRequest(mac), 1))
+        for mac in (CIRCLE, CIRCLE_2)
+    ]
+    await asyncio.sleep(0)
+    protocol.data_received(_ack(b"ABCD") + _ack(b"ABCE"))
+    protocol.data_received(_pong(b"ABCE", CIRCLE_2, 30) + _pong(b"ABCD", CIRCLE, 20))
+
+    first, second = await asyncio.gather(*tasks)
+    assert isinstance(first, NodePingResponse)
+    assert (first.mac, first.ping_ms.value) == (CIRCLE, 20)
+    assert (second.mac, second.ping_ms.value) == (CIRCLE_2, 30)
+
+
+async def test_stick_init_simulated(hass: HomeAssistant) -> None:
+    """Test the stick is initialized over a simulated stick."""
+    with StickSimulator() as simulator:
+        mac = await async_init_stick(simulator.port, 2)
+    assert mac == simulator.stick_mac.decode()
+
+    with StickSimulator(network_online=False) as simulator:
+        with pytest.raises(NetworkDown):
+            await async_init_stick(simulator.port, 2)
+
+
+async def test_concurrent_requests_simulated(hass: HomeAssistant) -> None:
+    """Test many outstanding requests are answered, a lost one fails."""
+    with StickSimulator(circles=4, latency=0.05) as simulator:
+        protocol = await async_connect_stick(simulator.port)
+        macs = list(simulator.nodes)
+        responses = await asyncio.gather(
+            *(protocol.async_request(NodePingRequest(mac), 2) for mac in macs)
+        )
+        assert [response.mac for response in responses] == macs
+        assert all(isinstance(response, NodePingResponse) for response in responses)
+
+        simulator.loss = 1.0
+        with pytest.raises(TimeoutException):
+            await protocol.async_request(NodePingRequest(macs[0]), 2)
+        protocol.transport.close()
+    assert simulator.lost == 1
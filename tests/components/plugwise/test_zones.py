@@ -0,0 +1,47 @@
+"""Tests for the Plugwise Adam location index."""
+from homeassistant.components.plugwise.zones import ZoneIndex
+
+
+def test_zone_index_primary() -> None:
+    """Test a valve is only the primary of a zone without a thermostat."""
+    index = ZoneIndex()
+    changed = index.update(
+        {
+            "trv": {"dev_class": "thermostatic_radiator_valve", "location": "a"},
+            "lisa": {"dev_class": "zone_thermostat", "location": "a"},
+            "plug": {"dev_class": "vcr", "location": "b"},
+        }
+    )
+    assert changed == {"a", "b"}
+    assert len(index) == 2
+    assert index.zone("a").primary == "lisa"
+    assert index.zone("a").valves == {"trv"}
+    assert index.zone_of("plug").primary is None
+    assert index.thermostats == {"trv", "lisa"}
+
+
+def test_zone_index_changes() -> None:
+    """Test only the moved and removed devices change their zones."""
+    index = ZoneIndex()
+    devices = {
+        "trv": {"dev_class": "thermostatic_radiator_valve", "location": "a"},
+        "lisa": {"dev_class": "zone_thermostat", "location": "a"},
+    }
+    index.update(devices)
+    assert not index.update(devices)
+
+    # The thermostat moves, the valve takes over
+    changed = index.update(
+        {
+            "trv": {"dev_class": "thermostatic_radiator_valve", "location": "a"},
+            "lisa": {"dev_class": "zone_thermostat", "location": "b"},
+        }
+    )
+    assert changed == {"a", "b"}
+    assert index.zone("a").primary == "trv"
+    assert index.zone("b").primary == "lisa"
+
+    assert index.update({"lisa": {"dev_class": "zone_thermostat", "location": "b"}})
+    assert index.zone("a") is None
+    assert index.zone_of("trv") is None
+    assert index.thermostats == {"lisa"}